@@ -20,6 +20,13 @@ TABLE_INDEX_MAP = textwrap.dedent(
             "type": "custom",
             "filter": ["lowercase"]
           }
+        },
+        "analyzer": {
+          "suggest_analyzer": {
+            "type": "custom",
+            "tokenizer": "keyword",
+            "filter": ["lowercase", "asciifolding"]
+          }
         }
       }
     },
@@ -105,6 +112,10 @@ TABLE_INDEX_MAP = textwrap.dedent(
             "programmatic_descriptions": {
               "type": "text",
               "analyzer": "simple"
+            },
+            "suggest": {
+              "type": "completion",
+              "analyzer": "suggest_analyzer"
             }
           }
         }
@@ -124,6 +135,13 @@ DASHBOARD_ELASTICSEARCH_INDEX_MAPPING = textwrap.dedent(
                 "char_filter": [],
                 "filter": ["lowercase", "asciifolding"]
               }
+            },
+            "analyzer": {
+              "suggest_analyzer": {
+                "type": "custom",
+                "tokenizer": "keyword",
+                "filter": ["lowercase", "asciifolding"]
+              }
             }
           }
         },
@@ -191,6 +209,10 @@ DASHBOARD_ELASTICSEARCH_INDEX_MAPPING = textwrap.dedent(
                 },
                 "badges": {
                   "type": "keyword"
+                },
+                "suggest": {
+                  "type": "completion",
+                  "analyzer": "suggest_analyzer"
                 }
               }
             }
@@ -202,6 +224,17 @@ DASHBOARD_ELASTICSEARCH_INDEX_MAPPING = textwrap.dedent(
 USER_INDEX_MAP = textwrap.dedent(
     """
     {
+    "settings": {
+      "analysis": {
+        "analyzer": {
+          "suggest_analyzer": {
+            "type": "custom",
+            "tokenizer": "keyword",
+            "filter": ["lowercase", "asciifolding"]
+          }
+        }
+      }
+    },
     "mappings":{
         "user":{
           "properties": {
@@ -249,6 +282,10 @@ USER_INDEX_MAP = textwrap.dedent(
             },
             "total_follow": {
               "type": "long"
+            },
+            "suggest": {
+              "type": "completion",
+              "analyzer": "suggest_analyzer"
             }
           }
         }
@@ -0,0 +1,47 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import time
+from typing import Optional
+
+from databuilder.callback.call_back import Callback
+
+LOGGER = logging.getLogger(__name__)
+
+
+def read_high_watermark(file_path: str) -> int:
+    """
+    Reads the high watermark persisted by HighWatermarkCallback
+    :param file_path:
+    :return: high watermark in epoch ms, or 0 if none was persisted yet
+    """
+    if not os.path.exists(file_path):
+        return 0
+
+    with open(file_path, 'r') as high_watermark_file:
+        return int(high_watermark_file.read().strip() or 0)
+
+
+class HighWatermarkCallback(Callback):
+    """
+    Persists a high watermark once publishing succeeds, so that the next run of an incremental job, e.g. with
+    Neo4jSearchDataExtractor.UPDATED_SINCE_EPOCH_MS, only extracts what was published since.
+    Create it before launching the job: the high watermark defaults to the time it is created, which has to
+    precede extraction so that nothing published during extraction is missed.
+    """
+
+    def __init__(self, file_path: str, high_watermark_epoch_ms: Optional[int] = None) -> None:
+        self.file_path = file_path
+        self.high_watermark_epoch_ms = high_watermark_epoch_ms or int(time.time() * 1000)
+
+    def on_success(self) -> None:
+        LOGGER.info('Persisting high watermark %i to %s', self.high_watermark_epoch_ms, self.file_path)
+        tmp_file_path = f'{self.file_path}.tmp'
+        with open(tmp_file_path, 'w') as high_watermark_file:
+            high_watermark_file.write(str(self.high_watermark_epoch_ms))
+        os.replace(tmp_file_path, self.file_path)
+
+    def on_failure(self) -> None:
+        pass
@@ -1,15 +1,18 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 import textwrap
-from typing import Any
+from typing import Any, List
 
 from pyhocon import ConfigTree
 
 from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.neo4j_extractor import Neo4jExtractor
-from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
+from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG, LAST_UPDATED_EPOCH_MS
+
+LOGGER = logging.getLogger(__name__)
 
 
 class Neo4jSearchDataExtractor(Extractor):
@@ -19,6 +22,12 @@ class Neo4jSearchDataExtractor(Extractor):
     """
     CYPHER_QUERY_CONFIG_KEY = 'cypher_query'
     ENTITY_TYPE = 'entity_type'
+    # Incremental extraction: only extract entities where the entity node, a node or relation next to it, or for
+    # tables a column's node or relation, was published since this epoch ms. 0 extracts all entities.
+    UPDATED_SINCE_EPOCH_MS = 'updated_since_epoch_ms'
+    # Incremental extraction: file the keys of all entities are written to, one per line, for ElasticsearchPublisher
+    # to delete documents of removed entities.
+    LIVE_KEYS_FILE_PATH = 'live_keys_file_path'
 
     DEFAULT_NEO4J_TABLE_CYPHER_QUERY = textwrap.dedent(
         """
@@ -148,6 +157,22 @@ class Neo4jSearchDataExtractor(Extractor):
         'feature': DEFAULT_NEO4J_FEATURE_CYPHER_QUERY,
     }
 
+    # Entities whose default query filters the entity node right after matching it, so that it can be extracted
+    # incrementally: entity -> (node label, document key)
+    INCREMENTAL_ENTITIES = {
+        'table': ('Table', 'table.key'),
+        'dashboard': ('Dashboard', 'dashboard.key'),
+        'feature': ('Feature', 'feature.key'),
+    }
+
+    LIVE_KEYS_CYPHER_QUERY = textwrap.dedent(
+        """
+        MATCH ({entity}:{label})
+        {publish_tag_filter}
+        RETURN {key} AS key
+        """
+    )
+
     def init(self, conf: ConfigTree) -> None:
         """
         Initialize Neo4jExtractor object from configuration and use that for extraction
@@ -158,9 +183,15 @@ class Neo4jSearchDataExtractor(Extractor):
         if Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY in conf:
             self.cypher_query = conf.get_string(Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY)
         else:
+            updated_since_epoch_ms = conf.get_int(Neo4jSearchDataExtractor.UPDATED_SINCE_EPOCH_MS, 0)
+            if updated_since_epoch_ms and self.entity not in Neo4jSearchDataExtractor.INCREMENTAL_ENTITIES:
+                LOGGER.warning('Incremental extraction is not supported for %s, extracting all of them', self.entity)
+                updated_since_epoch_ms = 0
+
             default_query = Neo4jSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
             self.cypher_query = self._add_publish_tag_filter(conf.get_string(JOB_PUBLISH_TAG, ''),
-                                                             cypher_query=default_query)
+                                                             cypher_query=default_query,
+                                                             updated_since_epoch_ms=updated_since_epoch_ms)
 
         self.neo4j_extractor = Neo4jExtractor()
         # write the cypher query in configs in Neo4jExtractor scope
@@ -169,6 +200,10 @@ class Neo4jSearchDataExtractor(Extractor):
         # initialize neo4j_extractor from configs
         self.neo4j_extractor.init(Scoped.get_scoped_conf(self.conf, self.neo4j_extractor.get_scope()))
 
+        live_keys_file_path = conf.get_string(Neo4jSearchDataExtractor.LIVE_KEYS_FILE_PATH, '')
+        if live_keys_file_path and self.entity in Neo4jSearchDataExtractor.INCREMENTAL_ENTITIES:
+            self._write_live_keys(live_keys_file_path, publish_tag=conf.get_string(JOB_PUBLISH_TAG, ''))
+
     def close(self) -> None:
         """
         Use close() method specified by neo4j_extractor
@@ -185,18 +220,52 @@ class Neo4jSearchDataExtractor(Extractor):
     def get_scope(self) -> str:
         return 'extractor.search_data'
 
-    def _add_publish_tag_filter(self, publish_tag: str, cypher_query: str) -> str:
+    def _write_live_keys(self, file_path: str, publish_tag: str) -> None:
+        """
+        Writes the keys of all entities, one per line
+        :param file_path:
+        :param publish_tag: value of publish tag.
+        :return:
+        """
+        label, key = Neo4jSearchDataExtractor.INCREMENTAL_ENTITIES[self.entity]
+        query = self._add_publish_tag_filter(publish_tag,
+                                             Neo4jSearchDataExtractor.LIVE_KEYS_CYPHER_QUERY.format(
+                                                 entity=self.entity, label=label, key=key,
+                                                 publish_tag_filter='{publish_tag_filter}'))
+        LOGGER.info('Writing keys of all %s to %s', self.entity, file_path)
+        with self.neo4j_extractor.driver.session() as session, open(file_path, 'w') as live_keys_file:
+            for record in session.read_transaction(lambda tx: tx.run(query)):
+                live_keys_file.write(f'{record["key"]}\n')
+
+    def _add_publish_tag_filter(self, publish_tag: str, cypher_query: str, updated_since_epoch_ms: int = 0) -> str:
         """
         Adds publish tag filter into Cypher query
         :param publish_tag: value of publish tag.
         :param cypher_query:
+        :param updated_since_epoch_ms: if not 0, also filters entities not updated since then.
         :return:
         """
+        if not hasattr(self, 'entity'):
+            self.entity = 'table'
 
-        if not publish_tag:
-            publish_tag_filter = ''
-        else:
-            if not hasattr(self, 'entity'):
-                self.entity = 'table'
-            publish_tag_filter = f"WHERE {self.entity}.published_tag = '{publish_tag}'"
+        conditions: List[str] = []
+        if publish_tag:
+            conditions.append(f"{self.entity}.published_tag = '{publish_tag}'")
+        if updated_since_epoch_ms:
+            conditions.append(self._updated_since_condition(updated_since_epoch_ms))
+
+        publish_tag_filter = f"WHERE {' AND '.join(conditions)}" if conditions else ''
         return cypher_query.format(publish_tag_filter=publish_tag_filter)
+
+    def _updated_since_condition(self, updated_since_epoch_ms: int) -> str:
+        """
+        Neo4jCsvPublisher sets publisher_last_updated_epoch_ms on every node and relation it publishes, so an entity
+        document needs to be updated when the entity node or any node or relation its document is built from has a
+        newer one.
+        """
+        updated = f'{LAST_UPDATED_EPOCH_MS} >= {int(updated_since_epoch_ms)}'
+        conditions = [f'{self.entity}.{updated}',
+                      f'size([({self.entity})-[r]-(n) WHERE r.{updated} OR n.{updated} | 1]) > 0']
+        if self.entity == 'table':
+            conditions.append(f'size([(table)-[:COLUMN]->(:Column)-[r]-(n) WHERE r.{updated} OR n.{updated} | 1]) > 0')
+        return f"({' OR '.join(conditions)})"
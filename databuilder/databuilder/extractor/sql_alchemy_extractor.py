@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import importlib
-from typing import Any
+import logging
+import time
+from typing import Any, Iterator
 
 from pyhocon import ConfigFactory, ConfigTree
 from sqlalchemy import create_engine
@@ -10,27 +12,37 @@ from sqlalchemy import create_engine
 from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
 
+LOGGER = logging.getLogger(__name__)
+
 
 class SQLAlchemyExtractor(Extractor):
     # Config keys
     CONN_STRING = 'conn_string'
     EXTRACT_SQL = 'extract_sql'
     CONNECT_ARGS = 'connect_args'
+    # If its value is true, rows are fetched chunk_size at a time, through a server-side cursor where the dialect
+    # supports it, instead of all at once. Memory is then bounded by the chunk size rather than the result size.
+    STREAM_RESULTS = 'stream_results'
+    CHUNK_SIZE = 'chunk_size'
     """
     An Extractor that extracts records via SQLAlchemy. Database that supports SQLAlchemy can use this extractor
     """
 
+    DEFAULT_CONFIG = ConfigFactory.from_dict({STREAM_RESULTS: False, CHUNK_SIZE: 1000})
+
     def init(self, conf: ConfigTree) -> None:
         """
         Establish connections and import data model class if provided
         :param conf:
         """
-        self.conf = conf
+        self.conf = conf.with_fallback(SQLAlchemyExtractor.DEFAULT_CONFIG)
         self.conn_string = conf.get_string(SQLAlchemyExtractor.CONN_STRING)
 
         self.connection = self._get_connection()
 
         self.extract_sql = conf.get_string(SQLAlchemyExtractor.EXTRACT_SQL)
+        self.stream_results = self.conf.get_bool(SQLAlchemyExtractor.STREAM_RESULTS)
+        self.chunk_size = self.conf.get_int(SQLAlchemyExtractor.CHUNK_SIZE)
 
         model_class = conf.get('model_class', None)
         if model_class:
@@ -62,7 +74,14 @@ class SQLAlchemyExtractor(Extractor):
         Create an iterator to execute sql.
         """
         if not hasattr(self, 'results'):
-            self.results = self.connection.execute(self.extract_sql)
+            connection = self.connection
+            if self.stream_results:
+                connection = connection.execution_options(stream_results=True)
+            self.results = connection.execute(self.extract_sql)
+
+        if self.stream_results:
+            self.iter = self._stream_results()
+            return
 
         if hasattr(self, 'model_class'):
             results = [self.model_class(**result)
@@ -71,6 +90,26 @@ class SQLAlchemyExtractor(Extractor):
             results = self.results
         self.iter = iter(results)
 
+    def _stream_results(self) -> Iterator[Any]:
+        """
+        Fetch results chunk by chunk, converting rows to model only as they are extracted
+        """
+        start = time.time()
+        count = 0
+        while True:
+            rows = self.results.fetchmany(self.chunk_size)
+            if not rows:
+                break
+
+            for row in rows:
+                yield self.model_class(**row) if hasattr(self, 'model_class') else row
+
+            count += len(rows)
+            LOGGER.debug(f'Fetched {count} rows so far')
+
+        elapsed = time.time() - start
+        LOGGER.info(f'Extracted {count} rows in {elapsed:.1f} seconds ({count / max(elapsed, 1e-6):.1f} rows/sec)')
+
     def extract(self) -> Any:
         """
         Yield the sql result one at a time.
@@ -7,10 +7,12 @@ from pyhocon import ConfigTree
 
 from databuilder import Scoped
 from databuilder.utils.closer import Closer
+from databuilder.utils.job_metrics import JobMetrics
 
 
 class Job(Scoped):
     closer = Closer()
+    metrics = JobMetrics()
 
     """
     A Databuilder job that represents single work unit.
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import time
 
 from pyhocon import ConfigTree
 from statsd import StatsClient
@@ -10,6 +11,7 @@ from databuilder import Scoped
 from databuilder.job.base_job import Job
 from databuilder.publisher.base_publisher import NoopPublisher, Publisher
 from databuilder.task.base_task import Task
+from databuilder.utils.job_metrics import PUBLISH
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,11 +20,15 @@ class DefaultJob(Job):
     # Config keys
     IS_STATSD_ENABLED = 'is_statsd_enabled'
     JOB_IDENTIFIER = 'identifier'
+    # Path of a JSON file where the job writes the time and throughput of each stage
+    METRICS_SUMMARY_PATH = 'metrics_summary_path'
 
     """
     Default job that expects a task, and optional publisher
     If configured job will emit success/fail metric counter through statsd where prefix will be
     amundsen.databuilder.job.[identifier] .
+    Along with the counter, it emits the time, records and records per second of each stage (extract, transform, load,
+    publish) as recorded in Job.metrics, which can also be written as JSON summary to job.metrics_summary_path.
     Note that job.identifier is part of metrics prefix and choose unique & readable identifier for the job.
 
     To configure statsd itself, use environment variable: https://statsd.readthedocs.io/en/v3.2.1/configure.html
@@ -57,6 +63,8 @@ class DefaultJob(Job):
         """
 
         logging.info('Launching a job')
+        Job.metrics.reset()
+        start = time.perf_counter()
         #  Using nested try finally to make sure task get closed as soon as possible as well as to guarantee all the
         #  closeable get closed.
         try:
@@ -69,7 +77,9 @@ class DefaultJob(Job):
 
             self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
             Job.closer.register(self.publisher.close)
+            publish_start = time.perf_counter()
             self.publisher.publish()
+            Job.metrics.record(PUBLISH, seconds=time.perf_counter() - publish_start)
 
         except Exception as e:
             is_success = False
@@ -83,6 +93,19 @@ class DefaultJob(Job):
                 else:
                     LOGGER.info('Publishing job metrics for failure')
                     self.statsd.incr('fail')
+                Job.metrics.emit(self.statsd)
+
+            summary_path = self.scoped_conf.get_string(DefaultJob.METRICS_SUMMARY_PATH, None)
+            if summary_path:
+                try:
+                    Job.metrics.write_summary(summary_path, extra={
+                        'identifier': self.scoped_conf.get_string(DefaultJob.JOB_IDENTIFIER, None),
+                        'is_success': is_success,
+                        'seconds': round(time.perf_counter() - start, 3),
+                    })
+                except Exception:
+                    # Neither hide the error of the job nor skip closing
+                    LOGGER.exception(f'Failed to write job metrics summary to {summary_path}')
 
             Job.closer.close()
 
@@ -169,6 +169,7 @@ class FsNeo4jCSVLoader(Loader):
         def file_out_close() -> None:
             LOGGER.info('Closing file IO %s', file_out)
             file_out.close()
+            Job.metrics.record_file(file_out.name, os.path.getsize(file_out.name))
         self._closer.register(file_out_close)
 
         writer.writeheader()
@@ -45,3 +45,4 @@ class DashboardESDocument(ElasticsearchDocument):
         self.chart_names = chart_names
         self.tags = tags
         self.badges = badges
+        self.suggest = self._get_suggest([name], weight=total_usage)
@@ -2,7 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import re
 from abc import ABCMeta
+from typing import (
+    Any, Dict, Iterable, List, Optional,
+)
+
+# Max weight of a completion suggestion in Elasticsearch
+_MAX_SUGGEST_WEIGHT = 2 ** 31 - 1
 
 
 class ElasticsearchDocument:
@@ -12,6 +19,27 @@ class ElasticsearchDocument:
     """
     __metaclass__ = ABCMeta
 
+    @staticmethod
+    def _get_suggest(names: Iterable[Optional[str]], weight: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Builds the value of the completion suggest field, which suggests the document while typing any of its names,
+        from the start of the name or of any word in it. e.g: fact_order_items is suggested while typing
+        fact, order or items
+        :param names:
+        :param weight: Rank of the document among suggestions, e.g. its usage
+        :return:
+        """
+        inputs: List[str] = []
+        for name in names:
+            if not name:
+                continue
+            for word_start in [0] + [match.end() for match in re.finditer(r'[\s._\-/]+', name)]:
+                suggest_input = name[word_start:]
+                if suggest_input and suggest_input not in inputs:
+                    inputs.append(suggest_input)
+
+        return {'input': inputs, 'weight': min(max(int(weight or 0), 0), _MAX_SUGGEST_WEIGHT)}
+
     def to_json(self) -> str:
         """
         Convert object to json
@@ -47,3 +47,4 @@ class TableESDocument(ElasticsearchDocument):
         self.badges = badges
         self.schema_description = schema_description
         self.programmatic_descriptions = programmatic_descriptions
+        self.suggest = self._get_suggest([self.display_name, name], weight=total_usage)
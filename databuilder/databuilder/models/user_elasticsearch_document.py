@@ -39,3 +39,4 @@ class UserESDocument(ElasticsearchDocument):
         self.total_read = total_read
         self.total_own = total_own
         self.total_follow = total_follow
+        self.suggest = self._get_suggest([full_name, email.partition('@')[0] if email else None], weight=total_read)
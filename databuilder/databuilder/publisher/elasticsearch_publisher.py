@@ -1,12 +1,19 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import itertools
 import json
 import logging
-from typing import List
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any, Deque, Dict, Iterable, Iterator, List, Set, Tuple,
+)
 
 from amundsen_common.models.index_map import TABLE_INDEX_MAP
 from elasticsearch.exceptions import NotFoundError
+from elasticsearch.helpers import scan
 from pyhocon import ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
@@ -22,6 +29,10 @@ class ElasticsearchPublisher(Publisher):
     and traffic is routed to new index.
 
     Old index is deleted after the alias swap is complete
+
+    In incremental mode, documents are instead upserted into the index the alias points to, identified by their
+    document_id_field, and documents of removed entities are deleted. Periodic full builds remain needed to apply
+    mapping changes and compact the index.
     """
     FILE_PATH_CONFIG_KEY = 'file_path'
     FILE_MODE_CONFIG_KEY = 'mode'
@@ -34,6 +45,26 @@ class ElasticsearchPublisher(Publisher):
 
     # config to control how many max documents to publish at a time
     ELASTICSEARCH_PUBLISHER_BATCH_SIZE = 'batch_size'
+    # config to control how many max bytes of documents to publish at a time
+    ELASTICSEARCH_PUBLISHER_BATCH_BYTES = 'batch_bytes'
+    # config to control how many bulk requests are sent concurrently
+    ELASTICSEARCH_PUBLISHER_CONCURRENCY = 'concurrency'
+    # config to control how many times documents rejected by Elasticsearch (HTTP 429) are retried, with exponential
+    # backoff starting at retry_backoff_sec
+    ELASTICSEARCH_PUBLISHER_MAX_RETRIES = 'max_retries'
+    ELASTICSEARCH_PUBLISHER_RETRY_BACKOFF_SEC = 'retry_backoff_sec'
+    # config to disable refresh and replicas of the new index while loading it. They are restored, and the index
+    # refreshed, before the alias swap.
+    ELASTICSEARCH_PUBLISHER_TUNE_INDEX_SETTINGS = 'tune_index_settings'
+
+    # config of the document field used as document id, so that documents can be updated in place
+    ELASTICSEARCH_DOCUMENT_ID_FIELD_CONFIG_KEY = 'document_id_field'
+    # config to update the index the alias points to instead of building a new index. Requires document_id_field,
+    # and falls back to building a new index when no index has the alias yet.
+    ELASTICSEARCH_INCREMENTAL_CONFIG_KEY = 'incremental'
+    # config of a file listing ids of all documents to keep, one per line, e.g. written by Neo4jSearchDataExtractor.
+    # In incremental mode, other documents are deleted.
+    ELASTICSEARCH_LIVE_IDS_FILE_PATH_CONFIG_KEY = 'live_ids_file_path'
 
     DEFAULT_ELASTICSEARCH_INDEX_MAPPING = TABLE_INDEX_MAP
 
@@ -55,6 +86,23 @@ class ElasticsearchPublisher(Publisher):
                                                    ElasticsearchPublisher.DEFAULT_ELASTICSEARCH_INDEX_MAPPING)
         self.elasticsearch_batch_size = self.conf.get(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_SIZE,
                                                       10000)
+        self.elasticsearch_batch_bytes = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_BYTES,
+                                                           10 * 1024 * 1024)
+        self.concurrency = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_CONCURRENCY, 1)
+        self.max_retries = self.conf.get_int(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_MAX_RETRIES, 3)
+        self.retry_backoff_sec = self.conf.get_float(ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_RETRY_BACKOFF_SEC,
+                                                     1.0)
+        self.tune_index_settings = self.conf.get_bool(
+            ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_TUNE_INDEX_SETTINGS, False)
+        self.document_id_field = self.conf.get_string(ElasticsearchPublisher.ELASTICSEARCH_DOCUMENT_ID_FIELD_CONFIG_KEY,
+                                                      None)
+        self.incremental = self.conf.get_bool(ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY, False)
+        self.live_ids_file_path = self.conf.get_string(
+            ElasticsearchPublisher.ELASTICSEARCH_LIVE_IDS_FILE_PATH_CONFIG_KEY, None)
+        if self.incremental and not self.document_id_field:
+            raise ValueError(f'{ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY} requires '
+                             f'{ElasticsearchPublisher.ELASTICSEARCH_DOCUMENT_ID_FIELD_CONFIG_KEY}')
+
         self.file_handler = open(self.file_path, self.file_mode)
 
     def _fetch_old_index(self) -> List[str]:
@@ -77,36 +125,31 @@ class ElasticsearchPublisher(Publisher):
         After upload, swap alias from {old_index} to {new_index} in a atomic operation
         to route traffic to {new_index}
         """
-        actions = [json.loads(line) for line in self.file_handler.readlines()]
+        # Documents are read lazily, so that memory is bounded by the batches in flight rather than the file size
+        documents = self._read_documents()
+
+        if self.incremental:
+            elasticsearch_old_indices = list(self._fetch_old_index())
+            if len(elasticsearch_old_indices) == 1:
+                self._publish_incremental(index=elasticsearch_old_indices[0], documents=documents)
+                return
+            LOGGER.warning('Alias %s points to %i indices, building a new index instead of updating it',
+                           self.elasticsearch_alias, len(elasticsearch_old_indices))
+
         # ensure new data exists
-        if not actions:
+        first_document = next(documents, None)
+        if first_document is None:
             LOGGER.warning("received no data to upload to Elasticsearch!")
             return
 
-        # Convert object to json for elasticsearch bulk upload
-        # Bulk load JSON format is defined here:
-        # https://www.elastic.co/guide/en/elasticsearch/reference/6.2/docs-bulk.html
-        bulk_actions = []
-        cnt = 0
-
         # create new index with mapping
         self.elasticsearch_client.indices.create(index=self.elasticsearch_new_index, body=self.elasticsearch_mapping,
                                                  params={'include_type_name': 'true'})
-        for action in actions:
-            index_row = dict(index=dict(_index=self.elasticsearch_new_index,
-                                        _type=self.elasticsearch_type))
-            bulk_actions.append(index_row)
-            bulk_actions.append(action)
-            cnt += 1
-            if cnt == self.elasticsearch_batch_size:
-                self.elasticsearch_client.bulk(bulk_actions)
-                LOGGER.info('Publish %i of records to ES', cnt)
-                cnt = 0
-                bulk_actions = []
-
-        # Do the final bulk actions
-        if bulk_actions:
-            self.elasticsearch_client.bulk(bulk_actions)
+
+        index_settings = self._disable_refresh_and_replicas() if self.tune_index_settings else None
+        self._bulk_index(index=self.elasticsearch_new_index, documents=itertools.chain([first_document], documents))
+        if index_settings is not None:
+            self._restore_index_settings(index_settings)
 
         # fetch indices that have {elasticsearch_alias} as alias
         elasticsearch_old_indices = self._fetch_old_index()
@@ -123,5 +166,153 @@ class ElasticsearchPublisher(Publisher):
         # perform alias update and index delete in single atomic operation
         self.elasticsearch_client.indices.update_aliases(update_action)
 
+    def _read_documents(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Lazily reads documents from file
+        :return: Iterator of (document, size of its JSON in bytes)
+        """
+        for line in self.file_handler:
+            if line.strip():
+                yield json.loads(line), len(line.encode('utf-8'))
+
+    def _disable_refresh_and_replicas(self) -> Dict[str, Any]:
+        """
+        Disables refresh and replicas of the new index, which are only needed once it is loaded
+        :return: Index settings to restore
+        """
+        settings = self.elasticsearch_client.indices.get_settings(index=self.elasticsearch_new_index)
+        index_settings = settings.get(self.elasticsearch_new_index, {}).get('settings', {}).get('index', {})
+        # Settings missing from the index are restored to their default with None
+        original_settings = {'refresh_interval': index_settings.get('refresh_interval'),
+                             'number_of_replicas': index_settings.get('number_of_replicas')}
+
+        self.elasticsearch_client.indices.put_settings(index=self.elasticsearch_new_index,
+                                                       body={'index': {'refresh_interval': '-1',
+                                                                       'number_of_replicas': 0}})
+        return original_settings
+
+    def _restore_index_settings(self, index_settings: Dict[str, Any]) -> None:
+        self.elasticsearch_client.indices.put_settings(index=self.elasticsearch_new_index,
+                                                       body={'index': index_settings})
+        self.elasticsearch_client.indices.refresh(index=self.elasticsearch_new_index)
+
+    def _bulk_index(self, index: str, documents: Iterable[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Index documents. Documents with the same id as an existing document replace it.
+        """
+        # Convert object to json for elasticsearch bulk upload
+        # Bulk load JSON format is defined here:
+        # https://www.elastic.co/guide/en/elasticsearch/reference/6.2/docs-bulk.html
+        def bulk_items() -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+            for document, size in documents:
+                index_row = dict(index=dict(_index=index,
+                                            _type=self.elasticsearch_type))
+                if self.document_id_field:
+                    index_row['index']['_id'] = document[self.document_id_field]
+                yield [index_row, document], size
+
+        self._bulk(bulk_items())
+
+    def _bulk(self, items: Iterable[Tuple[List[Dict[str, Any]], int]]) -> None:
+        """
+        Sends bulk items, each being the lines of one bulk action with their size, in batches of at most
+        {batch_size} items and {batch_bytes} bytes. Up to {concurrency} batches are sent at the same time.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else None
+        futures: Deque[Future] = deque()
+
+        def send(batch: List[List[Dict[str, Any]]]) -> None:
+            if executor is None:
+                self._send_bulk(batch)
+                return
+            futures.append(executor.submit(self._send_bulk, batch))
+            # Bound the number of batches held in memory
+            while len(futures) >= 2 * self.concurrency:
+                futures.popleft().result()
+
+        try:
+            batch: List[List[Dict[str, Any]]] = []
+            batch_bytes = 0
+            for item, size in items:
+                if batch and batch_bytes + size > self.elasticsearch_batch_bytes:
+                    send(batch)
+                    batch, batch_bytes = [], 0
+                batch.append(item)
+                batch_bytes += size
+                if len(batch) == self.elasticsearch_batch_size:
+                    send(batch)
+                    batch, batch_bytes = [], 0
+
+            # Do the final bulk actions
+            if batch:
+                send(batch)
+            while futures:
+                futures.popleft().result()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _send_bulk(self, batch: List[List[Dict[str, Any]]]) -> None:
+        """
+        Sends one bulk request, then retries the items Elasticsearch rejected because its queues were full
+        """
+        for attempt in range(self.max_retries + 1):
+            response = self.elasticsearch_client.bulk([line for item in batch for line in item])
+            LOGGER.info('Publish %i of records to ES', len(batch))
+            if not response.get('errors'):
+                return
+
+            rejected = []
+            for item, result in zip(batch, response['items']):
+                status = next(iter(result.values()))
+                if status.get('status') == 429:
+                    rejected.append(item)
+                elif status.get('error'):
+                    LOGGER.error('Failed to publish %s to ES: %s', item[0], status['error'])
+            if not rejected:
+                return
+
+            batch = rejected
+            if attempt < self.max_retries:
+                backoff_sec = self.retry_backoff_sec * 2 ** attempt
+                LOGGER.warning('%i records rejected by ES, retrying in %.1f sec', len(batch), backoff_sec)
+                time.sleep(backoff_sec)
+
+        raise Exception(f'{len(batch)} records rejected by ES after {self.max_retries} retries')
+
+    def _publish_incremental(self, index: str, documents: Iterator[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Upsert documents into the index behind the alias, then delete documents not listed in {live_ids_file_path}
+        """
+        published_ids: Set[str] = set()
+
+        def collect_ids() -> Iterator[Tuple[Dict[str, Any], int]]:
+            for document, size in documents:
+                published_ids.add(str(document[self.document_id_field]))
+                yield document, size
+
+        self._bulk_index(index=index, documents=collect_ids())
+        LOGGER.info('Updated %i documents of index %s', len(published_ids), index)
+
+        if not self.live_ids_file_path:
+            return
+
+        with open(self.live_ids_file_path, 'r') as live_ids_file:
+            live_ids = {line.rstrip('\n') for line in live_ids_file if line.strip()}
+        if not live_ids:
+            # Most likely a failed extraction rather than removal of every entity
+            LOGGER.warning('No live ids in %s, not deleting any document', self.live_ids_file_path)
+            return
+        live_ids.update(published_ids)
+
+        removed_ids: List[str] = [
+            hit['_id'] for hit in scan(self.elasticsearch_client, index=index, query={'query': {'match_all': {}}},
+                                       _source=False)
+            if hit['_id'] not in live_ids
+        ]
+        self._bulk(([{'delete': {'_index': index, '_type': self.elasticsearch_type, '_id': removed_id}}],
+                    len(removed_id)) for removed_id in removed_ids)
+        LOGGER.info('Deleted %i documents of removed entities from index %s', len(removed_ids), index)
+
     def get_scope(self) -> str:
         return 'publisher.elasticsearch'
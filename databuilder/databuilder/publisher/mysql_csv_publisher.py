@@ -8,20 +8,51 @@ from os.path import (
     basename, isfile, join, splitext,
 )
 from typing import (
-    Dict, List, Optional, Type,
+    Any, Dict, Iterator, List, Optional, Type,
 )
 
-import pandas
 from amundsen_rds.models import RDSModel
 from amundsen_rds.models.base import Base
 from pyhocon import ConfigFactory, ConfigTree
-from sqlalchemy import create_engine
+from sqlalchemy import Table, create_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import Insert
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.utils.csv_reader import read_csv_records
 
 LOGGER = logging.getLogger(__name__)
 
+# Dialects that Upsert compiles to
+_UPSERT_DIALECTS = ('mysql', 'sqlite', 'postgresql')
+
+
+class Upsert(Insert):
+    """
+    INSERT statement updating the given columns of rows whose primary key already exists:
+    INSERT ... ON DUPLICATE KEY UPDATE on MySQL, INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL.
+    """
+
+    def __init__(self, table: Table, update_columns: List[str]) -> None:
+        super(Upsert, self).__init__(table)
+        self.update_columns = update_columns
+
+
+@compiles(Upsert)
+def _compile_upsert(upsert: Upsert, compiler: SQLCompiler, **kw: Any) -> str:
+    insert = compiler.visit_insert(upsert, **kw)
+    quote = compiler.preparer.quote
+    if compiler.dialect.name == 'mysql':
+        updates = ', '.join(f'{quote(column)} = VALUES({quote(column)})' for column in upsert.update_columns)
+        return f'{insert} ON DUPLICATE KEY UPDATE {updates}'
+    if compiler.dialect.name in ('sqlite', 'postgresql'):
+        primary_key = ', '.join(quote(column.name) for column in upsert.table.primary_key)
+        updates = ', '.join(f'{quote(column)} = excluded.{quote(column)}' for column in upsert.update_columns)
+        return f'{insert} ON CONFLICT ({primary_key}) DO UPDATE SET {updates}'
+    raise NotImplementedError(f'Upsert is not supported on {compiler.dialect.name}')
+
 
 class MySQLCSVPublisher(Publisher):
     """
@@ -49,10 +80,14 @@ class MySQLCSVPublisher(Publisher):
     TRANSACTION_SIZE = 'transaction_size'
     # A progress report frequency that determines how often it report the progress.
     PROGRESS_REPORT_FREQUENCY = 'progress_report_frequency'
+    # If its value is true, records are upserted {transaction_size} rows per statement,
+    # instead of merging them one by one through the ORM.
+    BULK_UPSERT = 'bulk_upsert'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({TRANSACTION_SIZE: 500,
                                                PROGRESS_REPORT_FREQUENCY: 500,
-                                               ENGINE_ECHO: False})
+                                               ENGINE_ECHO: False,
+                                               BULK_UPSERT: False})
 
     def __init__(self) -> None:
         super(MySQLCSVPublisher, self).__init__()
@@ -73,6 +108,10 @@ class MySQLCSVPublisher(Publisher):
                                      connect_args=connect_args)
         self._session_factory = sessionmaker(bind=self._engine)
         self._transaction_size = conf.get_int(MySQLCSVPublisher.TRANSACTION_SIZE)
+        self._bulk_upsert = conf.get_bool(MySQLCSVPublisher.BULK_UPSERT)
+        if self._bulk_upsert and self._engine.dialect.name not in _UPSERT_DIALECTS:
+            raise ValueError(f'{MySQLCSVPublisher.BULK_UPSERT} is not supported on {self._engine.dialect.name}, '
+                             f'only on {", ".join(_UPSERT_DIALECTS)}')
 
         self._publish_tag: str = conf.get_string(MySQLCSVPublisher.JOB_PUBLISH_TAG)
         if not self._publish_tag:
@@ -148,18 +187,55 @@ class MySQLCSVPublisher(Publisher):
         :param session:
         :return:
         """
-        with open(record_file, 'r', encoding='utf8') as record_csv:
-            table_name = self._get_table_name_from_file(record_file)
-            table_model = self._get_model_from_table_name(table_name)
-            if not table_model:
-                raise RuntimeError(f'Failed to get model for table: {table_name}')
+        table_name = self._get_table_name_from_file(record_file)
+        table_model = self._get_model_from_table_name(table_name)
+        if not table_model:
+            raise RuntimeError(f'Failed to get model for table: {table_name}')
+
+        if self._bulk_upsert:
+            self._publish_bulk(record_file=record_file, model=table_model, session=session)
+            return
+
+        for record_dict in read_csv_records(record_file):
+            record = self._create_record(model=table_model, record_dict=record_dict)
+            session.merge(record)
+            self._execute(session)
+        session.commit()
 
-            for record_dict in pandas.read_csv(record_csv, na_filter=False).to_dict(orient='records'):
-                record = self._create_record(model=table_model, record_dict=record_dict)
-                session.merge(record)
-                self._execute(session)
+    def _publish_bulk(self, record_file: str, model: Type[RDSModel], session: Session) -> None:
+        """
+        Upsert records of the given csv file, {transaction_size} rows per statement and transaction.
+        As with session.merge, columns missing from the file are left unchanged on existing rows.
+        :param record_file:
+        :param model:
+        :param session:
+        :return:
+        """
+        table = model.__table__
+        primary_key = {column.name for column in table.primary_key}
+        for chunk in self._chunk_records(read_csv_records(record_file)):
+            publisher_last_updated_epoch_ms = int(time.time() * 1000)
+            for record_dict in chunk:
+                record_dict['published_tag'] = self._publish_tag
+                record_dict['publisher_last_updated_epoch_ms'] = publisher_last_updated_epoch_ms
+
+            update_columns = [column for column in chunk[0] if column not in primary_key]
+            session.execute(Upsert(table, update_columns), chunk)
             session.commit()
 
+            self._count += len(chunk)
+            LOGGER.info(f'Committed {self._count} records so far')
+
+    def _chunk_records(self, records: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        chunk: List[Dict[str, Any]] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == self._transaction_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
     def _get_model_from_table_name(self, table_name: str) -> Optional[Type[RDSModel]]:
         """
         Get rds model for the given table name
@@ -3,22 +3,34 @@
 
 import csv
 import ctypes
+import itertools
+import json
 import logging
+import os
+import threading
 import time
-from io import open
+from concurrent.futures import ThreadPoolExecutor
 from os import listdir
 from os.path import isfile, join
-from typing import List, Set
+from typing import (
+    Any, Callable, Dict, Iterator, List, Optional, Set, Tuple,
+)
 
 import neo4j
-import pandas
 from jinja2 import Template
-from neo4j import GraphDatabase, Transaction
-from neo4j.exceptions import CypherError, TransientError
+from neo4j import (
+    GraphDatabase, Session, Transaction,
+)
+from neo4j.exceptions import (
+    CypherError, ServiceUnavailable, TransientError,
+)
 from pyhocon import ConfigFactory, ConfigTree
 
+from databuilder.job.base_job import Job
 from databuilder.publisher.base_publisher import Publisher
 from databuilder.publisher.neo4j_preprocessor import NoopRelationPreprocessor
+from databuilder.utils.csv_reader import read_csv_column_values, read_csv_records
+from databuilder.utils.job_metrics import PUBLISH
 
 # Setting field_size_limit to solve the error below
 # _csv.Error: field larger than field limit (131072)
@@ -47,6 +59,31 @@ NEO4J_CREATE_ONLY_NODES = 'neo4j_create_only_nodes'
 # list of node labels that could attempt to be accessed simultaneously
 NEO4J_DEADLOCK_NODE_LABELS = 'neo4j_deadlock_node_labels'
 
+# A number of CSV rows sent per UNWIND statement. When set to a positive number, nodes and relations are
+# published with batched UNWIND statements (one transaction per batch) instead of one MERGE statement per row.
+NEO4J_UNWIND_BATCH_SIZE = 'neo4j_unwind_batch_size'
+
+# A number of sessions used to publish files concurrently. Node files of different labels are published in parallel,
+# and then relation files, where files touching the same NEO4J_DEADLOCK_NODE_LABELS never run concurrently.
+NEO4J_PUBLISH_CONCURRENCY = 'neo4j_publish_concurrency'
+
+# A boolean flag to adapt the number of MERGE statements per transaction, starting from NEO4J_TRANSACTION_SIZE:
+# it grows while commits take less than NEO4J_TARGET_COMMIT_SEC, and shrinks when they take longer or fail on memory
+# pressure or timeout, within [NEO4J_MIN_TRANSACTION_SIZE, NEO4J_MAX_TRANSACTION_SIZE].
+NEO4J_ADAPTIVE_TRANSACTION_SIZE = 'neo4j_adaptive_transaction_size'
+NEO4J_MIN_TRANSACTION_SIZE = 'neo4j_min_transaction_size'
+NEO4J_MAX_TRANSACTION_SIZE = 'neo4j_max_transaction_size'
+NEO4J_TARGET_COMMIT_SEC = 'neo4j_target_commit_sec'
+
+# A JSON file where the number of committed rows of each file is recorded after every commit, so that a failed publish
+# run again with the same JOB_PUBLISH_TAG resumes from the last committed batch. Deleted once publish succeeds.
+NEO4J_CHECKPOINT_PATH = 'neo4j_checkpoint_path'
+
+# Number of retries of a failed transaction, waiting NEO4J_RETRY_BACKOFF_SEC * 2^retry before each one. Used along with
+# NEO4J_ADAPTIVE_TRANSACTION_SIZE or NEO4J_CHECKPOINT_PATH, where MERGE statements are retried on any transient error.
+NEO4J_MAX_RETRIES = 'neo4j_max_retries'
+NEO4J_RETRY_BACKOFF_SEC = 'neo4j_retry_backoff_sec'
+
 NEO4J_USER = 'neo4j_user'
 NEO4J_PASSWORD = 'neo4j_password'
 NEO4J_ENCRYPTED = 'neo4j_encrypted'
@@ -93,21 +130,174 @@ RELATION_REQUIRED_KEYS = {RELATION_START_LABEL, RELATION_START_KEY,
                           RELATION_END_LABEL, RELATION_END_KEY,
                           RELATION_TYPE, RELATION_REVERSE_TYPE}
 
+# transient error retries and sleep time
+RETRIES_NUMBER = 5
+SLEEP_TIME = 2
+
+# Error codes of transactions failing for their size, e.g: Neo.TransientError.General.OutOfMemoryError,
+# Neo.TransientError.General.TransactionMemoryLimit or Neo.ClientError.Transaction.TransactionTimedOut
+OVERSIZED_TRANSACTION_ERROR_CODES = ('OutOfMemory', 'MemoryLimit', 'TimedOut')
+
 DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_TRANSACTION_SIZE: 500,
                                           NEO4J_PROGRESS_REPORT_FREQUENCY: 500,
                                           NEO4J_RELATIONSHIP_CREATION_CONFIRM: False,
                                           NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                           NEO4J_ENCRYPTED: True,
                                           NEO4J_VALIDATE_SSL: False,
+                                          NEO4J_UNWIND_BATCH_SIZE: 0,
+                                          NEO4J_PUBLISH_CONCURRENCY: 1,
+                                          NEO4J_ADAPTIVE_TRANSACTION_SIZE: False,
+                                          NEO4J_MIN_TRANSACTION_SIZE: 50,
+                                          NEO4J_MAX_TRANSACTION_SIZE: 10000,
+                                          NEO4J_TARGET_COMMIT_SEC: 5,
+                                          NEO4J_MAX_RETRIES: RETRIES_NUMBER,
+                                          NEO4J_RETRY_BACKOFF_SEC: SLEEP_TIME,
                                           RELATION_PREPROCESSOR: NoopRelationPreprocessor()})
 
-# transient error retries and sleep time
-RETRIES_NUMBER = 5
-SLEEP_TIME = 2
+# Statement templates are compiled once. Rendered statements are cached per publisher by the shape of the record.
+NODE_MERGE_TEMPLATE = Template("""
+    MERGE (node:{{ LABEL }} {key: $KEY})
+    ON CREATE SET {{ PROP_BODY }}
+    {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
+""")
+
+NODE_MERGE_BATCH_TEMPLATE = Template("""
+    UNWIND $batch AS row
+    MERGE (node:{{ LABEL }} {key: row.KEY})
+    ON CREATE SET {{ PROP_BODY }}
+    {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
+""")
+
+RELATION_MERGE_TEMPLATE = Template("""
+    MATCH (n1:{{ START_LABEL }} {key: $START_KEY}), (n2:{{ END_LABEL }} {key: $END_KEY})
+    MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
+    {% if update_prop_body %}
+    ON CREATE SET {{ prop_body }}
+    ON MATCH SET {{ prop_body }}
+    {% endif %}
+    RETURN n1.key, n2.key
+""")
+
+RELATION_MERGE_BATCH_TEMPLATE = Template("""
+    UNWIND $batch AS row
+    MATCH (n1:{{ START_LABEL }} {key: row.START_KEY}), (n2:{{ END_LABEL }} {key: row.END_KEY})
+    MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
+    {% if update_prop_body %}
+    ON CREATE SET {{ prop_body }}
+    ON MATCH SET {{ prop_body }}
+    {% endif %}
+    RETURN count(*) AS count
+""")
+
+CREATE_INDEX_TEMPLATE = Template("""
+    CREATE CONSTRAINT ON (node:{{ LABEL }}) ASSERT node.key IS UNIQUE
+""")
 
 LOGGER = logging.getLogger(__name__)
 
 
+class _PublishWorkerState(threading.local):
+    """
+    State of the thread publishing files: its session, and number of statements it executed.
+    """
+
+    def __init__(self) -> None:
+        self.session: Optional[Session] = None
+        self.count = 0
+
+
+def _is_oversized_transaction_error(e: Exception) -> bool:
+    code = getattr(e, 'code', None) or ''
+    return any(oversized_code in code for oversized_code in OVERSIZED_TRANSACTION_ERROR_CODES)
+
+
+class _TransactionSize(object):
+    """
+    Number of statements per transaction. When adaptive, it grows by half while full transactions commit within
+    target_commit_sec, and halves when a commit takes longer or a transaction is too large to commit.
+    """
+
+    def __init__(self, size: int, min_size: int, max_size: int, target_commit_sec: float, adaptive: bool) -> None:
+        self.size = size
+        self._min_size = min_size
+        self._max_size = max_size
+        self._target_commit_sec = target_commit_sec
+        self._adaptive = adaptive
+        self._lock = threading.Lock()
+
+    def committed(self, statements: int, seconds: float) -> None:
+        if not self._adaptive:
+            return
+        with self._lock:
+            if seconds > self._target_commit_sec:
+                self._resize(self.size // 2)
+            elif statements >= self.size:
+                self._resize(self.size + max(self.size // 2, 1))
+
+    def shrink(self) -> None:
+        if not self._adaptive:
+            return
+        with self._lock:
+            self._resize(self.size // 2)
+
+    def _resize(self, size: int) -> None:
+        size = min(max(size, self._min_size), self._max_size)
+        if size != self.size:
+            LOGGER.info('Transaction size changed from %i to %i statements', self.size, size)
+            self.size = size
+
+
+class _PublishCheckpoint(object):
+    """
+    Number of rows committed per file, persisted as JSON after each commit. Files are identified by path, size and
+    modification time, so that a file written again since is published from the start.
+    """
+
+    def __init__(self, path: str, publish_tag: str) -> None:
+        self._path = path
+        self._publish_tag = publish_tag
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf8') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint.get('publish_tag') == publish_tag:
+                self._files = checkpoint['files']
+                LOGGER.info('Resuming publish from checkpoint %s', path)
+            else:
+                LOGGER.warning('Ignoring checkpoint %s of another publish tag', path)
+
+    @staticmethod
+    def _signature(file: str) -> List[float]:
+        stat = os.stat(file)
+        return [stat.st_size, stat.st_mtime]
+
+    def committed_rows(self, file: str) -> int:
+        with self._lock:
+            entry = self._files.get(file)
+        if entry is None or entry['signature'] != self._signature(file):
+            return 0
+        return entry['rows']
+
+    def advance(self, file: str, rows: int) -> None:
+        with self._lock:
+            entry = self._files.get(file)
+            if entry is None or entry['signature'] != self._signature(file):
+                entry = self._files[file] = {'signature': self._signature(file), 'rows': 0}
+            entry['rows'] += rows
+
+            temp_path = f'{self._path}.tmp'
+            with open(temp_path, 'w', encoding='utf8') as checkpoint_file:
+                json.dump({'publish_tag': self._publish_tag, 'files': self._files}, checkpoint_file)
+            os.replace(temp_path, self._path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files = {}
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+
 class Neo4jCsvPublisher(Publisher):
     """
     A Publisher takes two folders for input and publishes to Neo4j.
@@ -116,7 +306,14 @@ class Neo4jCsvPublisher(Publisher):
     Neo4j follows Label Node properties Graph and more information about this is in:
     https://neo4j.com/docs/developer-manual/current/introduction/graphdb-concepts/
 
-    #TODO User UNWIND batch operation for better performance
+    By default, every CSV row is published with its own MERGE statement. When NEO4J_UNWIND_BATCH_SIZE is set,
+    rows sharing the same shape are grouped and published with a single UNWIND statement per batch.
+
+    When NEO4J_ADAPTIVE_TRANSACTION_SIZE or NEO4J_CHECKPOINT_PATH is set, MERGE statements of each file are committed
+    in batches of the (adaptive) transaction size. A failed batch is retried with exponential backoff, and committed
+    batches are checkpointed, so that a failed publish resumes from the last committed batch.
+    Resuming requires the CSV files of the failed run, which FsNeo4jCSVLoader deletes when the job ends unless its
+    SHOULD_DELETE_CREATED_DIR is False.
     """
 
     def __init__(self) -> None:
@@ -126,6 +323,8 @@ class Neo4jCsvPublisher(Publisher):
         conf = conf.with_fallback(DEFAULT_CONFIG)
 
         self._count: int = 0
+        self._count_lock = threading.Lock()
+        self._worker = _PublishWorkerState()
         self._progress_report_frequency = conf.get_int(NEO4J_PROGRESS_REPORT_FREQUENCY)
         self._node_files = self._list_files(conf, NODE_FILES_DIR)
         self._node_files_iter = iter(self._node_files)
@@ -142,6 +341,8 @@ class Neo4jCsvPublisher(Publisher):
                                  encrypted=conf.get_bool(NEO4J_ENCRYPTED),
                                  trust=trust)
         self._transaction_size = conf.get_int(NEO4J_TRANSACTION_SIZE)
+        self._unwind_batch_size = conf.get_int(NEO4J_UNWIND_BATCH_SIZE)
+        self._publish_concurrency = conf.get_int(NEO4J_PUBLISH_CONCURRENCY)
         self._session = self._driver.session()
         self._confirm_rel_created = conf.get_bool(NEO4J_RELATIONSHIP_CREATION_CONFIRM)
 
@@ -150,12 +351,26 @@ class Neo4jCsvPublisher(Publisher):
         self.create_only_nodes = set(conf.get_list(NEO4J_CREATE_ONLY_NODES, default=[]))
         self.deadlock_node_labels = set(conf.get_list(NEO4J_DEADLOCK_NODE_LABELS, default=[]))
         self.labels: Set[str] = set()
+        self._node_file_labels: Dict[str, Set[str]] = {}
+        self._statement_cache: Dict[Tuple, str] = {}
         self.publish_tag: str = conf.get_string(JOB_PUBLISH_TAG)
         if not self.publish_tag:
             raise Exception(f'{JOB_PUBLISH_TAG} should not be empty')
 
         self._relation_preprocessor = conf.get(RELATION_PREPROCESSOR)
 
+        adaptive = conf.get_bool(NEO4J_ADAPTIVE_TRANSACTION_SIZE)
+        self._adaptive_transaction_size = _TransactionSize(self._transaction_size,
+                                                           min_size=conf.get_int(NEO4J_MIN_TRANSACTION_SIZE),
+                                                           max_size=conf.get_int(NEO4J_MAX_TRANSACTION_SIZE),
+                                                           target_commit_sec=conf.get_float(NEO4J_TARGET_COMMIT_SEC),
+                                                           adaptive=adaptive)
+        checkpoint_path = conf.get_string(NEO4J_CHECKPOINT_PATH, None)
+        self._checkpoint = _PublishCheckpoint(checkpoint_path, self.publish_tag) if checkpoint_path else None
+        self._publish_in_batches = adaptive or self._checkpoint is not None
+        self._max_retries = conf.get_int(NEO4J_MAX_RETRIES)
+        self._retry_backoff_sec = conf.get_float(NEO4J_RETRY_BACKOFF_SEC)
+
         LOGGER.info('Publishing Node csv files %s, and Relation CSV files %s', self._node_files, self._relation_files)
 
     def _list_files(self, conf: ConfigTree, path_key: str) -> List[str]:
@@ -183,6 +398,16 @@ class Neo4jCsvPublisher(Publisher):
         for node_file in self._node_files:
             self._create_indices(node_file=node_file)
 
+        if self._publish_concurrency > 1:
+            self._publish_concurrently()
+            LOGGER.info('Committed total %i statements', self._count)
+            if self._checkpoint:
+                self._checkpoint.clear()
+            # The job records the time of publish, which makes this statements per second
+            Job.metrics.record(PUBLISH, records=self._count)
+            LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
+            return
+
         LOGGER.info('Publishing Node files: %s', self._node_files)
         try:
             tx = self._session.begin_transaction()
@@ -203,8 +428,9 @@ class Neo4jCsvPublisher(Publisher):
 
             tx.commit()
             LOGGER.info('Committed total %i statements', self._count)
-
-            # TODO: Add statsd support
+            if self._checkpoint:
+                self._checkpoint.clear()
+            Job.metrics.record(PUBLISH, records=self._count)
             LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
         except Exception as e:
             LOGGER.exception('Failed to publish. Rolling back.')
@@ -212,23 +438,124 @@ class Neo4jCsvPublisher(Publisher):
                 tx.rollback()
             raise e
 
+    def _publish_concurrently(self) -> None:
+        """
+        Publishes Nodes first and then Relations on a pool of NEO4J_PUBLISH_CONCURRENCY sessions.
+        Node files sharing a label are published by the same worker. Relation files that share a label in
+        NEO4J_DEADLOCK_NODE_LABELS are published by the same worker so that they never run concurrently.
+        :return:
+        """
+        node_file_groups = self._group_files(self._node_file_labels)
+        LOGGER.info('Publishing Node files concurrently in %i groups: %s', len(node_file_groups), node_file_groups)
+        self._run_file_groups(node_file_groups, self._publish_node)
+
+        relation_file_labels = {
+            relation_file: self._get_relation_labels(relation_file) & self.deadlock_node_labels
+            for relation_file in self._relation_files
+        }
+        relation_file_groups = self._group_files(relation_file_labels)
+        LOGGER.info('Publishing Relationship files concurrently in %i groups: %s',
+                    len(relation_file_groups), relation_file_groups)
+        self._run_file_groups(relation_file_groups, self._publish_relation)
+
+    def _run_file_groups(self,
+                         file_groups: List[List[str]],
+                         publish_fn: Callable[[str, Transaction], Transaction]) -> None:
+        """
+        Runs each group of files on its own session, groups running in parallel. Files within a group are published
+        in order. Waits until all groups are done, and raises the first exception if any group failed.
+        :param file_groups:
+        :param publish_fn: Either _publish_node or _publish_relation
+        :return:
+        """
+        with ThreadPoolExecutor(max_workers=self._publish_concurrency) as executor:
+            futures = [executor.submit(self._publish_file_group, file_group, publish_fn)
+                       for file_group in file_groups]
+        for future in futures:
+            future.result()
+
+    def _publish_file_group(self,
+                            file_group: List[str],
+                            publish_fn: Callable[[str, Transaction], Transaction]) -> None:
+        with self._driver.session() as session:
+            self._worker.session = session
+            self._worker.count = 0
+            tx = session.begin_transaction()
+            try:
+                for group_file in file_group:
+                    tx = publish_fn(group_file, tx)
+                tx.commit()
+            except Exception as e:
+                LOGGER.exception('Failed to publish %s. Rolling back.', file_group)
+                if not tx.closed():
+                    tx.rollback()
+                raise e
+            finally:
+                self._worker.session = None
+
+    @staticmethod
+    def _group_files(file_labels: Dict[str, Set[str]]) -> List[List[str]]:
+        """
+        Groups files so that any two files sharing a label end up in the same group.
+        :param file_labels: Labels of each file. A file without label is a group by itself.
+        :return: Groups of files, each keeping the original order of files
+        """
+        groups: List[Tuple[Set[str], List[str]]] = []
+        for file, labels in file_labels.items():
+            group_labels, group_files = set(labels), [file]
+            disjoint_groups = []
+            for other_labels, other_files in groups:
+                if other_labels & group_labels:
+                    group_labels |= other_labels
+                    group_files = other_files + group_files
+                else:
+                    disjoint_groups.append((other_labels, other_files))
+            groups = disjoint_groups + [(group_labels, group_files)]
+
+        file_order = {file: i for i, file in enumerate(file_labels)}
+        return [sorted(group_files, key=file_order.__getitem__) for _, group_files in groups]
+
+    def _get_relation_labels(self, relation_file: str) -> Set[str]:
+        """
+        Reads start and end labels of a relation file
+        :param relation_file:
+        :return:
+        """
+        return read_csv_column_values(relation_file, [RELATION_START_LABEL, RELATION_END_LABEL])
+
+    def _get_session(self) -> Session:
+        """
+        :return: Session of the current publishing worker, or the publisher's session when publishing serially
+        """
+        return self._worker.session or self._session
+
+    def _add_count(self, count: int) -> int:
+        """
+        Adds to the total number of published statements (or records in UNWIND batch mode)
+        :param count:
+        :return: The total after addition
+        """
+        with self._count_lock:
+            self._count += count
+            return self._count
+
     def get_scope(self) -> str:
         return 'publisher.neo4j'
 
     def _create_indices(self, node_file: str) -> None:
         """
-        Go over the node file and try creating unique index
+        Go over the labels of the node file and try creating unique index. Only the LABEL column is read.
         :param node_file:
         :return:
         """
         LOGGER.info('Creating indices. (Existing indices will be ignored)')
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient='records'):
-                label = node_record[NODE_LABEL_KEY]
-                if label not in self.labels:
-                    self._try_create_index(label)
-                    self.labels.add(label)
+        file_labels = read_csv_column_values(node_file, [NODE_LABEL_KEY])
+        self._node_file_labels[node_file] = file_labels
+        for label in file_labels:
+            if label not in self.labels:
+                self._try_create_index(label)
+                self.labels.add(label)
 
         LOGGER.info('Indices have been created.')
 
@@ -249,12 +576,19 @@ class Neo4jCsvPublisher(Publisher):
         :param node_file:
         :return:
         """
-
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv, na_filter=False).to_dict(orient="records"):
-                stmt = self.create_node_merge_statement(node_record=node_record)
-                params = self._create_props_param(node_record)
-                tx = self._execute_statement(stmt, tx, params)
+        if self._unwind_batch_size > 0:
+            return self._publish_node_batch(node_file, tx=tx)
+
+        if self._publish_in_batches:
+            statements = ((self.create_node_merge_statement(node_record=node_record),
+                           self._create_props_param(node_record), False)
+                          for node_record in read_csv_records(node_file))
+            return self._publish_statements(node_file, statements, tx=tx)
+
+        for node_record in read_csv_records(node_file):
+            stmt = self.create_node_merge_statement(node_record=node_record)
+            params = self._create_props_param(node_record)
+            tx = self._execute_statement(stmt, tx, params)
         return tx
 
     def is_create_only_node(self, node_record: dict) -> bool:
@@ -274,19 +608,28 @@ class Neo4jCsvPublisher(Publisher):
         :param node_record:
         :return:
         """
-        template = Template("""
-            MERGE (node:{{ LABEL }} {key: $KEY})
-            ON CREATE SET {{ PROP_BODY }}
-            {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
-        """)
+        return self._create_node_statement(NODE_MERGE_TEMPLATE, node_record, value_prefix='$')
 
-        prop_body = self._create_props_body(node_record, NODE_REQUIRED_KEYS, 'node')
-
-        return template.render(LABEL=node_record["LABEL"],
-                               PROP_BODY=prop_body,
-                               update=(not self.is_create_only_node(node_record)))
-
-    def _publish_relation(self, relation_file: str, tx: Transaction) -> Transaction:
+    def _create_node_statement(self, template: Template, node_record: dict, value_prefix: str) -> str:
+        """
+        Renders node statement, or returns the cached one for the same label, property keys and create-only flag.
+        :param template: Either NODE_MERGE_TEMPLATE or NODE_MERGE_BATCH_TEMPLATE
+        :param node_record:
+        :param value_prefix:
+        :return:
+        """
+        update = not self.is_create_only_node(node_record)
+        shape = (id(template), node_record[NODE_LABEL_KEY], tuple(node_record.keys()), update)
+        stmt = self._statement_cache.get(shape)
+        if stmt is None:
+            prop_body = self._create_props_body(node_record, NODE_REQUIRED_KEYS, 'node', value_prefix=value_prefix)
+            stmt = template.render(LABEL=node_record["LABEL"],
+                                   PROP_BODY=prop_body,
+                                   update=update)
+            self._statement_cache[shape] = stmt
+        return stmt
+
+    def _publish_relation(self, relation_file: str, tx: Transaction) -> Transaction:  # noqa: C901
         """
         Creates relation between two nodes.
         (In Amundsen, all relation is bi-directional)
@@ -304,42 +647,55 @@ class Neo4jCsvPublisher(Publisher):
         if self._relation_preprocessor.is_perform_preprocess():
             LOGGER.info('Pre-processing relation with %s', self._relation_preprocessor)
 
+            # Rows committed before according to the checkpoint are skipped by the merge, so they are not
+            # pre-processed again: a pre-processor deleting relations would delete them for good.
+            rel_records: Iterator[dict] = read_csv_records(relation_file)
+            if self._checkpoint and self._publish_in_batches and self._unwind_batch_size <= 0:
+                rel_records = itertools.islice(rel_records, self._checkpoint.committed_rows(relation_file), None)
+
             count = 0
-            with open(relation_file, 'r', encoding='utf8') as relation_csv:
-                for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                    # TODO not sure if deadlock on badge node arises in preporcessing or not
-                    stmt, params = self._relation_preprocessor.preprocess_cypher(
-                        start_label=rel_record[RELATION_START_LABEL],
-                        end_label=rel_record[RELATION_END_LABEL],
-                        start_key=rel_record[RELATION_START_KEY],
-                        end_key=rel_record[RELATION_END_KEY],
-                        relation=rel_record[RELATION_TYPE],
-                        reverse_relation=rel_record[RELATION_REVERSE_TYPE])
-
-                    if stmt:
-                        tx = self._execute_statement(stmt, tx=tx, params=params)
-                        count += 1
+            for rel_record in rel_records:
+                # TODO not sure if deadlock on badge node arises in preporcessing or not
+                stmt, params = self._relation_preprocessor.preprocess_cypher(
+                    start_label=rel_record[RELATION_START_LABEL],
+                    end_label=rel_record[RELATION_END_LABEL],
+                    start_key=rel_record[RELATION_START_KEY],
+                    end_key=rel_record[RELATION_END_KEY],
+                    relation=rel_record[RELATION_TYPE],
+                    reverse_relation=rel_record[RELATION_REVERSE_TYPE])
+
+                if stmt:
+                    tx = self._execute_statement(stmt, tx=tx, params=params)
+                    count += 1
 
             LOGGER.info('Executed pre-processing Cypher statement %i times', count)
 
-        with open(relation_file, 'r', encoding='utf8') as relation_csv:
-            for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                exception_exists = True
-                retries_for_exception = RETRIES_NUMBER
-                while exception_exists and retries_for_exception > 0:
-                    try:
-                        stmt = self.create_relationship_merge_statement(rel_record=rel_record)
-                        params = self._create_props_param(rel_record)
-                        tx = self._execute_statement(stmt, tx, params,
-                                                     expect_result=self._confirm_rel_created)
-                        exception_exists = False
-                    except TransientError as e:
-                        if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
-                                or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
-                            time.sleep(SLEEP_TIME)
-                            retries_for_exception -= 1
-                        else:
-                            raise e
+        if self._unwind_batch_size > 0:
+            return self._publish_relation_batch(relation_file, tx=tx)
+
+        if self._publish_in_batches:
+            statements = ((self.create_relationship_merge_statement(rel_record=rel_record),
+                           self._create_props_param(rel_record), self._confirm_rel_created)
+                          for rel_record in read_csv_records(relation_file))
+            return self._publish_statements(relation_file, statements, tx=tx)
+
+        for rel_record in read_csv_records(relation_file):
+            exception_exists = True
+            retries_for_exception = RETRIES_NUMBER
+            while exception_exists and retries_for_exception > 0:
+                try:
+                    stmt = self.create_relationship_merge_statement(rel_record=rel_record)
+                    params = self._create_props_param(rel_record)
+                    tx = self._execute_statement(stmt, tx, params,
+                                                 expect_result=self._confirm_rel_created)
+                    exception_exists = False
+                except TransientError as e:
+                    if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
+                            or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
+                        time.sleep(SLEEP_TIME)
+                        retries_for_exception -= 1
+                    else:
+                        raise e
 
         return tx
 
@@ -349,26 +705,252 @@ class Neo4jCsvPublisher(Publisher):
         :param rel_record:
         :return:
         """
-        template = Template("""
-            MATCH (n1:{{ START_LABEL }} {key: $START_KEY}), (n2:{{ END_LABEL }} {key: $END_KEY})
-            MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
-            {% if update_prop_body %}
-            ON CREATE SET {{ prop_body }}
-            ON MATCH SET {{ prop_body }}
-            {% endif %}
-            RETURN n1.key, n2.key
-        """)
-
-        prop_body_r1 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r1')
-        prop_body_r2 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r2')
-        prop_body = ' , '.join([prop_body_r1, prop_body_r2])
-
-        return template.render(START_LABEL=rel_record["START_LABEL"],
-                               END_LABEL=rel_record["END_LABEL"],
-                               TYPE=rel_record["TYPE"],
-                               REVERSE_TYPE=rel_record["REVERSE_TYPE"],
-                               update_prop_body=prop_body_r1,
-                               prop_body=prop_body)
+        return self._create_relationship_statement(RELATION_MERGE_TEMPLATE, rel_record, value_prefix='$')
+
+    def _create_relationship_statement(self, template: Template, rel_record: dict, value_prefix: str) -> str:
+        """
+        Renders relationship statement, or returns the cached one for the same labels, types and property keys.
+        :param template: Either RELATION_MERGE_TEMPLATE or RELATION_MERGE_BATCH_TEMPLATE
+        :param rel_record:
+        :param value_prefix:
+        :return:
+        """
+        shape = (id(template), rel_record[RELATION_START_LABEL], rel_record[RELATION_END_LABEL],
+                 rel_record[RELATION_TYPE], rel_record[RELATION_REVERSE_TYPE], tuple(rel_record.keys()))
+        stmt = self._statement_cache.get(shape)
+        if stmt is None:
+            prop_body_r1 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r1',
+                                                   value_prefix=value_prefix)
+            prop_body_r2 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r2',
+                                                   value_prefix=value_prefix)
+            prop_body = ' , '.join([prop_body_r1, prop_body_r2])
+
+            stmt = template.render(START_LABEL=rel_record["START_LABEL"],
+                                   END_LABEL=rel_record["END_LABEL"],
+                                   TYPE=rel_record["TYPE"],
+                                   REVERSE_TYPE=rel_record["REVERSE_TYPE"],
+                                   update_prop_body=prop_body_r1,
+                                   prop_body=prop_body)
+            self._statement_cache[shape] = stmt
+        return stmt
+
+    def _publish_node_batch(self, node_file: str, tx: Transaction) -> Transaction:
+        """
+        Publishes nodes with UNWIND statements. Rows are grouped by label and property keys so that every row in a
+        batch can share the same statement. Each batch is committed in its own transaction.
+
+        Example of Cypher query executed by this method:
+        UNWIND $batch AS row
+        MERGE (node:Column {key: row.KEY})
+        ON CREATE SET node.name = row.name, node.order_pos = row.order_pos
+        ON MATCH SET node.name = row.name, node.order_pos = row.order_pos
+
+        :param node_file:
+        :param tx:
+        :return:
+        """
+        batches: Dict[Tuple, List[dict]] = {}
+        for node_record in read_csv_records(node_file):
+            shape = (node_record[NODE_LABEL_KEY], tuple(node_record.keys()))
+            batch = batches.setdefault(shape, [])
+            batch.append(node_record)
+            if len(batch) >= self._unwind_batch_size:
+                tx = self._execute_node_batch(batch, tx=tx)
+                batches[shape] = []
+
+        for batch in batches.values():
+            if batch:
+                tx = self._execute_node_batch(batch, tx=tx)
+        return tx
+
+    def _execute_node_batch(self, node_records: List[dict], tx: Transaction) -> Transaction:
+        stmt = self.create_node_merge_batch_statement(node_record=node_records[0])
+        params = [self._create_props_param(node_record) for node_record in node_records]
+        return self._execute_batch_statement(stmt, tx=tx, batch=params,
+                                             labels={node_records[0][NODE_LABEL_KEY]})
+
+    def create_node_merge_batch_statement(self, node_record: dict) -> str:
+        """
+        Creates node merge statement that takes a batch of records through $batch parameter
+        :param node_record: A record that represents the shape of the batch
+        :return:
+        """
+        return self._create_node_statement(NODE_MERGE_BATCH_TEMPLATE, node_record, value_prefix='row.')
+
+    def _publish_relation_batch(self, relation_file: str, tx: Transaction) -> Transaction:
+        """
+        Publishes relations with UNWIND statements. Rows are grouped by start label, end label, relation types and
+        property keys. Each batch is committed in its own transaction, so that a batch touching
+        NEO4J_DEADLOCK_NODE_LABELS can be retried on TransientError.
+
+        :param relation_file:
+        :param tx:
+        :return:
+        """
+        # Commit pre-processing statements, if any, so that a retried batch never rolls them back.
+        tx.commit()
+        tx = self._get_session().begin_transaction()
+
+        batches: Dict[Tuple, List[dict]] = {}
+        for rel_record in read_csv_records(relation_file):
+            shape = (rel_record[RELATION_START_LABEL], rel_record[RELATION_END_LABEL],
+                     rel_record[RELATION_TYPE], rel_record[RELATION_REVERSE_TYPE], tuple(rel_record.keys()))
+            batch = batches.setdefault(shape, [])
+            batch.append(rel_record)
+            if len(batch) >= self._unwind_batch_size:
+                tx = self._execute_relation_batch(batch, tx=tx)
+                batches[shape] = []
+
+        for batch in batches.values():
+            if batch:
+                tx = self._execute_relation_batch(batch, tx=tx)
+        return tx
+
+    def _execute_relation_batch(self, rel_records: List[dict], tx: Transaction) -> Transaction:
+        stmt = self.create_relationship_merge_batch_statement(rel_record=rel_records[0])
+        params = [self._create_props_param(rel_record) for rel_record in rel_records]
+        return self._execute_batch_statement(stmt, tx=tx, batch=params,
+                                             labels={rel_records[0][RELATION_START_LABEL],
+                                                     rel_records[0][RELATION_END_LABEL]},
+                                             expect_result=self._confirm_rel_created)
+
+    def create_relationship_merge_batch_statement(self, rel_record: dict) -> str:
+        """
+        Creates relationship merge statement that takes a batch of records through $batch parameter
+        :param rel_record: A record that represents the shape of the batch
+        :return:
+        """
+        return self._create_relationship_statement(RELATION_MERGE_BATCH_TEMPLATE, rel_record, value_prefix='row.')
+
+    def _execute_batch_statement(self,
+                                 stmt: str,
+                                 tx: Transaction,
+                                 batch: List[dict],
+                                 labels: Set[str],
+                                 expect_result: bool = False) -> Transaction:
+        """
+        Executes UNWIND statement with the batch and commits it. If the batch touches one of deadlock node labels,
+        TransientError is retried on a new transaction, otherwise it rolls back and raise exception.
+        If 'expect_result' flag is True, it confirms that every row in the batch matched.
+        :param stmt:
+        :param tx: A transaction that does not hold any uncommitted statement
+        :param batch: List of parameters, one per row
+        :param labels: Labels touched by the statement
+        :param expect_result:
+        :return: A new transaction
+        """
+        retries_for_exception = RETRIES_NUMBER
+        while True:
+            try:
+                LOGGER.debug('Executing batch statement: %s with %i rows', stmt, len(batch))
+
+                result = tx.run(str(stmt).encode('utf-8', 'ignore'), parameters={'batch': batch})
+                if expect_result and result.single()['count'] != len(batch):
+                    raise RuntimeError(f'Failed to executed statement: {stmt}')
+                tx.commit()
+                break
+            except TransientError as e:
+                if not tx.closed():
+                    tx.rollback()
+                if retries_for_exception > 0 and labels & self.deadlock_node_labels:
+                    LOGGER.info('Retrying batch on TransientError: %s', e)
+                    time.sleep(SLEEP_TIME)
+                    retries_for_exception -= 1
+                    tx = self._get_session().begin_transaction()
+                else:
+                    raise e
+            except Exception as e:
+                LOGGER.exception('Failed to execute Cypher query')
+                if not tx.closed():
+                    tx.rollback()
+                raise e
+
+        count = self._add_count(len(batch))
+        if count // self._progress_report_frequency > (count - len(batch)) // self._progress_report_frequency:
+            LOGGER.info(f'Committed {count} records so far')
+
+        return self._get_session().begin_transaction()
+
+    def _publish_statements(self,
+                            file: str,
+                            statements: Iterator[Tuple[str, dict, bool]],
+                            tx: Transaction) -> Transaction:
+        """
+        Commits the statements of a file in batches of the transaction size, skipping rows committed before according
+        to the checkpoint, and checkpointing each committed batch.
+        :param file:
+        :param statements: Statement, parameters and expect_result flag of each row of the file
+        :param tx: A transaction holding the statements published so far
+        :return: A new transaction
+        """
+        # Commit statements published so far, e.g. pre-processing ones, so that a retried batch never rolls them back.
+        tx.commit()
+
+        if self._checkpoint:
+            committed_rows = self._checkpoint.committed_rows(file)
+            if committed_rows:
+                LOGGER.info('Skipping %i rows of %s committed before', committed_rows, file)
+                statements = itertools.islice(statements, committed_rows, None)
+
+        batch = list(itertools.islice(statements, self._adaptive_transaction_size.size))
+        while batch:
+            committed = self._commit_statements(batch)
+            if self._checkpoint:
+                self._checkpoint.advance(file, committed)
+            batch = batch[committed:]
+            batch.extend(itertools.islice(statements, self._adaptive_transaction_size.size - len(batch)))
+
+        return self._get_session().begin_transaction()
+
+    def _commit_statements(self, batch: List[Tuple[str, dict, bool]]) -> int:
+        """
+        Commits the first transaction size statements of the batch in a transaction. A transaction failing on a
+        transient error is retried up to NEO4J_MAX_RETRIES times with exponential backoff, with fewer statements if it
+        failed for its size.
+        If 'expect_result' flag of a statement is True, it confirms if its result object is not null.
+        :param batch: Statement, parameters and expect_result flag of each row
+        :return: Number of statements committed
+        """
+        retry = 0
+        while True:
+            size = min(len(batch), self._adaptive_transaction_size.size)
+            tx = self._get_session().begin_transaction()
+            start = time.perf_counter()
+            try:
+                self._run_statements(batch[:size], tx=tx)
+                tx.commit()
+            except (CypherError, ServiceUnavailable) as e:
+                if not tx.closed():
+                    tx.rollback()
+                oversized = _is_oversized_transaction_error(e)
+                if retry >= self._max_retries or not (oversized or isinstance(e, (TransientError, ServiceUnavailable))):
+                    LOGGER.exception('Failed to execute Cypher query')
+                    raise e
+                if oversized:
+                    self._adaptive_transaction_size.shrink()
+                backoff = self._retry_backoff_sec * 2 ** retry
+                LOGGER.info('Retrying transaction of %i statements in %.1f seconds on %s', size, backoff, e)
+                time.sleep(backoff)
+                retry += 1
+                continue
+            except Exception as e:
+                LOGGER.exception('Failed to execute Cypher query')
+                if not tx.closed():
+                    tx.rollback()
+                raise e
+
+            self._adaptive_transaction_size.committed(size, time.perf_counter() - start)
+            count = self._add_count(size)
+            if count // self._progress_report_frequency > (count - size) // self._progress_report_frequency:
+                LOGGER.info(f'Committed {count} statements so far')
+            return size
+
+    def _run_statements(self, statements: List[Tuple[str, dict, bool]], tx: Transaction) -> None:
+        for stmt, params, expect_result in statements:
+            LOGGER.debug('Executing statement: %s with params %s', stmt, params)
+            result = tx.run(str(stmt).encode('utf-8', 'ignore'), parameters=params)
+            if expect_result and not result.single():
+                raise RuntimeError(f'Failed to executed statement: {stmt}')
 
     def _create_props_param(self, record_dict: dict) -> dict:
         params = {}
@@ -382,7 +964,8 @@ class Neo4jCsvPublisher(Publisher):
     def _create_props_body(self,
                            record_dict: dict,
                            excludes: Set,
-                           identifier: str) -> str:
+                           identifier: str,
+                           value_prefix: str = '$') -> str:
         """
         Creates properties body with params required for resolving template.
 
@@ -392,6 +975,7 @@ class Neo4jCsvPublisher(Publisher):
         :param record_dict: A dict represents CSV row
         :param excludes: set of excluded columns that does not need to be in properties (e.g: KEY, LABEL ...)
         :param identifier: identifier that will be used in CYPHER query as shown on above example
+        :param value_prefix: prefix of the property value. '$' refers to a parameter, 'row.' to an UNWIND row
         :return: Properties body for Cypher statement
         """
         props = []
@@ -402,7 +986,7 @@ class Neo4jCsvPublisher(Publisher):
             if k.endswith(UNQUOTED_SUFFIX):
                 k = k[:-len(UNQUOTED_SUFFIX)]
 
-            props.append(f'{identifier}.{k} = ${k}')
+            props.append(f'{identifier}.{k} = {value_prefix}{k}')
 
         props.append(f"{identifier}.{PUBLISHED_TAG_PROPERTY_NAME} = '{self.publish_tag}'")
         props.append(f"{identifier}.{LAST_UPDATED_EPOCH_MS} = timestamp()")
@@ -430,14 +1014,15 @@ class Neo4jCsvPublisher(Publisher):
             if expect_result and not result.single():
                 raise RuntimeError(f'Failed to executed statement: {stmt}')
 
-            self._count += 1
-            if self._count > 1 and self._count % self._transaction_size == 0:
+            count = self._add_count(1)
+            self._worker.count += 1
+            if self._worker.count > 1 and self._worker.count % self._transaction_size == 0:
                 tx.commit()
-                LOGGER.info(f'Committed {self._count} statements so far')
-                return self._session.begin_transaction()
+                LOGGER.info(f'Committed {count} statements so far')
+                return self._get_session().begin_transaction()
 
-            if self._count > 1 and self._count % self._progress_report_frequency == 0:
-                LOGGER.info(f'Processed {self._count} statements so far')
+            if count > 1 and count % self._progress_report_frequency == 0:
+                LOGGER.info(f'Processed {count} statements so far')
 
             return tx
         except Exception as e:
@@ -453,9 +1038,7 @@ class Neo4jCsvPublisher(Publisher):
         :param label:
         :return:
         """
-        stmt = Template("""
-            CREATE CONSTRAINT ON (node:{{ LABEL }}) ASSERT node.key IS UNIQUE
-        """).render(LABEL=label)
+        stmt = CREATE_INDEX_TEMPLATE.render(LABEL=label)
 
         LOGGER.info(f'Trying to create index for label {label} if not exist: {stmt}')
         with self._driver.session() as session:
@@ -3,20 +3,68 @@
 
 import copy
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait,
+)
 from typing import (
-    Any, Callable, Dict, Iterator, List, Union,
+    Any, Callable, Deque, Dict, Iterator, List, Optional, Union,
 )
+from urllib.parse import urlparse
 
 import requests
 from jsonpath_rw import parse
+from requests.adapters import HTTPAdapter
 from retrying import retry
 
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
 from databuilder.rest_api.query_merger import QueryMerger
+from databuilder.rest_api.rest_api_response_cache import RestApiResponseCache
 
 LOGGER = logging.getLogger(__name__)
 
 
+class HostRateLimiter(object):
+    """
+    Limits requests to max_requests_per_sec per host, across all threads and queries sharing the limiter.
+    Share one limiter across the queries of a join that call the same API, so that its rate limit applies to all.
+    """
+
+    def __init__(self, max_requests_per_sec: float) -> None:
+        self._interval_sec = 1.0 / max_requests_per_sec
+        self._next_request_time: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'HostRateLimiter':
+        # Queries are deep copied along with the config holding them, while the rate limit is shared
+        return self
+
+    def wait(self, url: str) -> None:
+        """
+        Blocks until a request can be sent to the host of the url
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time.get(host, now))
+            self._next_request_time[host] = request_time + self._interval_sec
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+def build_session(pool_size: int = 10) -> requests.Session:
+    """
+    Builds a session keeping up to pool_size connections per host open, to be shared across queries of a join
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class RestApiQuery(BaseRestApiQuery):
     """
     A generic REST API Query that can be joined with other REST API query.
@@ -64,6 +112,11 @@ class RestApiQuery(BaseRestApiQuery):
                  json_path_contains_or: bool = False,
                  can_skip_failure: Callable = None,
                  query_merger: QueryMerger = None,
+                 max_workers: int = 1,
+                 ordered: bool = True,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 response_cache: Optional[RestApiResponseCache] = None,
                  **kwargs: Any
                  ) -> None:
         """
@@ -117,6 +170,15 @@ class RestApiQuery(BaseRestApiQuery):
 
         :param can_skip_failure A function that can determine if it can skip the failure. See BaseFailureHandler for
         the function interface
+        :param max_workers: Number of records from query_to_join processed concurrently, each by its own copy of this
+        query so that pagination state is not shared. Records are processed one by one by default.
+        :param ordered: With max_workers > 1, whether records are yielded in the order of query_to_join records, or as
+        soon as they are fetched.
+        :param session: requests Session used to send requests, e.g. from build_session, so that connections are
+        reused. Sharing it across the queries of a join reuses connections across them too. With max_workers > 1,
+        a session is built if none is given.
+        :param rate_limiter: Limits the rate of requests per host. See HostRateLimiter.
+        :param response_cache: Cache of responses kept across runs. See RestApiResponseCache.
 
         """
         self._inner_rest_api_query = query_to_join
@@ -134,61 +196,110 @@ class RestApiQuery(BaseRestApiQuery):
         self._can_skip_failure = can_skip_failure
         self._more_pages = False
         self._query_merger = query_merger
-
-    def execute(self) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        self._max_workers = max_workers
+        self._ordered = ordered
+        if session is None and max_workers > 1:
+            session = build_session(pool_size=max_workers)
+        self._session = session
+        self._rate_limiter = rate_limiter
+        self._response_cache = response_cache
+
+    def execute(self) -> Iterator[Dict[str, Any]]:
         self._authenticate()
 
+        if self._max_workers > 1:
+            yield from self._execute_concurrently()
+            return
+
         for record_dict in self._inner_rest_api_query.execute():
+            yield from self._execute_record(record_dict)
 
-            first_try = True  # To control pagination. Always pass the while loop on the first try
-            while first_try or self._more_pages:
-                first_try = False
+    def _execute_concurrently(self) -> Iterator[Dict[str, Any]]:
+        """
+        Processes records of query_to_join on a pool of max_workers threads, keeping at most twice as many records in
+        flight
+        """
+        def execute_record(record_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+            # Subclasses keep pagination state such as the current page in member variables
+            query = copy.copy(self)
+            query._params = copy.deepcopy(self._params)
+            return list(query._execute_record(record_dict))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            pending: Deque[Future] = deque()
+            for record_dict in self._inner_rest_api_query.execute():
+                pending.append(executor.submit(execute_record, record_dict))
+                while len(pending) >= 2 * self._max_workers:
+                    yield from self._next_results(pending)
+
+            while pending:
+                yield from self._next_results(pending)
+
+    def _next_results(self, pending: Deque[Future]) -> Iterator[Dict[str, Any]]:
+        """
+        Waits for the next records: the first pending one if ordered, otherwise any of them.
+        """
+        if self._ordered:
+            future = pending.popleft()
+        else:
+            future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+            pending.remove(future)
+        yield from future.result()
+
+    def _execute_record(self, record_dict: Dict[str, Any]) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        """
+        Sends request(s) for a record of query_to_join and yields the resulting records
+        """
+        first_try = True  # To control pagination. Always pass the while loop on the first try
+        while first_try or self._more_pages:
+            first_try = False
 
-                url = self._preprocess_url(record=record_dict)
+            url = self._preprocess_url(record=record_dict)
 
-                try:
-                    response = self._send_request(url=url)
-                except Exception as e:
-                    if self._can_skip_failure and self._can_skip_failure(exception=e):
-                        continue
-                    raise e
+            try:
+                response = self._send_request(url=url)
+            except Exception as e:
+                if self._can_skip_failure and self._can_skip_failure(exception=e):
+                    continue
+                raise e
 
-                response_json: Union[List[Any], Dict[str, Any]] = response.json()
+            response_json: Union[List[Any], Dict[str, Any]] = response.json()
 
-                # value extraction via JSON Path
-                result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
+            # value extraction via JSON Path
+            result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
 
-                if not result_list:
-                    log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
-                              f'response payload: {response_json}'
-                    LOGGER.info(log_msg)
+            if not result_list:
+                log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
+                          f'response payload: {response_json}'
+                LOGGER.info(log_msg)
 
-                    self._post_process(response)
+                self._post_process(response)
 
-                    if self._fail_no_result:
-                        raise Exception(log_msg)
+                if self._fail_no_result:
+                    raise Exception(log_msg)
 
-                    if self._skip_no_result:
-                        continue
+                if self._skip_no_result:
+                    continue
 
-                    yield copy.deepcopy(record_dict)
+                yield dict(record_dict)
 
-                sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
-                                                                field_names=self._field_names,
-                                                                json_path_contains_or=self._json_path_contains_or)
+            sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
+                                                            field_names=self._field_names,
+                                                            json_path_contains_or=self._json_path_contains_or)
 
-                for sub_record in sub_records:
-                    if not sub_record or len(sub_record) != len(self._field_names):
-                        # skip the record
-                        continue
-                    new_record_dict = copy.deepcopy(record_dict)
-                    for field_name in self._field_names:
-                        new_record_dict[field_name] = sub_record.pop(0)
-                    if self._query_merger:
-                        self._query_merger.merge_into(new_record_dict)
-                    yield new_record_dict
+            for sub_record in sub_records:
+                if not sub_record or len(sub_record) != len(self._field_names):
+                    # skip the record
+                    continue
+                # Fields are only added at the top level, so a shallow copy keeps record_dict intact
+                new_record_dict = dict(record_dict)
+                for field_name in self._field_names:
+                    new_record_dict[field_name] = sub_record.pop(0)
+                if self._query_merger:
+                    self._query_merger.merge_into(new_record_dict)
+                yield new_record_dict
 
-                self._post_process(response)
+            self._post_process(response)
 
     def _preprocess_url(self, record: Dict[str, Any]) -> str:
         """
@@ -201,13 +312,37 @@ class RestApiQuery(BaseRestApiQuery):
     @retry(stop_max_attempt_number=5, wait_exponential_multiplier=1000, wait_exponential_max=10000)
     def _send_request(self, url: str) -> requests.Response:
         """
-        Performs HTTP GET operation with retry on failure.
+        Performs HTTP GET operation with retry on failure, unless response_cache holds a valid response.
         :param url:
         :return:
         """
+        params = self._params
+        response_cache = self._response_cache
+        cached = None
+        if response_cache:
+            cached = response_cache.get(url=url, params=self._params)
+            if cached and response_cache.is_fresh(cached):
+                LOGGER.info('Using cached response of URL %s', url)
+                return cached.response
+            if cached:
+                headers = {**self._params.get('headers', {}), **response_cache.revalidation_headers(cached)}
+                params = {**self._params, 'headers': headers}
+
+        if self._rate_limiter:
+            self._rate_limiter.wait(url)
         LOGGER.info('Calling URL %s', url)
-        response = requests.get(url, **self._params)
+        if self._session:
+            response = self._session.get(url, **params)
+        else:
+            response = requests.get(url, **params)
+
+        if response_cache and cached and response.status_code == 304:
+            response_cache.refresh(cached)
+            return cached.response
+
         response.raise_for_status()
+        if response_cache:
+            response_cache.put(url=url, params=self._params, response=response)
         return response
 
     @classmethod
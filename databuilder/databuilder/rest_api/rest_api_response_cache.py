@@ -0,0 +1,112 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from typing import (
+    Any, Dict, NamedTuple, Optional,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+LOGGER = logging.getLogger(__name__)
+
+# A day
+DEFAULT_TTL_SEC = 24 * 60 * 60
+
+
+class CachedResponse(NamedTuple):
+    key: str
+    response: requests.Response
+    stored_at: float
+
+
+class RestApiResponseCache(object):
+    """
+    Caches successful REST API responses in a SQLite file, keyed by URL and request parameters, so that following
+    runs only pay for resources that changed.
+
+    A cached response is used as is for ttl_sec after it was stored. After that, it is revalidated with the
+    ETag/Last-Modified headers it came with, if any: when the server answers 304 Not Modified, the cached response is
+    used and kept for another ttl_sec.
+
+    The auth request parameter is not part of the key, as it holds objects, so use one cache file per credential.
+    """
+
+    def __init__(self, path: str, ttl_sec: int = DEFAULT_TTL_SEC) -> None:
+        self._path = path
+        self._ttl_sec = ttl_sec
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, url TEXT, status_code INTEGER, headers TEXT, content BLOB, '
+                         'stored_at REAL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call, as RestApiQuery may send requests from several threads
+        return sqlite3.connect(self._path, timeout=30)
+
+    @staticmethod
+    def _key(url: str, params: Dict[str, Any]) -> str:
+        key_params = {k: v for k, v in params.items() if k != 'auth'}
+        return hashlib.sha256(json.dumps([url, key_params], sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, url: str, params: Dict[str, Any]) -> Optional[CachedResponse]:
+        """
+        :param url:
+        :param params: Keyword arguments of requests.get
+        :return: Cached response, fresh or not, if any
+        """
+        key = self._key(url, params)
+        with self._connect() as conn:
+            row = conn.execute('SELECT url, status_code, headers, content, stored_at FROM responses WHERE key = ?',
+                               (key,)).fetchone()
+        if row is None:
+            return None
+
+        cached_url, status_code, headers, content, stored_at = row
+        response = requests.Response()
+        response.url = cached_url
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = content
+        return CachedResponse(key=key, response=response, stored_at=stored_at)
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        return time.time() - cached.stored_at < self._ttl_sec
+
+    @staticmethod
+    def revalidation_headers(cached: CachedResponse) -> Dict[str, str]:
+        """
+        :return: Headers asking the server to answer 304 Not Modified if the cached response is still valid
+        """
+        headers = {}
+        if 'ETag' in cached.response.headers:
+            headers['If-None-Match'] = cached.response.headers['ETag']
+        if 'Last-Modified' in cached.response.headers:
+            headers['If-Modified-Since'] = cached.response.headers['Last-Modified']
+        return headers
+
+    def put(self, url: str, params: Dict[str, Any], response: requests.Response) -> None:
+        """
+        Stores the response if it is successful and allowed to be stored
+        """
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO responses (key, url, status_code, headers, content, stored_at) '
+                         'VALUES (?, ?, ?, ?, ?, ?)',
+                         (self._key(url, params), response.url, response.status_code,
+                          json.dumps(dict(response.headers)), response.content, time.time()))
+
+    def refresh(self, cached: CachedResponse) -> None:
+        """
+        Keeps a revalidated response for another ttl_sec
+        """
+        LOGGER.debug('Response of %s not modified', cached.response.url)
+        with self._connect() as conn:
+            conn.execute('UPDATE responses SET stored_at = ? WHERE key = ?', (time.time(), cached.key))
@@ -4,16 +4,20 @@
 import logging
 import textwrap
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
-    Any, Dict, Iterable, Union,
+    Any, Callable, Dict, Iterable, Union,
 )
 
 import neo4j
 from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder import Scoped
-from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
+from databuilder.publisher.neo4j_csv_publisher import (
+    JOB_PUBLISH_TAG, RETRIES_NUMBER, SLEEP_TIME,
+)
 from databuilder.task.base_task import Task
 
 # A end point for Neo4j e.g: bolt://localhost:9999
@@ -37,6 +41,15 @@ STALENESS_PCT_MAX_DICT = "staleness_max_pct_dict"
 # Using this milliseconds and published timestamp to determine staleness
 MS_TO_EXPIRE = "milliseconds_to_expire"
 MIN_MS_TO_EXPIRE = "minimum_milliseconds_to_expire"
+# Number of targets validated and deleted concurrently, each query running on its own session of the driver's pool
+CONCURRENCY = "concurrency"
+# Adapts the batch size of each target, starting from BATCH_SIZE: it doubles while full batches are deleted within
+# half of TARGET_BATCH_SEC, up to MAX_BATCH_SIZE, and halves when a batch takes longer than TARGET_BATCH_SEC
+ADAPTIVE_BATCH_SIZE = "adaptive_batch_size"
+MAX_BATCH_SIZE = "max_batch_size"
+TARGET_BATCH_SEC = "target_batch_sec"
+# Counts total and stale records of a target in a single query, instead of one query each
+SINGLE_PASS_VALIDATION = "single_pass_validation"
 
 DEFAULT_CONFIG = ConfigFactory.from_dict({BATCH_SIZE: 100,
                                           NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
@@ -47,7 +60,12 @@ DEFAULT_CONFIG = ConfigFactory.from_dict({BATCH_SIZE: 100,
                                           TARGET_RELATIONS: [],
                                           STALENESS_PCT_MAX_DICT: {},
                                           MIN_MS_TO_EXPIRE: 86400000,
-                                          DRY_RUN: False})
+                                          DRY_RUN: False,
+                                          CONCURRENCY: 1,
+                                          ADAPTIVE_BATCH_SIZE: False,
+                                          MAX_BATCH_SIZE: 10000,
+                                          TARGET_BATCH_SEC: 2,
+                                          SINGLE_PASS_VALIDATION: False})
 
 LOGGER = logging.getLogger(__name__)
 
@@ -68,6 +86,9 @@ class Neo4jStalenessRemovalTask(Task):
     Not all resource is being published by Neo4jCsvPublisher and you can only set specific LABEL of the node or TYPE
     of relation to perform this deletion.
 
+    For many targets, CONCURRENCY validates and deletes targets in parallel, ADAPTIVE_BATCH_SIZE adapts the number of
+    records deleted per transaction to how fast batches are deleted, and SINGLE_PASS_VALIDATION counts total and stale
+    records of a target in one query.
     """
 
     delete_stale_nodes_statement = textwrap.dedent("""
@@ -94,6 +115,18 @@ class Neo4jStalenessRemovalTask(Task):
         WHERE {staleness_condition}{{extra_condition}}
         RETURN count(*) as count
         """)
+    count_node_staleness_statement = textwrap.dedent("""
+        MATCH (target:{{type}})
+        WHERE true{{extra_condition}}
+        RETURN count(*) as total_count,
+        sum(CASE WHEN {staleness_condition} THEN 1 ELSE 0 END) as stale_count
+        """)
+    count_relation_staleness_statement = textwrap.dedent("""
+        MATCH (start_node)-[target:{{type}}]-(end_node)
+        WHERE true{{extra_condition}}
+        RETURN count(*) as total_count,
+        sum(CASE WHEN {staleness_condition} THEN 1 ELSE 0 END) as stale_count
+        """)
 
     def __init__(self) -> None:
         pass
@@ -111,6 +144,11 @@ class Neo4jStalenessRemovalTask(Task):
         self.dry_run = conf.get_bool(DRY_RUN)
         self.staleness_pct = conf.get_int(STALENESS_MAX_PCT)
         self.staleness_pct_dict = conf.get(STALENESS_PCT_MAX_DICT)
+        self.concurrency = conf.get_int(CONCURRENCY)
+        self.adaptive_batch_size = conf.get_bool(ADAPTIVE_BATCH_SIZE)
+        self.max_batch_size = conf.get_int(MAX_BATCH_SIZE)
+        self.target_batch_sec = conf.get_float(TARGET_BATCH_SEC)
+        self.single_pass_validation = conf.get_bool(SINGLE_PASS_VALIDATION)
 
         if JOB_PUBLISH_TAG in conf and MS_TO_EXPIRE in conf:
             raise Exception(f'Cannot have both {JOB_PUBLISH_TAG} and {MS_TO_EXPIRE} in job config')
@@ -188,28 +226,72 @@ class Neo4jStalenessRemovalTask(Task):
         :param targets:
         :return:
         """
-        for t in targets:
-            if isinstance(t, TargetWithCondition):
-                target_type = t.target_type
-                extra_condition = ' AND ' + t.condition
-            else:
-                target_type = t
-                extra_condition = ''
+        self._run_targets(lambda t: self._delete_target(statement, t), targets)
 
-            LOGGER.info('Deleting stale data of %s with batch size %i', target_type, self.batch_size)
-            total_count = 0
-            while True:
+    def _run_targets(self,
+                     fn: Callable[[Union[str, TargetWithCondition]], None],
+                     targets: Union[Iterable[str], Iterable[TargetWithCondition]]
+                     ) -> None:
+        """
+        Runs fn for each target, up to CONCURRENCY targets at a time. Raises the first exception if any.
+        """
+        if self.concurrency <= 1:
+            for t in targets:
+                fn(t)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(fn, t) for t in targets]
+        for future in futures:
+            future.result()
+
+    def _delete_target(self,
+                       statement: str,
+                       t: Union[str, TargetWithCondition]
+                       ) -> None:
+        if isinstance(t, TargetWithCondition):
+            target_type = t.target_type
+            extra_condition = ' AND ' + t.condition
+        else:
+            target_type = t
+            extra_condition = ''
+
+        batch_size = self.batch_size
+        LOGGER.info('Deleting stale data of %s with batch size %i', target_type, batch_size)
+        total_count = 0
+        retries = 0
+        while True:
+            start = time.time()
+            try:
                 results = self._execute_cypher_query(statement=statement.format(type=target_type,
                                                                                 extra_condition=extra_condition),
-                                                     param_dict={'batch_size': self.batch_size,
+                                                     param_dict={'batch_size': batch_size,
                                                                  MARKER_VAR_NAME: self.marker},
                                                      dry_run=self.dry_run)
                 record = next(iter(results), None)
-                count = record['count'] if record else 0
-                total_count = total_count + count
-                if count == 0:
-                    break
-            LOGGER.info('Deleted %i stale data of %s', total_count, target_type)
+            except TransientError as e:
+                # e.g. a deadlock with another target deleted concurrently. The batch was rolled back.
+                if retries >= RETRIES_NUMBER:
+                    raise e
+                LOGGER.info('Retrying deletion of stale data of %s on TransientError: %s', target_type, e)
+                time.sleep(SLEEP_TIME * 2 ** retries)
+                retries += 1
+                continue
+
+            count = record['count'] if record else 0
+            total_count = total_count + count
+            if count == 0:
+                break
+            if self.adaptive_batch_size:
+                batch_size = self._adapt_batch_size(batch_size, count, time.time() - start)
+        LOGGER.info('Deleted %i stale data of %s', total_count, target_type)
+
+    def _adapt_batch_size(self, batch_size: int, count: int, elapsed_sec: float) -> int:
+        if elapsed_sec > self.target_batch_sec:
+            return max(batch_size // 2, 1)
+        if count >= batch_size and elapsed_sec < self.target_batch_sec / 2:
+            return min(batch_size * 2, self.max_batch_size)
+        return batch_size
 
     def _validate_staleness_pct(self,
                                 total_record_count: int,
@@ -227,6 +309,11 @@ class Neo4jStalenessRemovalTask(Task):
                             f'Stopping due to over threshold {threshold} %')
 
     def _validate_node_staleness_pct(self) -> None:
+        if self.single_pass_validation:
+            statement = self._decorate_staleness(self.count_node_staleness_statement)
+            self._run_targets(lambda t: self._validate_target_in_single_pass(statement, t), self.target_nodes)
+            return
+
         total_nodes_statement = textwrap.dedent(
             self.validate_node_staleness_statement.format(staleness_condition='true'))
         stale_nodes_statement = textwrap.dedent(
@@ -255,6 +342,11 @@ class Neo4jStalenessRemovalTask(Task):
                                          target_type=target_type)
 
     def _validate_relation_staleness_pct(self) -> None:
+        if self.single_pass_validation:
+            statement = self._decorate_staleness(self.count_relation_staleness_statement)
+            self._run_targets(lambda t: self._validate_target_in_single_pass(statement, t), self.target_relations)
+            return
+
         total_relations_statement = textwrap.dedent(
             self.validate_relation_staleness_statement.format(staleness_condition='true'))
         stale_relations_statement = textwrap.dedent(
@@ -282,6 +374,25 @@ class Neo4jStalenessRemovalTask(Task):
                                          stale_record_count=stale_record_value['count'] if stale_record_value else 0,
                                          target_type=target_type)
 
+    def _validate_target_in_single_pass(self,
+                                        statement: str,
+                                        t: Union[str, TargetWithCondition]
+                                        ) -> None:
+        if isinstance(t, TargetWithCondition):
+            target_type = t.target_type
+            extra_condition = ' AND ' + t.condition
+        else:
+            target_type = t
+            extra_condition = ''
+
+        records = self._execute_cypher_query(statement=statement.format(type=target_type,
+                                                                        extra_condition=extra_condition),
+                                             param_dict={MARKER_VAR_NAME: self.marker})
+        record = next(iter(records), None)
+        self._validate_staleness_pct(total_record_count=record['total_count'] if record else 0,
+                                     stale_record_count=record['stale_count'] if record else 0,
+                                     target_type=target_type)
+
     def _execute_cypher_query(self,
                               statement: str,
                               param_dict: Dict[str, Any] = {},
@@ -0,0 +1,183 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import queue
+import threading
+import time
+from typing import (
+    Any, Callable, Iterator, List,
+)
+
+from pyhocon import ConfigTree
+
+from databuilder.job.base_job import Job
+from databuilder.task.task import DefaultTask
+from databuilder.utils.job_metrics import (
+    EXTRACT, LOAD, TRANSFORM,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Marks the end of the records of a stage
+_END = object()
+
+
+class _Stopped(Exception):
+    """
+    Raised in a stage once another stage failed
+    """
+    pass
+
+
+class PipelinedTask(DefaultTask):
+    """
+    A task extracting, transforming and loading records like DefaultTask, where extraction, transformation and loading
+    run concurrently, e.g. so that extraction waiting on the network overlaps with loader writing files.
+
+    Extraction and transformation each run on their own thread(s), connected to each other and to loading, which runs
+    on the calling thread, by queues of at most queue_size records. A stage that gets ahead of the next one blocks
+    until the next one catches up.
+
+    With transform_workers > 1, records are transformed concurrently and loaded in no particular order, so the
+    transformer has to be thread-safe. By default, records are loaded in the order they are extracted.
+
+    When a stage fails, the other stages stop, the extractor, transformer and loader are closed and the error is raised.
+
+    Time recorded in Job.metrics for each stage excludes time spent waiting on the queues.
+    """
+
+    # Max number of records waiting between two stages
+    QUEUE_SIZE = 'queue_size'
+    # Number of threads transforming records
+    TRANSFORM_WORKERS = 'transform_workers'
+
+    def init(self, conf: ConfigTree) -> None:
+        super(PipelinedTask, self).init(conf)
+        self._queue_size = conf.get_int(f'{self.get_scope()}.{PipelinedTask.QUEUE_SIZE}', 1000)
+        self._transform_workers = conf.get_int(f'{self.get_scope()}.{PipelinedTask.TRANSFORM_WORKERS}', 1)
+
+    def run(self) -> None:
+        """
+        Runs a task
+        """
+        LOGGER.info('Running a pipelined task')
+        self._stopped = threading.Event()
+        self._errors: List[BaseException] = []
+
+        extracted: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        transformed: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        threads = [threading.Thread(target=self._run_stage, args=(self._extract, extracted),
+                                    name='pipelined_task_extract', daemon=True)]
+        threads.extend(threading.Thread(target=self._run_stage, args=(self._transform, extracted, transformed),
+                                        name=f'pipelined_task_transform_{i}', daemon=True)
+                       for i in range(self._transform_workers))
+        try:
+            for thread in threads:
+                thread.start()
+            self._load(transformed)
+        except _Stopped:
+            pass
+        except BaseException:
+            self._stopped.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            self._closer.close()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _run_stage(self, stage: Callable[..., None], *args: Any) -> None:
+        try:
+            stage(*args)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            LOGGER.exception(f'Failed to {stage.__name__.strip("_")} records, stopping the task')
+            self._errors.append(e)
+            self._stopped.set()
+
+    def _put(self, records: queue.Queue, record: Any) -> None:
+        while True:
+            if self._stopped.is_set():
+                raise _Stopped()
+            try:
+                records.put(record, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, records: queue.Queue) -> Any:
+        while True:
+            if self._stopped.is_set():
+                raise _Stopped()
+            try:
+                return records.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _extract(self, extracted: queue.Queue) -> None:
+        seconds, count = 0.0, 0
+        try:
+            start = time.perf_counter()
+            record = self.extractor.extract()
+            seconds += time.perf_counter() - start
+            while record:
+                count += 1
+                self._put(extracted, record)
+                start = time.perf_counter()
+                record = self.extractor.extract()
+                seconds += time.perf_counter() - start
+        finally:
+            Job.metrics.record(EXTRACT, seconds, count)
+
+        for _ in range(self._transform_workers):
+            self._put(extracted, _END)
+
+    def _transform(self, extracted: queue.Queue, transformed: queue.Queue) -> None:
+        seconds, count = 0.0, 0
+        try:
+            record = self._get(extracted)
+            while record is not _END:
+                count += 1
+                start = time.perf_counter()
+                record = self.transformer.transform(record)
+                # Support transformers which return one record, or yield multiple
+                results: Iterator = record if isinstance(record, Iterator) else iter([record])
+                # Transformers yielding records do their work as the records are pulled
+                result = next(results, _END)
+                seconds += time.perf_counter() - start
+                while result is not _END:
+                    if result:
+                        self._put(transformed, result)
+                    start = time.perf_counter()
+                    result = next(results, _END)
+                    seconds += time.perf_counter() - start
+                record = self._get(extracted)
+        finally:
+            Job.metrics.record(TRANSFORM, seconds, count)
+
+        self._put(transformed, _END)
+
+    def _load(self, transformed: queue.Queue) -> None:
+        seconds, count = 0.0, 0
+        ended_workers = 0
+        try:
+            while ended_workers < self._transform_workers:
+                record = self._get(transformed)
+                if record is _END:
+                    ended_workers += 1
+                    continue
+
+                start = time.perf_counter()
+                self.loader.load(record)
+                seconds += time.perf_counter() - start
+                count += 1
+                if count % self._progress_report_frequency == 0:
+                    LOGGER.info(f'Extracted {count} records so far')
+        finally:
+            Job.metrics.record(LOAD, seconds, count)
+
+        LOGGER.info(f'Total extracted records: {count}')
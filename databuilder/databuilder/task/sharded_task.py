@@ -0,0 +1,196 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.job.base_job import Job
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.task.base_task import Task
+
+LOGGER = logging.getLogger(__name__)
+
+_LOADER_SCOPE = 'loader.filesystem_csv_neo4j'
+
+
+def postgres_schema_clause(where_clause_suffix: str, schemas: str) -> str:
+    """
+    Where clause of PostgresMetadataExtractor restricted to the given schemas, e.g. for partition_by_schema
+    :param where_clause_suffix: Where clause of the extractor, a condition, e.g. "st.schemaname != 'tmp'"
+    :param schemas: Comma separated quoted schema names
+    """
+    clause = f'st.schemaname IN ({schemas})'
+    if not where_clause_suffix.strip():
+        return clause
+    return f'({where_clause_suffix}) AND {clause}'
+
+
+def snowflake_schema_clause(where_clause_suffix: str, schemas: str) -> str:
+    """
+    Where clause of SnowflakeMetadataExtractor restricted to the given schemas, e.g. for partition_by_schema.
+    Schema names are matched as stored in information_schema, i.e. upper case unless quoted at creation.
+    :param where_clause_suffix: Where clause of the extractor, blank or starting with WHERE,
+    e.g. "WHERE c.table_catalog = 'PROD'"
+    :param schemas: Comma separated quoted schema names
+    """
+    clause = f'c.table_schema IN ({schemas})'
+    suffix = where_clause_suffix.strip()
+    if not suffix:
+        return f'WHERE {clause}'
+    match = re.match(r'WHERE\s+(.*)', suffix, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise ValueError(f'Snowflake where clause suffix should start with WHERE: {where_clause_suffix}')
+    return f'WHERE ({match.group(1)}) AND {clause}'
+
+
+def partition_by_schema(schemas: Iterable[str],
+                        num_shards: int,
+                        where_clause_key: str,
+                        schema_clause: Callable[[str, str], str],
+                        where_clause_suffix: str = '',
+                        partition_fn: Optional[Callable[[str], int]] = None) -> List[Dict[str, str]]:
+    """
+    Splits schemas into at most num_shards shards, each restricting the extractor's where clause to its schemas.
+    e.g: partition_by_schema(['a', 'b', 'c'], 2, 'extractor.postgres_metadata.where_clause_suffix',
+                             postgres_schema_clause, "st.schemaname != 'tmp'")
+
+    :param schemas:
+    :param num_shards:
+    :param where_clause_key: Fully scoped config key of the extractor's where clause
+    :param schema_clause: Function building the extractor's where clause from where_clause_suffix and the comma
+    separated quoted schemas of a shard, e.g. postgres_schema_clause or snowflake_schema_clause
+    :param where_clause_suffix: Where clause the extractor is configured with, combined with each shard's schemas
+    :param partition_fn: Function returning the shard index of a schema. Defaults to spreading the sorted schemas
+    round robin.
+    :return: Config overrides of each non-empty shard, to pass to ShardedTask
+    """
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    for i, schema in enumerate(sorted(set(schemas))):
+        shards[(partition_fn(schema) if partition_fn else i) % num_shards].append(schema)
+
+    overrides = []
+    for shard in shards:
+        if not shard:
+            continue
+        quoted = ', '.join("'{}'".format(schema.replace("'", "''")) for schema in shard)
+        overrides.append({where_clause_key: schema_clause(where_clause_suffix, quoted)})
+    return overrides
+
+
+def _run_shard(task_factory: Callable[[], Task], conf: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    :return: Metrics of the shard, to be merged into the metrics of the job
+    """
+    Job.metrics.reset()
+    task = task_factory()
+    try:
+        task.init(ConfigFactory.from_dict(conf))
+        task.run()
+    finally:
+        task.close()
+    return Job.metrics.snapshot()
+
+
+class ShardedTask(Task):
+    """
+    A task splitting extraction of a large source into shards, each run by its own task in a worker process, so that
+    a job uses all cores of the host. The shards' outputs are merged, so that the job publishes them once.
+
+    task_factory builds the task of a shard, typically a DefaultTask with an extractor and a FsNeo4jCSVLoader.
+    Each shard runs with the task config, overridden by the shard's config overrides (e.g. from partition_by_schema),
+    and writes its CSV files into its own sub directory of the loader's node and relationship directories. Once all
+    shards succeeded, their files are moved up into the loader's directories, where the publisher reads them.
+
+    As shards run in other processes, task_factory and config values have to be picklable, e.g. task_factory is a
+    module level function.
+    """
+
+    # Max number of worker processes. Defaults to the number of CPUs
+    MAX_WORKERS = 'max_workers'
+
+    def __init__(self,
+                 task_factory: Callable[[], Task],
+                 shards: List[Dict[str, Any]]) -> None:
+        self.task_factory = task_factory
+        self.shards = shards
+
+    def init(self, conf: ConfigTree) -> None:
+        self._conf = conf
+        self._max_workers = conf.get_int(f'{self.get_scope()}.{ShardedTask.MAX_WORKERS}', None)
+
+        loader_conf = conf.get_config(_LOADER_SCOPE).with_fallback(FsNeo4jCSVLoader._DEFAULT_CONFIG)
+        self._node_dir = loader_conf.get_string(FsNeo4jCSVLoader.NODE_DIR_PATH)
+        self._relation_dir = loader_conf.get_string(FsNeo4jCSVLoader.RELATION_DIR_PATH)
+        for path in (self._node_dir, self._relation_dir):
+            self._create_directory(path,
+                                   loader_conf.get_bool(FsNeo4jCSVLoader.FORCE_CREATE_DIR),
+                                   loader_conf.get_bool(FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR))
+
+    def _create_directory(self, path: str, force_create: bool, delete_created: bool) -> None:
+        if os.path.exists(path):
+            if not force_create:
+                raise RuntimeError(f'Directory should not exist: {path}')
+            LOGGER.info('Deleting directory %s', path)
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        if delete_created:
+            # Like FsNeo4jCSVLoader, directory should be deleted after publish is finished
+            Job.closer.register(lambda: shutil.rmtree(path, ignore_errors=True))
+
+    def _shard_conf(self, index: int) -> Dict[str, Any]:
+        shard_conf = ConfigFactory.from_dict(self.shards[index]).with_fallback(self._conf)
+        shard_conf.put(f'{_LOADER_SCOPE}.{FsNeo4jCSVLoader.NODE_DIR_PATH}', self._shard_dir(self._node_dir, index))
+        shard_conf.put(f'{_LOADER_SCOPE}.{FsNeo4jCSVLoader.RELATION_DIR_PATH}',
+                       self._shard_dir(self._relation_dir, index))
+        # Shard directories are removed by the merge
+        shard_conf.put(f'{_LOADER_SCOPE}.{FsNeo4jCSVLoader.FORCE_CREATE_DIR}', True)
+        shard_conf.put(f'{_LOADER_SCOPE}.{FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR}', False)
+        return shard_conf.as_plain_ordered_dict()
+
+    @staticmethod
+    def _shard_dir(path: str, index: int) -> str:
+        return os.path.join(path, f'shard_{index}')
+
+    def run(self) -> None:
+        """
+        Runs the shards' tasks and merges their outputs
+        """
+        LOGGER.info(f'Running a task in {len(self.shards)} shards')
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(_run_shard, self.task_factory, self._shard_conf(i)): i
+                       for i in range(len(self.shards))}
+            try:
+                for future in as_completed(futures):
+                    Job.metrics.merge(future.result())
+                    LOGGER.info(f'Shard {futures[future]} completed')
+            except BaseException:
+                LOGGER.exception('A shard failed, cancelling remaining shards')
+                for pending in futures:
+                    pending.cancel()
+                raise
+
+        for index in range(len(self.shards)):
+            self._merge(self._node_dir, index)
+            self._merge(self._relation_dir, index)
+
+    def _merge(self, path: str, index: int) -> None:
+        """
+        Moves the files of a shard into the directory the publisher reads, prefixing them to avoid collisions
+        between shards.
+        """
+        shard_dir = self._shard_dir(path, index)
+        if not os.path.isdir(shard_dir):
+            return
+
+        for file_name in os.listdir(shard_dir):
+            os.replace(os.path.join(shard_dir, file_name), os.path.join(path, f'shard_{index}_{file_name}'))
+        os.rmdir(shard_dir)
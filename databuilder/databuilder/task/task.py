@@ -2,19 +2,27 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import time
 from typing import Iterator
 
 from pyhocon import ConfigTree
 
 from databuilder import Scoped
 from databuilder.extractor.base_extractor import Extractor
+from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
 from databuilder.task.base_task import Task
 from databuilder.transformer.base_transformer import NoopTransformer, Transformer
 from databuilder.utils.closer import Closer
+from databuilder.utils.job_metrics import (
+    EXTRACT, LOAD, TRANSFORM,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# Marks the end of the records yielded by a transformer
+_END = object()
+
 
 class DefaultTask(Task):
     """
@@ -51,28 +59,50 @@ class DefaultTask(Task):
         Runs a task
         """
         LOGGER.info('Running a task')
+        # Time spent and records processed per stage, recorded to Job.metrics once the task is done
+        extract_sec = transform_sec = load_sec = 0.0
+        extracted = count = 0
         try:
+            start = time.perf_counter()
             record = self.extractor.extract()
-            count = 0
+            extract_sec += time.perf_counter() - start
             while record:
+                extracted += 1
+                start = time.perf_counter()
                 record = self.transformer.transform(record)
+                transform_sec += time.perf_counter() - start
                 if not record:
                     # Move on if the transformer filtered the record out
+                    start = time.perf_counter()
                     record = self.extractor.extract()
+                    extract_sec += time.perf_counter() - start
                     continue
 
                 # Support transformers which return one record, or yield multiple
-                results = record if isinstance(record, Iterator) else [record]
-                for result in results:
+                results = record if isinstance(record, Iterator) else iter([record])
+                while True:
+                    # Transformers yielding records do their work as the records are pulled
+                    start = time.perf_counter()
+                    result = next(results, _END)
+                    transform_sec += time.perf_counter() - start
+                    if result is _END:
+                        break
                     if result:
+                        start = time.perf_counter()
                         self.loader.load(result)
+                        load_sec += time.perf_counter() - start
                         count += 1
 
                 if count > 0 and count % self._progress_report_frequency == 0:
                     LOGGER.info(f'Extracted {count} records so far')
 
                 # Prepare the next record
+                start = time.perf_counter()
                 record = self.extractor.extract()
+                extract_sec += time.perf_counter() - start
             LOGGER.info(f'Total extracted records: {count}')
         finally:
+            Job.metrics.record(EXTRACT, extract_sec, extracted)
+            Job.metrics.record(TRANSFORM, transform_sec, extracted)
+            Job.metrics.record(LOAD, load_sec, count)
             self._closer.close()
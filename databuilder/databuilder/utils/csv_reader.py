@@ -0,0 +1,113 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+from typing import (
+    Any, Callable, Dict, Iterator, List, Optional, Set, Tuple,
+)
+
+import pandas
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of CSV rows parsed at a time. Memory is bounded by the chunk size rather than by the file size.
+DEFAULT_CHUNK_SIZE = 10000
+
+# Values pandas.read_csv parses as booleans
+_BOOLEANS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+
+def _to_int(values: pandas.Series) -> pandas.Series:
+    return values.astype('int64')
+
+
+def _to_float(values: pandas.Series) -> pandas.Series:
+    return values.astype('float64')
+
+
+def _to_bool(values: pandas.Series) -> pandas.Series:
+    booleans = values.map(_BOOLEANS)
+    if booleans.isna().any():
+        raise ValueError('Not a boolean')
+    return booleans.astype('bool')
+
+
+Converter = Callable[[pandas.Series], pandas.Series]
+
+# Conversions tried on the text of a column, in order, like pandas.read_csv infers dtypes
+_CONVERTERS: List[Converter] = [_to_int, _to_float, _to_bool]
+
+
+def _convert(values: pandas.Series, converters: List[Converter]) -> Tuple[Optional[Converter], pandas.Series]:
+    """
+    :return: First converter all values fit and the converted values, or None and the values as is
+    """
+    for converter in converters:
+        try:
+            return converter, converter(values)
+        except (ValueError, OverflowError):
+            continue
+    return None, values
+
+
+def _read_csv_chunks(file_path: str,
+                     chunk_size: int,
+                     usecols: Optional[List[str]] = None) -> Iterator[pandas.DataFrame]:
+    """
+    Reads CSV file chunk by chunk, in a single pass. Values are read as text and converted explicitly, rather than
+    letting pandas infer dtypes for each chunk: the first chunk sets the type of each column (int, float, bool or
+    text, like pandas.read_csv infers it), which later chunks are converted to.
+    A later chunk whose values do not fit the type of a column keeps them as text, or as float for int columns, e.g.
+    a numeric column of the first chunk holding text further down.
+    """
+    # Converters of each typed column, set by the first chunk
+    converters: Optional[Dict[str, List[Converter]]] = None
+    with open(file_path, 'r', encoding='utf8') as csv_file:
+        for chunk in pandas.read_csv(csv_file, na_filter=False, chunksize=chunk_size, usecols=usecols, dtype=str):
+            if converters is None:
+                converters = {}
+                for column in chunk.columns:
+                    converter, chunk[column] = _convert(chunk[column], _CONVERTERS if len(chunk) else [])
+                    if converter is not None:
+                        # int columns widen to float in later chunks holding decimals
+                        converters[column] = [_to_int, _to_float] if converter is _to_int else [converter]
+                yield chunk
+                continue
+
+            for column, column_converters in converters.items():
+                converter, chunk[column] = _convert(chunk[column], column_converters)
+                if converter is None:
+                    LOGGER.warning(f'Values of column {column} in {file_path} do not all have the type of the first '
+                                   f'{chunk_size} rows, keeping them as text')
+            yield chunk
+
+
+def read_csv_records(file_path: str,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily reads CSV file, chunk by chunk, and yields each row as a dict where keys are the header.
+    Values are coerced the same way as pandas.read_csv(..., na_filter=False).to_dict(orient='records') of the first
+    chunk, e.g: empty values stay as empty string instead of NaN, and columns keep the type of the first chunk.
+    :param file_path:
+    :param chunk_size: Number of rows parsed at a time
+    :return: Iterator of records
+    """
+    for chunk in _read_csv_chunks(file_path, chunk_size):
+        yield from chunk.to_dict(orient='records')
+
+
+def read_csv_column_values(file_path: str,
+                           columns: List[str],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> Set[Any]:
+    """
+    Reads distinct values of the given columns, parsing only those columns.
+    :param file_path:
+    :param columns: Header names of columns to read
+    :param chunk_size: Number of rows parsed at a time
+    :return: Set of distinct values across all given columns
+    """
+    values: Set[Any] = set()
+    for chunk in _read_csv_chunks(file_path, chunk_size, usecols=columns):
+        for column in columns:
+            values.update(chunk[column].unique().tolist())
+    return values
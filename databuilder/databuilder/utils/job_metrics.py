@@ -0,0 +1,112 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import threading
+from typing import (
+    Any, Dict, List, Optional,
+)
+
+from statsd import StatsClient
+
+LOGGER = logging.getLogger(__name__)
+
+# Stages timed by the default task and job
+EXTRACT = 'extract'
+TRANSFORM = 'transform'
+LOAD = 'load'
+PUBLISH = 'publish'
+
+
+class JobMetrics(object):
+    """
+    Accumulates time spent and records processed per stage of a job (extract, transform, load, publish), and bytes
+    written per file, so that the bottleneck of a job shows up without a profiler.
+
+    Stages record their totals through record(), which is thread-safe, e.g. once a task is done rather than per record.
+    Job.metrics holds the metrics of the running job.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # stage -> [seconds, records]
+            self._stages: Dict[str, List[float]] = {}
+            self._files: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float = 0.0, records: int = 0) -> None:
+        """
+        Adds time spent and records processed to a stage
+        :param stage: e.g: EXTRACT
+        :param seconds:
+        :param records: Number of records, or statements for publish
+        """
+        with self._lock:
+            totals = self._stages.setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += records
+
+    def record_file(self, path: str, size: int) -> None:
+        """
+        Records bytes written to a file
+        """
+        with self._lock:
+            self._files[path] = size
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        :return: Raw totals, which merge() adds up, e.g. to collect metrics of tasks run in other processes
+        """
+        with self._lock:
+            return {'stages': {stage: list(totals) for stage, totals in self._stages.items()},
+                    'files': dict(self._files)}
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        for stage, (seconds, records) in snapshot['stages'].items():
+            self.record(stage, seconds, records)
+        for path, size in snapshot['files'].items():
+            self.record_file(path, size)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        :return: Seconds, records and records per second of each stage, and bytes written per file
+        """
+        snapshot = self.snapshot()
+        stages = {
+            stage: {
+                'seconds': round(seconds, 3),
+                'records': int(records),
+                'records_per_sec': round(records / seconds, 1) if seconds else None,
+            } for stage, (seconds, records) in snapshot['stages'].items()
+        }
+        return {'stages': stages,
+                'bytes_written': sum(snapshot['files'].values()),
+                'files': snapshot['files']}
+
+    def emit(self, statsd: StatsClient) -> None:
+        """
+        Emits the time of each stage as statsd timer, and its records and throughput as gauges.
+        Bytes per file are left to the summary, as file names would make too many metrics.
+        """
+        summary = self.summary()
+        for stage, stage_summary in summary['stages'].items():
+            statsd.timing(f'{stage}.time', stage_summary['seconds'] * 1000)
+            statsd.gauge(f'{stage}.records', stage_summary['records'])
+            if stage_summary['records_per_sec'] is not None:
+                statsd.gauge(f'{stage}.records_per_sec', stage_summary['records_per_sec'])
+        statsd.gauge('bytes_written', summary['bytes_written'])
+
+    def write_summary(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Writes the summary as a JSON file
+        :param path:
+        :param extra: Additional fields of the summary, e.g. the job identifier
+        """
+        summary = dict(extra or {}, **self.summary())
+        LOGGER.info('Writing job metrics summary to %s', path)
+        with open(path, 'w', encoding='utf8') as summary_file:
+            json.dump(summary, summary_file, indent=2)
@@ -0,0 +1,36 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+
+from databuilder.callback.high_watermark_callback import HighWatermarkCallback, read_high_watermark
+
+
+class TestHighWatermarkCallback(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'high_watermark')
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_read_without_high_watermark(self) -> None:
+        self.assertEqual(read_high_watermark(self.file_path), 0)
+
+    def test_persist_on_success(self) -> None:
+        HighWatermarkCallback(self.file_path, high_watermark_epoch_ms=1000).on_success()
+        self.assertEqual(read_high_watermark(self.file_path), 1000)
+
+        HighWatermarkCallback(self.file_path, high_watermark_epoch_ms=2000).on_success()
+        self.assertEqual(read_high_watermark(self.file_path), 2000)
+
+    def test_not_persist_on_failure(self) -> None:
+        HighWatermarkCallback(self.file_path, high_watermark_epoch_ms=1000).on_failure()
+        self.assertEqual(read_high_watermark(self.file_path), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
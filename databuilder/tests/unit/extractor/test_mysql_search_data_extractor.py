@@ -93,7 +93,9 @@ class MyTestCase(unittest.TestCase):
                              tags=['test_tag'],
                              badges=['test_badge'],
                              schema_description='test_schema_description',
-                             programmatic_descriptions=['test_table_prog_description'])
+                             programmatic_descriptions=['test_table_prog_description'],
+                             suggest={'input': ['test_schema.test_table', 'schema.test_table', 'test_table', 'table'],
+                                      'weight': 15})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
@@ -149,7 +151,9 @@ class MyTestCase(unittest.TestCase):
                              is_active=True,
                              total_read=30,
                              total_own=2,
-                             total_follow=2)
+                             total_follow=2,
+                             suggest={'input': ['test_full_name', 'full_name', 'name', 'test_user', 'user'],
+                                      'weight': 30})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
@@ -230,7 +234,8 @@ class MyTestCase(unittest.TestCase):
                              last_successful_run_timestamp=123456789,
                              total_usage=15,
                              tags=['test_tag'],
-                             badges=['test_badge'])
+                             badges=['test_badge'],
+                             suggest={'input': ['test_dashboard', 'dashboard'], 'weight': 15})
 
         config_dict = {
             f'extractor.mysql_search_data.{MySQLSearchDataExtractor.CONN_STRING}': 'test_conn_string',
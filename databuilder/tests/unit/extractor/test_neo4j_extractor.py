@@ -119,4 +119,8 @@ class TestNeo4jExtractor(unittest.TestCase):
             result_obj = extractor.extract()
 
             self.assertIsInstance(result_obj, TableESDocument)
-            self.assertDictEqual(vars(result_obj), result_dict)
+            self.assertDictEqual(vars(result_obj),
+                                 dict(result_dict,
+                                      suggest={'input': ['test_schema.test_table_name', 'schema.test_table_name',
+                                                         'test_table_name', 'table_name', 'name'],
+                                               'weight': 100}))
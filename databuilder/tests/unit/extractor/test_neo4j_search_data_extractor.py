@@ -4,7 +4,7 @@
 import unittest
 from typing import Any
 
-from mock import patch
+from mock import mock_open, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -58,6 +58,57 @@ class TestNeo4jExtractor(unittest.TestCase):
                              Neo4jSearchDataExtractor.DEFAULT_NEO4J_DASHBOARD_CYPHER_QUERY.format
                              (publish_tag_filter="""WHERE dashboard.published_tag = 'test-date'"""))
 
+    def test_adding_updated_since_filter(self: Any) -> None:
+        extractor = Neo4jSearchDataExtractor()
+        actual = extractor._add_publish_tag_filter('foo', 'MATCH (table:Table) {publish_tag_filter} RETURN table',
+                                                   updated_since_epoch_ms=1000)
+
+        updated = 'publisher_last_updated_epoch_ms >= 1000'
+        self.assertEqual(actual, f"""MATCH (table:Table) WHERE table.published_tag = 'foo' AND """
+                                 f"""(table.{updated} """
+                                 f"""OR size([(table)-[r]-(n) WHERE r.{updated} OR n.{updated} | 1]) > 0 """
+                                 f"""OR size([(table)-[:COLUMN]->(:Column)-[r]-(n) """
+                                 f"""WHERE r.{updated} OR n.{updated} | 1]) > 0) RETURN table""")
+
+    def test_incremental_search_query(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver') as mock_get_driver, \
+                patch('builtins.open', mock_open()) as mock_file:
+            mock_session = mock_get_driver.return_value.session.return_value.__enter__.return_value
+            mock_session.read_transaction.return_value = [{'key': 'dashboard_1'}, {'key': 'dashboard_2'}]
+
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'dashboard',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.UPDATED_SINCE_EPOCH_MS}': 1000,
+                f'extractor.search_data.{Neo4jSearchDataExtractor.LIVE_KEYS_FILE_PATH}': 'live_keys',
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertIn('WHERE (dashboard.publisher_last_updated_epoch_ms >= 1000 OR', extractor.cypher_query)
+            mock_file.assert_called_once_with('live_keys', 'w')
+            mock_file.return_value.write.assert_any_call('dashboard_1\n')
+            mock_file.return_value.write.assert_any_call('dashboard_2\n')
+
+    def test_incremental_search_query_unsupported_entity(self: Any) -> None:
+        with patch.object(Neo4jExtractor, '_get_driver'):
+            extractor = Neo4jSearchDataExtractor()
+            conf = ConfigFactory.from_dict({
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}': 'test-endpoint',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+                f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.ENTITY_TYPE}': 'user',
+                f'extractor.search_data.{Neo4jSearchDataExtractor.UPDATED_SINCE_EPOCH_MS}': 1000,
+            })
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.cypher_query,
+                             Neo4jSearchDataExtractor.DEFAULT_NEO4J_USER_CYPHER_QUERY.format(publish_tag_filter=''))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,7 +4,7 @@
 import unittest
 from typing import Any, Dict
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -123,6 +123,62 @@ class TestSqlAlchemyExtractor(unittest.TestCase):
         mock_method.assert_called_with('TEST_CONNECTION', connect_args={"protocol": "https"})
 
 
+class TestSqlAlchemyExtractorStreamResults(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.conf = ConfigFactory.from_dict({
+            'extractor.sqlalchemy.conn_string': 'sqlite://',
+            'extractor.sqlalchemy.extract_sql':
+                'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 25) SELECT n FROM seq',
+            f'extractor.sqlalchemy.{SQLAlchemyExtractor.STREAM_RESULTS}': True,
+            f'extractor.sqlalchemy.{SQLAlchemyExtractor.CHUNK_SIZE}': 10,
+        })
+
+    def test_stream_results(self) -> None:
+        extractor = SQLAlchemyExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=self.conf, scope=extractor.get_scope()))
+
+        results = []
+        result = extractor.extract()
+        while result is not None:
+            results.append(result[0])
+            result = extractor.extract()
+        extractor.close()
+
+        self.assertEqual(results, list(range(1, 26)))
+
+    @patch.object(SQLAlchemyExtractor, '_get_connection')
+    def test_stream_results_in_chunks(self, mock_get_connection: Any) -> None:
+        rows = [dict(n=n) for n in range(25)]
+        mock_results = MagicMock()
+        mock_results.fetchmany.side_effect = [rows[:10], rows[10:20], rows[20:], []]
+        mock_connection = mock_get_connection.return_value
+        mock_connection.execution_options.return_value.execute.return_value = mock_results
+
+        conf = self.conf.copy()
+        conf.put('extractor.sqlalchemy.model_class', 'tests.unit.extractor.test_sql_alchemy_extractor.NumberResult')
+        extractor = SQLAlchemyExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+        mock_connection.execution_options.assert_called_once_with(stream_results=True)
+        # rows are only fetched as they are extracted
+        mock_results.fetchmany.assert_not_called()
+
+        self.assertEqual(extractor.extract().n, 0)
+        mock_results.fetchmany.assert_called_once_with(10)
+
+        results = [extractor.extract() for _ in range(25)]
+        self.assertEqual([result.n for result in results[:24]], list(range(1, 25)))
+        self.assertIsNone(results[24])
+        self.assertEqual(mock_results.fetchmany.call_count, 4)
+
+
+class NumberResult:
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+
+
 class TableMetadataResult:
     """
     Table metadata result model.
@@ -113,7 +113,9 @@ class TestFSElasticsearchJSONLoader(unittest.TestCase):
              '"description": "test_description", "unique_usage": 5, "total_usage": 10, '
              '"tags": ["test_tag1", "test_tag2"], "schema_description": "schema description", '
              '"programmatic_descriptions": ["test"], '
-             '"badges": ["badge1"]}')
+             '"badges": ["badge1"], '
+             '"suggest": {"input": ["test_schema.test_table", "schema.test_table", "test_table", "table"], '
+             '"weight": 10}}')
         ]
 
         self._check_results_helper(expected=expected)
@@ -155,7 +157,9 @@ class TestFSElasticsearchJSONLoader(unittest.TestCase):
              '"description": "test_description", "unique_usage": 5, "total_usage": 10, '
              '"tags": ["test_tag1", "test_tag2"], "schema_description": "schema_description", '
              '"programmatic_descriptions":["test"], '
-             '"badges": ["badge1"]}')
+             '"badges": ["badge1"], '
+             '"suggest": {"input": ["test_schema.test_table", "schema.test_table", "test_table", "table"], '
+             '"weight": 10}}')
         ] * 5
 
         self._check_results_helper(expected=expected)
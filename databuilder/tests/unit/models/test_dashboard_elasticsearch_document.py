@@ -44,6 +44,8 @@ class TestDashboardElasticsearchDocument(unittest.TestCase):
                                   "total_usage": 10,
                                   "tags": ["test"],
                                   "badges": ["test_badge"],
+                                  "suggest": {"input": ["test_dashboard_name", "dashboard_name", "name"],
+                                              "weight": 10},
 
                                   }
 
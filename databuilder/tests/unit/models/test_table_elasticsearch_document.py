@@ -44,7 +44,10 @@ class TestTableElasticsearchDocument(unittest.TestCase):
                                   "tags": ["test"],
                                   "programmatic_descriptions": ['test'],
                                   "badges": ["badge1"],
-                                  'schema_description': 'schema description'
+                                  'schema_description': 'schema description',
+                                  "suggest": {"input": ["test_schema.test_table", "schema.test_table",
+                                                        "test_table", "table"],
+                                              "weight": 100}
                                   }
 
         result = test_obj.to_json()
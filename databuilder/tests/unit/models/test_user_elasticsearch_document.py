@@ -42,6 +42,7 @@ class TestUserElasticsearchDocument(unittest.TestCase):
                                   'github_username': "github_user",
                                   "employee_type": 'fte',
                                   "email": "test@email.com",
+                                  "suggest": {"input": ["full_name", "name", "test"], "weight": 2},
                                   }
 
         result = test_obj.to_json()
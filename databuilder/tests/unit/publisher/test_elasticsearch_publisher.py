@@ -3,9 +3,13 @@
 
 import json
 import unittest
+from typing import (
+    Any, Dict, List,
+)
 
+from elasticsearch.exceptions import NotFoundError
 from mock import (
-    MagicMock, mock_open, patch,
+    MagicMock, call, mock_open, patch,
 )
 from pyhocon import ConfigFactory
 
@@ -117,3 +121,163 @@ class TestElasticsearchPublisher(unittest.TestCase):
                 {'actions': [{"add": {"index": self.test_es_new_index, "alias": self.test_es_alias}},
                              {"remove_index": {"index": 'test_old_index'}}]}
             )
+
+
+class TestElasticsearchPublisherIncremental(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_es_client = MagicMock()
+        self.conf = ConfigFactory.from_dict({
+            'publisher.elasticsearch.file_path': 'test_publisher_file.json',
+            'publisher.elasticsearch.mode': 'r',
+            'publisher.elasticsearch.client': self.mock_es_client,
+            'publisher.elasticsearch.new_index': 'test_new_index',
+            'publisher.elasticsearch.alias': 'test_index_alias',
+            'publisher.elasticsearch.doc_type': 'test_doc_type',
+            f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_DOCUMENT_ID_FIELD_CONFIG_KEY}': 'key',
+            f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_INCREMENTAL_CONFIG_KEY}': True,
+            f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_LIVE_IDS_FILE_PATH_CONFIG_KEY}': 'live_ids',
+        })
+        self.mock_data = json.dumps({'key': 'table_1', 'name': 'foo'})
+
+    def _publish(self, live_ids: str) -> None:
+        files = {'test_publisher_file.json': self.mock_data, 'live_ids': live_ids}
+        with patch('builtins.open', side_effect=lambda path, mode: mock_open(read_data=files[path])()):
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=self.conf,
+                                                       scope=publisher.get_scope()))
+            publisher.publish()
+
+    def test_requires_document_id_field(self) -> None:
+        conf = self.conf.copy()
+        conf.put(f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_DOCUMENT_ID_FIELD_CONFIG_KEY}', '')
+        with patch('builtins.open', mock_open(read_data='')), self.assertRaises(ValueError):
+            ElasticsearchPublisher().init(conf=Scoped.get_scoped_conf(conf=conf, scope='publisher.elasticsearch'))
+
+    def test_publish_incremental(self) -> None:
+        self.mock_es_client.indices.get_alias.return_value = {'test_old_index': 'DOES_NOT_MATTER'}
+
+        with patch('databuilder.publisher.elasticsearch_publisher.scan') as mock_scan:
+            mock_scan.return_value = [{'_id': 'table_1'}, {'_id': 'table_2'}, {'_id': 'table_3'}]
+            self._publish(live_ids='table_2\n')
+
+        self.mock_es_client.indices.create.assert_not_called()
+        self.mock_es_client.indices.update_aliases.assert_not_called()
+        self.assertEqual(self.mock_es_client.bulk.call_args_list[0][0][0],
+                         [{'index': {'_index': 'test_old_index', '_type': 'test_doc_type', '_id': 'table_1'}},
+                          {'key': 'table_1', 'name': 'foo'}])
+        self.assertEqual(self.mock_es_client.bulk.call_args_list[1][0][0],
+                         [{'delete': {'_index': 'test_old_index', '_type': 'test_doc_type', '_id': 'table_3'}}])
+
+    def test_publish_incremental_without_live_ids(self) -> None:
+        self.mock_es_client.indices.get_alias.return_value = {'test_old_index': 'DOES_NOT_MATTER'}
+
+        with patch('databuilder.publisher.elasticsearch_publisher.scan') as mock_scan:
+            self._publish(live_ids='')
+            mock_scan.assert_not_called()
+
+        self.mock_es_client.bulk.assert_called_once()
+
+    def test_publish_incremental_without_index(self) -> None:
+        self.mock_es_client.indices.get_alias.side_effect = NotFoundError()
+
+        self._publish(live_ids='table_1\n')
+
+        self.mock_es_client.indices.create.assert_called_once()
+        self.mock_es_client.bulk.assert_called_once_with(
+            [{'index': {'_index': 'test_new_index', '_type': 'test_doc_type', '_id': 'table_1'}},
+             {'key': 'table_1', 'name': 'foo'}])
+        self.mock_es_client.indices.update_aliases.assert_called_once_with(
+            {'actions': [{'add': {'index': 'test_new_index', 'alias': 'test_index_alias'}}]})
+
+
+class TestElasticsearchPublisherBulk(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_es_client = MagicMock()
+        self.mock_es_client.indices.get_alias.return_value = {}
+        self.conf = ConfigFactory.from_dict({
+            'publisher.elasticsearch.file_path': 'test_publisher_file.json',
+            'publisher.elasticsearch.mode': 'r',
+            'publisher.elasticsearch.client': self.mock_es_client,
+            'publisher.elasticsearch.new_index': 'test_new_index',
+            'publisher.elasticsearch.alias': 'test_index_alias',
+            'publisher.elasticsearch.doc_type': 'test_doc_type',
+            f'publisher.elasticsearch.{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_RETRY_BACKOFF_SEC}': 0,
+        })
+        self.documents = [{'key': f'table_{i}'} for i in range(5)]
+
+    def _publish(self, **conf: Any) -> None:
+        config = self.conf.copy()
+        for key, value in conf.items():
+            config.put(f'publisher.elasticsearch.{key}', value)
+        mock_data = '\n'.join(json.dumps(document, ensure_ascii=False) for document in self.documents) + '\n'
+        with patch('builtins.open', mock_open(read_data=mock_data)):
+            publisher = ElasticsearchPublisher()
+            publisher.init(conf=Scoped.get_scoped_conf(conf=config, scope=publisher.get_scope()))
+            publisher.publish()
+
+    def _indexed_documents(self) -> List[Dict[str, Any]]:
+        return [line for call in self.mock_es_client.bulk.call_args_list for line in call[0][0]
+                if 'index' not in line]
+
+    def test_batch_bytes(self) -> None:
+        document_bytes = len(json.dumps(self.documents[0])) + 1
+        self._publish(**{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_BYTES: 2 * document_bytes})
+
+        self.assertEqual([len(call[0][0]) for call in self.mock_es_client.bulk.call_args_list], [4, 4, 2])
+        self.assertEqual(self._indexed_documents(), self.documents)
+
+    def test_batch_bytes_of_non_ascii_documents(self) -> None:
+        self.documents = [{'key': f'tablé_{i}'} for i in range(5)]
+        # Two documents fit in the limit when counting characters, but only one when counting bytes
+        document_chars = len(json.dumps(self.documents[0], ensure_ascii=False)) + 1
+        self._publish(**{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_BYTES: 2 * document_chars})
+
+        self.assertEqual([len(call[0][0]) for call in self.mock_es_client.bulk.call_args_list], [2] * 5)
+        self.assertEqual(self._indexed_documents(), self.documents)
+
+    def test_concurrency(self) -> None:
+        self._publish(**{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_BATCH_SIZE: 1,
+                         ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_CONCURRENCY: 2})
+
+        self.assertEqual(self.mock_es_client.bulk.call_count, 5)
+        self.assertCountEqual(self._indexed_documents(), self.documents)
+        self.mock_es_client.indices.update_aliases.assert_called_once()
+
+    def test_retry_rejected_documents(self) -> None:
+        accepted = {'index': {'status': 201}}
+        rejected = {'index': {'status': 429, 'error': {'type': 'es_rejected_execution_exception'}}}
+        self.mock_es_client.bulk.side_effect = [
+            {'errors': True, 'items': [accepted, rejected, accepted, rejected, accepted]},
+            {'errors': True, 'items': [accepted, rejected]},
+            {'errors': False, 'items': [accepted]},
+        ]
+        self._publish()
+
+        self.assertEqual([call[0][0][1::2] for call in self.mock_es_client.bulk.call_args_list],
+                         [self.documents, [self.documents[1], self.documents[3]], [self.documents[3]]])
+        self.mock_es_client.indices.update_aliases.assert_called_once()
+
+    def test_retry_exhausted(self) -> None:
+        rejected = {'index': {'status': 429}}
+        self.mock_es_client.bulk.return_value = {'errors': True, 'items': [rejected] * 5}
+
+        with self.assertRaises(Exception):
+            self._publish(**{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_MAX_RETRIES: 1})
+
+        self.assertEqual(self.mock_es_client.bulk.call_count, 2)
+        self.mock_es_client.indices.update_aliases.assert_not_called()
+
+    def test_tune_index_settings(self) -> None:
+        self.mock_es_client.indices.get_settings.return_value = {
+            'test_new_index': {'settings': {'index': {'number_of_replicas': '2'}}}
+        }
+        self._publish(**{ElasticsearchPublisher.ELASTICSEARCH_PUBLISHER_TUNE_INDEX_SETTINGS: True})
+
+        self.assertEqual(self.mock_es_client.indices.put_settings.call_args_list, [
+            call(index='test_new_index', body={'index': {'refresh_interval': '-1', 'number_of_replicas': 0}}),
+            call(index='test_new_index', body={'index': {'refresh_interval': None, 'number_of_replicas': '2'}}),
+        ])
+        self.mock_es_client.indices.refresh.assert_called_once_with(index='test_new_index')
+        self.mock_es_client.indices.update_aliases.assert_called_once()
@@ -2,16 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import tempfile
 import unittest
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 from freezegun import freeze_time
 from pyhocon import ConfigFactory
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import mysql, sqlite
 
 from databuilder.publisher import mysql_csv_publisher
-from databuilder.publisher.mysql_csv_publisher import MySQLCSVPublisher
-from tests.unit.models.test_table_serializable import Base
+from databuilder.publisher.mysql_csv_publisher import MySQLCSVPublisher, Upsert
+from tests.unit.models.test_table_serializable import (
+    Base, RDSActor, RDSMovieActor,
+)
 
 here = os.path.dirname(__file__)
 
@@ -59,5 +64,100 @@ class TestMySQLPublish(unittest.TestCase):
         self.assertEqual(3, mock_commit.call_count)
 
 
+class TestMySQLBulkUpsertPublish(unittest.TestCase):
+    """
+    Publishes to a SQLite database, which supports upserts like MySQL
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn_string = f'sqlite:///{self.temp_dir.name}/test.db'
+        self.engine = create_engine(self.conn_string)
+        Base.metadata.create_all(self.engine)
+        mysql_csv_publisher.Base = Base
+
+        resource_path = os.path.join(here, '../resources/mysql_csv_publisher')
+        self.conf = ConfigFactory.from_dict(
+            {
+                MySQLCSVPublisher.CONN_STRING: self.conn_string,
+                MySQLCSVPublisher.RECORD_FILES_DIR: f'{resource_path}/records',
+                MySQLCSVPublisher.JOB_PUBLISH_TAG: 'test',
+                MySQLCSVPublisher.BULK_UPSERT: True,
+                MySQLCSVPublisher.TRANSACTION_SIZE: 2
+            }
+        )
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def _publish(self) -> int:
+        """
+        :return: Number of statements executed
+        """
+        publisher = MySQLCSVPublisher()
+        publisher.init(self.conf)
+
+        statements = []
+        event.listen(publisher._engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        publisher.publish()
+        publisher._engine.dispose()
+        return len([statement for statement in statements if statement.startswith('INSERT')])
+
+    def test_publish(self) -> None:
+        with freeze_time('2021-01-01 01:01:00'):
+            # 3 record files of 2, 1 and 2 records, upserted 2 records per statement
+            self.assertEqual(self._publish(), 3)
+
+        with self.engine.connect() as conn:
+            actors = conn.execute(RDSActor.__table__.select().order_by('rk')).fetchall()
+            movie_actors = conn.execute(RDSMovieActor.__table__.select()).fetchall()
+
+        self.assertEqual([tuple(actor) for actor in actors],
+                         [('actor://Meg Ryan', 'Meg Ryan', 'test', 1609462860000),
+                          ('actor://Tom Cruise', 'Tom Cruise', 'test', 1609462860000)])
+        self.assertEqual(len(movie_actors), 2)
+
+    def test_publish_updates_existing_records(self) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(RDSActor.__table__.insert(), [
+                {'rk': 'actor://Tom Cruise', 'name': 'Old name', 'published_tag': 'old',
+                 'publisher_last_updated_epoch_ms': 0},
+                {'rk': 'actor://Val Kilmer', 'name': 'Val Kilmer', 'published_tag': 'old',
+                 'publisher_last_updated_epoch_ms': 0}
+            ])
+
+        with freeze_time('2021-01-01 01:01:00'):
+            self._publish()
+
+        with self.engine.connect() as conn:
+            actors = conn.execute(RDSActor.__table__.select().order_by('rk')).fetchall()
+
+        self.assertEqual([tuple(actor) for actor in actors],
+                         [('actor://Meg Ryan', 'Meg Ryan', 'test', 1609462860000),
+                          ('actor://Tom Cruise', 'Tom Cruise', 'test', 1609462860000),
+                          ('actor://Val Kilmer', 'Val Kilmer', 'old', 0)])
+
+    @patch.object(mysql_csv_publisher, 'create_engine')
+    def test_bulk_upsert_unsupported_dialect(self, mock_create_engine: Any) -> None:
+        mock_create_engine.return_value.dialect.name = 'mssql'
+
+        with self.assertRaisesRegex(ValueError, 'bulk_upsert is not supported on mssql'):
+            MySQLCSVPublisher().init(self.conf)
+
+    def test_upsert_statement(self) -> None:
+        upsert = Upsert(RDSActor.__table__, ['name', 'published_tag']).values(rk='rk', name='name', published_tag='tag')
+
+        self.assertEqual(
+            str(upsert.compile(dialect=mysql.dialect())),
+            'INSERT INTO actor (rk, name, published_tag) VALUES (%s, %s, %s) '
+            'ON DUPLICATE KEY UPDATE name = VALUES(name), published_tag = VALUES(published_tag)')
+        self.assertEqual(
+            str(upsert.compile(dialect=sqlite.dialect())),
+            'INSERT INTO actor (rk, name, published_tag) VALUES (?, ?, ?) '
+            'ON CONFLICT (rk) DO UPDATE SET name = excluded.name, published_tag = excluded.published_tag')
+
+
 if __name__ == '__main__':
     unittest.main()
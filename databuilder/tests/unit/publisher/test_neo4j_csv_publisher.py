@@ -3,15 +3,18 @@
 
 import logging
 import os
+import tempfile
 import unittest
 import uuid
+from typing import Any
 
 from mock import MagicMock, patch
 from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory
 
 from databuilder.publisher import neo4j_csv_publisher
-from databuilder.publisher.neo4j_csv_publisher import Neo4jCsvPublisher
+from databuilder.publisher.neo4j_csv_publisher import Neo4jCsvPublisher, _TransactionSize
 
 here = os.path.dirname(__file__)
 
@@ -89,6 +92,318 @@ class TestPublish(unittest.TestCase):
             # 2 node files, 1 relation file
             self.assertEqual(mock_commit.call_count, 1)
 
+    def test_publisher_unwind_batch(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_UNWIND_BATCH_SIZE: 500,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # One UNWIND statement per label in node files, one per relation type in relation file
+            self.assertEqual(mock_run.call_count, 3)
+            for call in mock_run.call_args_list:
+                self.assertIn(b'UNWIND $batch AS row', call[0][0])
+                self.assertEqual(len(call[1]['parameters']['batch']), 2)
+
+            # 3 batches, 1 before relation batches, 1 at the end
+            self.assertEqual(mock_commit.call_count, 5)
+
+    def test_publisher_unwind_batch_size(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_UNWIND_BATCH_SIZE: 1,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            self.assertEqual(mock_run.call_count, 4)
+
+    def test_unwind_batch_deadlock_retry(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(neo4j_csv_publisher.time, 'sleep'):
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_run.side_effect = [MagicMock(), MagicMock(), TransientError('deadlock'), MagicMock()]
+            mock_transaction.run = mock_run
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_UNWIND_BATCH_SIZE: 500,
+                 neo4j_csv_publisher.NEO4J_DEADLOCK_NODE_LABELS: ['Table'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            self.assertEqual(mock_run.call_count, 4)
+            self.assertEqual(mock_transaction.rollback.call_count, 1)
+
+    def test_create_node_merge_batch_statement(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_CREATE_ONLY_NODES: ['Description'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'foo'}
+            )
+            publisher.init(conf)
+
+            stmt = publisher.create_node_merge_batch_statement(
+                {'KEY': 'k', 'LABEL': 'Column', 'name': 'n', 'order_pos:UNQUOTED': 1})
+            self.assertIn('MERGE (node:Column {key: row.KEY})', stmt)
+            self.assertIn('node.name = row.name, node.order_pos = row.order_pos', stmt)
+            self.assertIn('ON MATCH SET', stmt)
+
+            stmt = publisher.create_node_merge_batch_statement(
+                {'KEY': 'k', 'LABEL': 'Description', 'description': 'd'})
+            self.assertNotIn('ON MATCH SET', stmt)
+
+    def test_publisher_concurrent(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_session.__enter__.return_value = mock_session
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_PUBLISH_CONCURRENCY: 4,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            self.assertEqual(mock_run.call_count, 6)
+
+            # One commit per group: 2 node label groups, 1 relation group
+            self.assertEqual(mock_commit.call_count, 3)
+
+    def _publish_in_batches(self, run_side_effect: list, **conf: Any) -> MagicMock:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(neo4j_csv_publisher.time, 'sleep') as mock_sleep:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_transaction.closed.return_value = False
+            mock_session.begin_transaction.return_value = mock_transaction
+            mock_transaction.run.side_effect = run_side_effect
+
+            publisher = Neo4jCsvPublisher()
+            publisher.init(ConfigFactory.from_dict(dict({
+                neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                neo4j_csv_publisher.NEO4J_TRANSACTION_SIZE: 1,
+                neo4j_csv_publisher.NEO4J_MIN_TRANSACTION_SIZE: 1,
+                neo4j_csv_publisher.JOB_PUBLISH_TAG: 'tag'}, **conf)))
+            self.mock_sleep = mock_sleep
+            publisher.publish()
+        return mock_transaction
+
+    def test_publish_in_batches_retry(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint_path = os.path.join(temp_dir, 'checkpoint.json')
+            mock_transaction = self._publish_in_batches(
+                [MagicMock(), TransientError('deadlock'), TransientError('deadlock')] + [MagicMock()] * 5,
+                **{neo4j_csv_publisher.NEO4J_CHECKPOINT_PATH: checkpoint_path})
+
+            # 6 statements, one of them failed twice
+            self.assertEqual(mock_transaction.run.call_count, 8)
+            self.assertEqual(mock_transaction.rollback.call_count, 2)
+            self.assertEqual([c[0][0] for c in self.mock_sleep.call_args_list], [2, 4])
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_publish_in_batches_resume(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint_path = os.path.join(temp_dir, 'checkpoint.json')
+            conf = {neo4j_csv_publisher.NEO4J_CHECKPOINT_PATH: checkpoint_path,
+                    neo4j_csv_publisher.NEO4J_MAX_RETRIES: 0}
+            # Fails on the first relation, once both node files were committed
+            with self.assertRaises(TransientError):
+                self._publish_in_batches([MagicMock()] * 4 + [TransientError('unavailable')], **conf)
+            self.assertTrue(os.path.exists(checkpoint_path))
+
+            mock_transaction = self._publish_in_batches([MagicMock()] * 2, **conf)
+            self.assertEqual(mock_transaction.run.call_count, 2)
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_publish_in_batches_resume_with_preprocessor(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint_path = os.path.join(temp_dir, 'checkpoint.json')
+            mock_preprocessor = MagicMock()
+            mock_preprocessor.is_perform_preprocess.return_value = True
+            mock_preprocessor.preprocess_cypher.side_effect = \
+                lambda **kwargs: (f'MATCH (n {{key: "{kwargs["end_key"]}"}})-[r]-() DELETE r', {})
+            conf = {neo4j_csv_publisher.NEO4J_CHECKPOINT_PATH: checkpoint_path,
+                    neo4j_csv_publisher.NEO4J_MAX_RETRIES: 0,
+                    neo4j_csv_publisher.RELATION_PREPROCESSOR: mock_preprocessor}
+            # Fails on the second relation, once the 4 nodes, the 2 deletes and the first relation were committed
+            with self.assertRaises(TransientError):
+                self._publish_in_batches([MagicMock()] * 7 + [TransientError('unavailable')], **conf)
+
+            mock_transaction = self._publish_in_batches([MagicMock()] * 2, **conf)
+
+            # Only the second relation is deleted and merged again. The committed first relation is not deleted
+            # again, as it would not be merged again.
+            statements = [c[0][0].decode('utf-8') for c in mock_transaction.run.call_args_list]
+            self.assertEqual(len(statements), 2)
+            self.assertIn('test_id2', statements[0])
+            self.assertIn('DELETE', statements[0])
+            self.assertIn('MERGE', statements[1])
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_publish_in_batches_non_transient_error(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self._publish_in_batches([MagicMock(), RuntimeError('failed')],
+                                     **{neo4j_csv_publisher.NEO4J_ADAPTIVE_TRANSACTION_SIZE: True})
+
+    def test_publish_in_batches_oversized_transaction(self) -> None:
+        out_of_memory = TransientError('out of memory')
+        out_of_memory.code = 'Neo.TransientError.General.OutOfMemoryError'
+        mock_transaction = self._publish_in_batches(
+            [MagicMock(), out_of_memory] + [MagicMock()] * 6,
+            **{neo4j_csv_publisher.NEO4J_ADAPTIVE_TRANSACTION_SIZE: True,
+               neo4j_csv_publisher.NEO4J_TRANSACTION_SIZE: 2})
+
+        # The first transaction of 2 statements is retried with 1 statement, then the size grows back to 2
+        self.assertEqual(mock_transaction.run.call_count, 8)
+        self.assertEqual(mock_transaction.rollback.call_count, 1)
+
+    def test_adaptive_transaction_size(self) -> None:
+        size = _TransactionSize(100, min_size=10, max_size=200, target_commit_sec=1, adaptive=True)
+        size.committed(100, seconds=0.5)
+        self.assertEqual(size.size, 150)
+        # Partial batches, e.g. the end of a file, tell nothing about larger transactions
+        size.committed(20, seconds=0.1)
+        self.assertEqual(size.size, 150)
+        size.committed(150, seconds=0.5)
+        self.assertEqual(size.size, 200)
+        size.committed(200, seconds=2)
+        self.assertEqual(size.size, 100)
+        for _ in range(5):
+            size.shrink()
+        self.assertEqual(size.size, 10)
+
+        fixed_size = _TransactionSize(100, min_size=10, max_size=200, target_commit_sec=1, adaptive=False)
+        fixed_size.committed(100, seconds=0.5)
+        fixed_size.shrink()
+        self.assertEqual(fixed_size.size, 100)
+
+    def test_group_files(self) -> None:
+        groups = Neo4jCsvPublisher._group_files({
+            'table_column.csv': {'Table', 'Column'},
+            'table_tag.csv': {'Tag'},
+            'column_badge.csv': {'Column', 'Badge'},
+            'user_owner.csv': set(),
+            'dashboard_tag.csv': {'Tag'},
+        })
+
+        self.assertCountEqual(groups, [['table_column.csv', 'column_badge.csv'],
+                                       ['table_tag.csv', 'dashboard_tag.csv'],
+                                       ['user_owner.csv']])
+
+        groups = Neo4jCsvPublisher._group_files({
+            'a.csv': {'A'},
+            'b.csv': {'B'},
+            'ab.csv': {'A', 'B'},
+        })
+        self.assertEqual(groups, [['a.csv', 'b.csv', 'ab.csv']])
+
+    def test_statement_cache(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'dummy://999.999.999.999:7687/',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'foo'}
+            )
+            publisher.init(conf)
+
+            with patch.object(neo4j_csv_publisher.NODE_MERGE_TEMPLATE, 'render',
+                              wraps=neo4j_csv_publisher.NODE_MERGE_TEMPLATE.render) as mock_render:
+                stmt1 = publisher.create_node_merge_statement({'KEY': 'k1', 'LABEL': 'Table', 'name': 'n1'})
+                stmt2 = publisher.create_node_merge_statement({'KEY': 'k2', 'LABEL': 'Table', 'name': 'n2'})
+                stmt3 = publisher.create_node_merge_statement({'KEY': 'k3', 'LABEL': 'Column', 'name': 'n3'})
+
+                self.assertIs(stmt1, stmt2)
+                self.assertIn('MERGE (node:Column {key: $KEY})', stmt3)
+                self.assertEqual(mock_render.call_count, 2)
+
+            rel_record = {'START_LABEL': 'Table', 'START_KEY': 's', 'END_LABEL': 'Column', 'END_KEY': 'e',
+                          'TYPE': 'COLUMN', 'REVERSE_TYPE': 'COLUMN_OF'}
+            stmt = publisher.create_relationship_merge_statement(rel_record)
+            batch_stmt = publisher.create_relationship_merge_batch_statement(rel_record)
+            self.assertIs(stmt, publisher.create_relationship_merge_statement(dict(rel_record, START_KEY='s2')))
+            self.assertIn('MATCH (n1:Table {key: $START_KEY})', stmt)
+            self.assertIn('MATCH (n1:Table {key: row.START_KEY})', batch_stmt)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,17 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import time
 import unittest
+from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
+from requests import HTTPError
 
 from databuilder.rest_api.base_rest_api_query import EmptyRestApiQuerySeed, RestApiQuerySeed
-from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.mode_analytics.mode_paginated_rest_api_query import ModePaginatedRestApiQuery
+from databuilder.rest_api.rest_api_failure_handlers import HttpFailureSkipOnStatus
+from databuilder.rest_api.rest_api_query import HostRateLimiter, RestApiQuery
 
 
 class TestRestApiQuery(unittest.TestCase):
@@ -139,5 +144,92 @@ class TestRestApiQuery(unittest.TestCase):
         self.assertEqual(expected_records, sub_records)
 
 
+class TestRestApiQueryConcurrent(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.seed_query = RestApiQuerySeed(seed_record=[{'id': i} for i in range(10)])
+        self.session = MagicMock()
+        self.session.get.side_effect = self._get
+
+    def _get(self, url: str, **kwargs: Any) -> Any:
+        """
+        Responds to http://foo.bar/{id} with {id} names, later for lower ids so that responses come out of order
+        """
+        record_id = int(url.split('/')[-1].split('?')[0])
+        time.sleep((10 - record_id) * 0.005)
+        response = MagicMock()
+        response.json.return_value = {'names': [f'{record_id}_{i}' for i in range(record_id)]}
+        return response
+
+    def _query(self, **kwargs: Any) -> RestApiQuery:
+        return RestApiQuery(query_to_join=self.seed_query, url='http://foo.bar/{id}', params={},
+                            json_path='names[*]', field_names=['name'], skip_no_result=True,
+                            session=self.session, **kwargs)
+
+    def test_ordered(self) -> None:
+        results = list(self._query(max_workers=4).execute())
+
+        self.assertEqual(results, [{'id': i, 'name': f'{i}_{j}'} for i in range(10) for j in range(i)])
+        self.assertEqual(self.session.get.call_count, 10)
+
+    def test_unordered(self) -> None:
+        results = list(self._query(max_workers=4, ordered=False).execute())
+
+        self.assertCountEqual(results, [{'id': i, 'name': f'{i}_{j}'} for i in range(10) for j in range(i)])
+        self.assertNotEqual(results, [{'id': i, 'name': f'{i}_{j}'} for i in range(10) for j in range(i)])
+
+    def test_can_skip_failure(self) -> None:
+        def get(url: str, **kwargs: Any) -> Any:
+            if url.endswith('/3'):
+                error_response = MagicMock(status_code=404)
+                error_response.raise_for_status.side_effect = HTTPError(response=error_response)
+                return error_response
+            return self._get(url)
+
+        self.session.get.side_effect = get
+        query = self._query(max_workers=4,
+                            can_skip_failure=HttpFailureSkipOnStatus(status_codes_to_skip={404}).can_skip_failure)
+        with patch('retrying.time.sleep'):
+            results = list(query.execute())
+
+        self.assertEqual([result['id'] for result in results], [i for i in range(10) for _ in range(i) if i != 3])
+
+    def test_failure(self) -> None:
+        self.session.get.side_effect = ValueError('failed')
+
+        with patch('retrying.time.sleep'), self.assertRaises(ValueError):
+            list(self._query(max_workers=4).execute())
+        # every record is retried, as when records are processed one by one
+        self.assertGreaterEqual(self.session.get.call_count, 5)
+
+    def test_pagination(self) -> None:
+        def get(url: str, **kwargs: Any) -> Any:
+            record_id, page = int(url.split('/')[-1].split('?')[0]), int(url.split('=')[-1])
+            response = MagicMock()
+            # 2 names on first page, 1 on second
+            response.json.return_value = {'names': [f'{record_id}_{page}_{i}' for i in range(3 - page)]}
+            return response
+
+        self.session.get.side_effect = get
+        query = ModePaginatedRestApiQuery(query_to_join=self.seed_query, url='http://foo.bar/{id}', params={},
+                                          json_path='names[*]', field_names=['name'], skip_no_result=True,
+                                          pagination_json_path='names[*]', max_record_size=2,
+                                          session=self.session, max_workers=4)
+        results = list(query.execute())
+
+        self.assertEqual(results, [{'id': i, 'name': f'{i}_{page}_{j}'}
+                                   for i in range(10) for page in (1, 2) for j in range(3 - page)])
+        self.assertEqual(self.session.get.call_count, 20)
+
+    def test_rate_limiter(self) -> None:
+        rate_limiter = HostRateLimiter(max_requests_per_sec=2)
+        with patch('databuilder.rest_api.rest_api_query.time') as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            for url in ['http://foo.bar/1', 'http://foo.bar/2', 'http://baz.bar/1', 'http://foo.bar/3']:
+                rate_limiter.wait(url)
+
+        self.assertEqual([call[0][0] for call in mock_time.sleep.call_args_list], [0.5, 1.0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+
+import requests
+from mock import patch
+
+from databuilder.rest_api.base_rest_api_query import RestApiQuerySeed
+from databuilder.rest_api.mode_analytics.mode_paginated_rest_api_query import ModePaginatedRestApiQuery
+from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.rest_api_response_cache import RestApiResponseCache
+
+
+def _response(status_code: int, payload: Any = None, headers: Dict[str, str] = {}) -> requests.Response:
+    response = requests.Response()
+    response.url = 'http://foo.bar/1'
+    response.status_code = status_code
+    response.headers.update(headers)
+    response._content = json.dumps(payload).encode() if payload is not None else b''
+    return response
+
+
+class TestRestApiResponseCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'cache.db')
+        self.params = {'headers': {'Authorization': 'token'}}
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _query(self, response_cache: RestApiResponseCache) -> RestApiQuery:
+        return RestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': 1}]), url='http://foo.bar/{id}',
+                            params=self.params, json_path='name', field_names=['name'],
+                            response_cache=response_cache)
+
+    def test_fresh_response(self) -> None:
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            mock_get.return_value = _response(200, {'name': 'foo'})
+            first = list(self._query(RestApiResponseCache(self.cache_path)).execute())
+            # a new cache on the same file, as in a following run
+            second = list(self._query(RestApiResponseCache(self.cache_path)).execute())
+
+        self.assertEqual(first, [{'id': 1, 'name': 'foo'}])
+        self.assertEqual(second, first)
+        mock_get.assert_called_once_with('http://foo.bar/1', headers={'Authorization': 'token'})
+
+    def test_revalidate_not_modified(self) -> None:
+        cache = RestApiResponseCache(self.cache_path, ttl_sec=0)
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            mock_get.side_effect = [_response(200, {'name': 'foo'}, {'ETag': '"v1"',
+                                                                     'Last-Modified': 'Fri, 01 Jan 2021 00:00:00 GMT'}),
+                                    _response(304)]
+            list(self._query(cache).execute())
+            results = list(self._query(cache).execute())
+
+        self.assertEqual(results, [{'id': 1, 'name': 'foo'}])
+        self.assertEqual(mock_get.call_args[1]['headers'], {'Authorization': 'token',
+                                                            'If-None-Match': '"v1"',
+                                                            'If-Modified-Since': 'Fri, 01 Jan 2021 00:00:00 GMT'})
+        # request params of the query are left as is
+        self.assertEqual(self.params, {'headers': {'Authorization': 'token'}})
+
+    def test_revalidate_modified(self) -> None:
+        cache = RestApiResponseCache(self.cache_path, ttl_sec=0)
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            mock_get.side_effect = [_response(200, {'name': 'foo'}, {'ETag': '"v1"'}),
+                                    _response(200, {'name': 'bar'}, {'ETag': '"v2"'}),
+                                    _response(304)]
+            list(self._query(cache).execute())
+            second = list(self._query(cache).execute())
+            third = list(self._query(cache).execute())
+
+        self.assertEqual(second, [{'id': 1, 'name': 'bar'}])
+        self.assertEqual(third, [{'id': 1, 'name': 'bar'}])
+        self.assertEqual(mock_get.call_args[1]['headers']['If-None-Match'], '"v2"')
+
+    def test_key(self) -> None:
+        cache = RestApiResponseCache(self.cache_path)
+        cache.put(url='http://foo.bar/1', params={'params': {'page': 1}}, response=_response(200, {'name': 'foo'}))
+
+        self.assertIsNotNone(cache.get(url='http://foo.bar/1', params={'params': {'page': 1}, 'auth': object()}))
+        self.assertIsNone(cache.get(url='http://foo.bar/1', params={'params': {'page': 2}}))
+        self.assertIsNone(cache.get(url='http://foo.bar/2', params={'params': {'page': 1}}))
+
+    def test_not_stored(self) -> None:
+        cache = RestApiResponseCache(self.cache_path)
+        cache.put(url='http://foo.bar/1', params={}, response=_response(200, {}, {'Cache-Control': 'no-store'}))
+        cache.put(url='http://foo.bar/2', params={}, response=_response(202, {}))
+
+        self.assertIsNone(cache.get(url='http://foo.bar/1', params={}))
+        self.assertIsNone(cache.get(url='http://foo.bar/2', params={}))
+
+    def test_mode_pagination(self) -> None:
+        cache = RestApiResponseCache(self.cache_path)
+        with patch('databuilder.rest_api.rest_api_query.requests.get') as mock_get:
+            mock_get.side_effect = [_response(200, {'foo': [{'name': 'v1'}, {'name': 'v2'}]}),
+                                    _response(200, {'foo': [{'name': 'v3'}]})]
+            for _ in range(2):
+                query = ModePaginatedRestApiQuery(query_to_join=RestApiQuerySeed(seed_record=[{'id': 1}]),
+                                                  url='http://foo.bar/{id}', params={}, json_path='foo[*].name',
+                                                  field_names=['name'], pagination_json_path='foo[*]',
+                                                  max_record_size=2, response_cache=cache)
+                self.assertEqual([result['name'] for result in query.execute()], ['v1', 'v2', 'v3'])
+
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ import unittest
 
 from mock import patch
 from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory
 
 from databuilder.publisher import neo4j_csv_publisher
@@ -453,6 +454,105 @@ class TestRemoveStaleData(unittest.TestCase):
 
             session_mock.assert_not_called()
 
+    def _init_task(self, **conf: object) -> Neo4jStalenessRemovalTask:
+        task = Neo4jStalenessRemovalTask()
+        job_config = ConfigFactory.from_dict(dict({
+            f'job.identifier': 'remove_stale_data_job',
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_END_POINT_KEY}': 'foobar',
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_USER}': 'foo',
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_PASSWORD}': 'bar',
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.STALENESS_MAX_PCT}': 5,
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.TARGET_NODES}': ['Foo', 'Baz'],
+            f'{task.get_scope()}.{neo4j_staleness_removal_task.TARGET_RELATIONS}': ['BAR'],
+            neo4j_csv_publisher.JOB_PUBLISH_TAG: 'foo',
+        }, **{f'{task.get_scope()}.{key}': value for key, value in conf.items()}))
+        task.init(job_config)
+        return task
+
+    def test_single_pass_validation_statement(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jStalenessRemovalTask, '_execute_cypher_query') \
+                as mock_execute:
+            mock_execute.return_value = [{'total_count': 100, 'stale_count': 1}]
+            task = self._init_task(**{neo4j_staleness_removal_task.SINGLE_PASS_VALIDATION: True,
+                                      neo4j_staleness_removal_task.CONCURRENCY: 2})
+            task.validate()
+
+            # One query per target
+            self.assertEqual(mock_execute.call_count, 3)
+            mock_execute.assert_any_call(param_dict={'marker': u'foo'},
+                                         statement=textwrap.dedent("""
+            MATCH (target:Foo)
+            WHERE true
+            RETURN count(*) as total_count,
+            sum(CASE WHEN (target.published_tag <> $marker
+            OR NOT EXISTS(target.published_tag)) THEN 1 ELSE 0 END) as stale_count
+            """))
+            mock_execute.assert_any_call(param_dict={'marker': u'foo'},
+                                         statement=textwrap.dedent("""
+            MATCH (start_node)-[target:BAR]-(end_node)
+            WHERE true
+            RETURN count(*) as total_count,
+            sum(CASE WHEN (target.published_tag <> $marker
+            OR NOT EXISTS(target.published_tag)) THEN 1 ELSE 0 END) as stale_count
+            """))
+
+    def test_single_pass_validation_failure(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jStalenessRemovalTask, '_execute_cypher_query') \
+                as mock_execute:
+            mock_execute.side_effect = lambda statement, param_dict: \
+                [{'total_count': 100, 'stale_count': 50 if 'Baz' in statement else 1}]
+            task = self._init_task(**{neo4j_staleness_removal_task.SINGLE_PASS_VALIDATION: True,
+                                      neo4j_staleness_removal_task.CONCURRENCY: 2})
+
+            with self.assertRaisesRegex(Exception, 'Staleness percentage of Baz is 50.0 %'):
+                task.validate()
+
+    def test_concurrent_delete(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jStalenessRemovalTask, '_execute_cypher_query') \
+                as mock_execute:
+            remaining = {'Foo': 2, 'Baz': 1, 'BAR': 0}
+
+            def delete_batch(statement: str, param_dict: dict, dry_run: bool) -> list:
+                target_type = next(t for t in remaining if f':{t}' in statement)
+                count = min(remaining[target_type], 1)
+                remaining[target_type] -= count
+                return [{'count': count}]
+
+            mock_execute.side_effect = delete_batch
+            task = self._init_task(**{neo4j_staleness_removal_task.CONCURRENCY: 3,
+                                      neo4j_staleness_removal_task.BATCH_SIZE: 1})
+            task._delete_stale_nodes()
+            task._delete_stale_relations()
+
+            self.assertEqual(remaining, {'Foo': 0, 'Baz': 0, 'BAR': 0})
+            # Batches deleting records, and the empty batch ending each target
+            self.assertEqual(mock_execute.call_count, 6)
+
+    def test_delete_retry_transient_error(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), \
+                patch.object(Neo4jStalenessRemovalTask, '_execute_cypher_query') as mock_execute, \
+                patch.object(neo4j_staleness_removal_task.time, 'sleep') as mock_sleep:
+            mock_execute.side_effect = [TransientError('deadlock'), [{'count': 1}], [{'count': 0}]]
+            task = self._init_task(**{neo4j_staleness_removal_task.TARGET_NODES: ['Foo']})
+            task._delete_stale_nodes()
+
+            self.assertEqual(mock_execute.call_count, 3)
+            self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_adaptive_batch_size(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            task = self._init_task(**{neo4j_staleness_removal_task.ADAPTIVE_BATCH_SIZE: True,
+                                      neo4j_staleness_removal_task.MAX_BATCH_SIZE: 300,
+                                      neo4j_staleness_removal_task.TARGET_BATCH_SEC: 2})
+
+            self.assertEqual(task._adapt_batch_size(100, count=100, elapsed_sec=0.5), 200)
+            self.assertEqual(task._adapt_batch_size(200, count=200, elapsed_sec=0.5), 300)
+            # Last batch of a target
+            self.assertEqual(task._adapt_batch_size(100, count=20, elapsed_sec=0.1), 100)
+            self.assertEqual(task._adapt_batch_size(100, count=100, elapsed_sec=1.5), 100)
+            self.assertEqual(task._adapt_batch_size(100, count=100, elapsed_sec=3), 50)
+            self.assertEqual(task._adapt_batch_size(1, count=1, elapsed_sec=3), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,150 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import (
+    Any, Callable, Iterator, List, Optional,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.loader.base_loader import Loader
+from databuilder.task.pipelined_task import PipelinedTask
+from databuilder.transformer.base_transformer import Transformer
+
+
+class ListExtractor(Extractor):
+
+    def __init__(self, records: Iterator[Any]) -> None:
+        self._records = records
+        self.close_count = 0
+
+    def init(self, conf: ConfigTree) -> None:
+        pass
+
+    def close(self) -> None:
+        self.close_count += 1
+
+    def extract(self) -> Any:
+        return next(self._records, None)
+
+    def get_scope(self) -> str:
+        return 'extractor.list'
+
+
+class ListLoader(Loader):
+
+    def __init__(self, fail_on: Optional[int] = None, block_on: Optional[int] = None) -> None:
+        self.records: List[Any] = []
+        self._fail_on = fail_on
+        self._block_on = block_on
+        # Called once block_on is loaded
+        self.block: Callable[[], Any] = lambda: None
+        self.close_count = 0
+
+    def init(self, conf: ConfigTree) -> None:
+        pass
+
+    def close(self) -> None:
+        self.close_count += 1
+
+    def load(self, record: Any) -> None:
+        if record == self._fail_on:
+            raise ValueError('load failed')
+        self.records.append(record)
+        if record == self._block_on:
+            self.block()
+
+    def get_scope(self) -> str:
+        return 'loader.list'
+
+
+class SplitTransformer(Transformer):
+    """
+    Drops multiples of 5 and yields records twice
+    """
+
+    def init(self, conf: ConfigTree) -> None:
+        pass
+
+    def transform(self, record: Any) -> Any:
+        if record % 5 == 0:
+            return None
+        if record == 13:
+            raise ValueError('transform failed')
+        return iter([record, -record])
+
+    def get_scope(self) -> str:
+        return 'transformer.split'
+
+
+class TestPipelinedTask(unittest.TestCase):
+
+    def _run(self, task: PipelinedTask, **conf: Any) -> None:
+        task.init(ConfigFactory.from_dict({f'task.{key}': value for key, value in conf.items()}))
+        task.run()
+
+    def test_run(self) -> None:
+        extractor = ListExtractor(iter(range(1, 2001)))
+        loader = ListLoader()
+        self._run(PipelinedTask(extractor=extractor, loader=loader), **{PipelinedTask.QUEUE_SIZE: 10})
+
+        self.assertEqual(loader.records, list(range(1, 2001)))
+        self.assertEqual(extractor.close_count, 1)
+        self.assertEqual(loader.close_count, 1)
+
+    def test_run_transform_workers(self) -> None:
+        loader = ListLoader()
+        self._run(PipelinedTask(extractor=ListExtractor(iter(range(1, 13))), loader=loader,
+                                transformer=SplitTransformer()),
+                  **{PipelinedTask.QUEUE_SIZE: 2, PipelinedTask.TRANSFORM_WORKERS: 3})
+
+        self.assertCountEqual(loader.records, [sign * i for i in range(1, 13) if i % 5 for sign in (1, -1)])
+
+    def test_transform_failure(self) -> None:
+        extractor = ListExtractor(iter(range(1, 2001)))
+        # As at most 2 records wait to be loaded, the failing record 13 is only transformed once the loader got -11.
+        # Loading -11 waits until the failure stops the task, so that no more records are loaded
+        loader = ListLoader(block_on=-11)
+        task = PipelinedTask(extractor=extractor, loader=loader, transformer=SplitTransformer())
+        loader.block = lambda: self.assertTrue(task._stopped.wait(timeout=10))
+
+        with self.assertRaisesRegex(ValueError, 'transform failed'):
+            self._run(task, **{PipelinedTask.QUEUE_SIZE: 2, PipelinedTask.TRANSFORM_WORKERS: 1})
+
+        self.assertEqual(loader.records, [sign * i for i in range(1, 12) if i % 5 for sign in (1, -1)])
+        self.assertEqual(extractor.close_count, 1)
+        self.assertEqual(loader.close_count, 1)
+
+    def test_load_failure(self) -> None:
+        def records() -> Iterator[int]:
+            i = 0
+            while True:
+                i += 1
+                yield i
+
+        # the extractor never ends, so it has to be stopped
+        extractor = ListExtractor(records())
+        loader = ListLoader(fail_on=100)
+
+        with self.assertRaisesRegex(ValueError, 'load failed'):
+            self._run(PipelinedTask(extractor=extractor, loader=loader), **{PipelinedTask.QUEUE_SIZE: 10})
+
+        self.assertEqual(loader.records, list(range(1, 100)))
+        self.assertEqual(extractor.close_count, 1)
+
+    def test_extract_failure(self) -> None:
+        def records() -> Iterator[int]:
+            yield 1
+            raise ValueError('extract failed')
+
+        loader = ListLoader()
+        with self.assertRaisesRegex(ValueError, 'extract failed'):
+            self._run(PipelinedTask(extractor=ListExtractor(records()), loader=loader))
+
+        self.assertEqual(loader.close_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from typing import Any, Set
+
+from mock import patch
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder import Scoped
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.extractor.postgres_metadata_extractor import PostgresMetadataExtractor
+from databuilder.extractor.snowflake_metadata_extractor import SnowflakeMetadataExtractor
+from databuilder.extractor.sql_alchemy_extractor import SQLAlchemyExtractor
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.models.table_metadata import TableMetadata
+from databuilder.task.base_task import Task
+from databuilder.task.sharded_task import (
+    ShardedTask, partition_by_schema, postgres_schema_clause, snowflake_schema_clause,
+)
+from databuilder.task.task import DefaultTask
+from databuilder.utils.csv_reader import read_csv_records
+
+
+class SchemaTablesExtractor(Extractor):
+    """
+    Extracts two tables of each configured schema
+    """
+
+    def init(self, conf: ConfigTree) -> None:
+        schemas = conf.get_list('schemas')
+        if 'broken' in schemas:
+            raise ValueError('extract failed')
+        self._tables = iter([TableMetadata('hive', 'gold', schema, f'table_{i}', None)
+                             for schema in schemas for i in range(2)])
+
+    def extract(self) -> Any:
+        return next(self._tables, None)
+
+    def get_scope(self) -> str:
+        return 'extractor.schema_tables'
+
+
+def build_task() -> Task:
+    return DefaultTask(extractor=SchemaTablesExtractor(), loader=FsNeo4jCSVLoader())
+
+
+class TestShardedTask(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.node_dir = os.path.join(self.temp_dir.name, 'nodes')
+        self.relation_dir = os.path.join(self.temp_dir.name, 'relationships')
+        self.conf = ConfigFactory.from_dict({
+            'task.max_workers': 2,
+            f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.NODE_DIR_PATH}': self.node_dir,
+            f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.RELATION_DIR_PATH}': self.relation_dir,
+            f'loader.filesystem_csv_neo4j.{FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR}': False,
+        })
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _table_keys(self) -> Set[str]:
+        keys: Set[str] = set()
+        for file_name in os.listdir(self.node_dir):
+            if file_name.endswith('.csv') and '_Table_' in file_name:
+                keys.update(record['KEY'] for record in read_csv_records(os.path.join(self.node_dir, file_name)))
+        return keys
+
+    def test_merges_shards_outputs(self) -> None:
+        task = ShardedTask(task_factory=build_task,
+                           shards=[{'extractor.schema_tables.schemas': ['sales', 'hr']},
+                                   {'extractor.schema_tables.schemas': ['ads']}])
+        task.init(self.conf)
+        task.run()
+
+        self.assertEqual(self._table_keys(),
+                         {f'hive://gold.{schema}/table_{i}' for schema in ('sales', 'hr', 'ads') for i in range(2)})
+        # Shards' files are moved up into the directories the publisher reads
+        for path in (self.node_dir, self.relation_dir):
+            file_names = os.listdir(path)
+            self.assertTrue(file_names)
+            self.assertTrue(all(os.path.isfile(os.path.join(path, f)) for f in file_names))
+            self.assertTrue(all(f.startswith('shard_') for f in file_names))
+
+    def test_failed_shard(self) -> None:
+        task = ShardedTask(task_factory=build_task,
+                           shards=[{'extractor.schema_tables.schemas': ['sales']},
+                                   {'extractor.schema_tables.schemas': ['broken']}])
+        task.init(self.conf)
+        with self.assertRaises(ValueError):
+            task.run()
+
+    def test_existing_directory(self) -> None:
+        os.makedirs(self.node_dir)
+        task = ShardedTask(task_factory=build_task, shards=[])
+        with self.assertRaises(RuntimeError):
+            task.init(self.conf)
+
+    def test_partition_by_schema(self) -> None:
+        overrides = partition_by_schema(['c', 'a', "o'b", 'd'], 3, 'extractor.x.where_clause_suffix',
+                                        postgres_schema_clause)
+        self.assertEqual(overrides, [
+            {'extractor.x.where_clause_suffix': "st.schemaname IN ('a', 'o''b')"},
+            {'extractor.x.where_clause_suffix': "st.schemaname IN ('c')"},
+            {'extractor.x.where_clause_suffix': "st.schemaname IN ('d')"},
+        ])
+
+    def test_partition_by_schema_with_partition_fn(self) -> None:
+        overrides = partition_by_schema(['a', 'bb', 'cc'], 4, 'where', postgres_schema_clause, 'true',
+                                        partition_fn=len)
+        self.assertEqual(overrides, [
+            {'where': "(true) AND st.schemaname IN ('a')"},
+            {'where': "(true) AND st.schemaname IN ('bb', 'cc')"},
+        ])
+
+    def test_partition_by_schema_postgres_sql(self) -> None:
+        scope = PostgresMetadataExtractor().get_scope()
+        key = f'{scope}.{PostgresMetadataExtractor.WHERE_CLAUSE_SUFFIX_KEY}'
+        overrides = partition_by_schema(['sales', 'hr'], 2, key, postgres_schema_clause,
+                                        "st.schemaname != 'tmp' OR st.relname = 'x'")
+
+        sql_stmts = []
+        for override in overrides:
+            conf = ConfigFactory.from_dict(override).with_fallback(ConfigFactory.from_dict({
+                f'{scope}.extractor.sqlalchemy.{SQLAlchemyExtractor.CONN_STRING}': 'TEST',
+            }))
+            with patch.object(SQLAlchemyExtractor, '_get_connection'):
+                extractor = PostgresMetadataExtractor()
+                extractor.init(Scoped.get_scoped_conf(conf, scope))
+            sql_stmts.append(' '.join(extractor.sql_stmt.split()))
+
+        self.assertIn("WHERE att.attnum >=0 and (st.schemaname != 'tmp' OR st.relname = 'x') "
+                      "AND st.schemaname IN ('hr') ORDER by", sql_stmts[0])
+        self.assertIn("WHERE att.attnum >=0 and (st.schemaname != 'tmp' OR st.relname = 'x') "
+                      "AND st.schemaname IN ('sales') ORDER by", sql_stmts[1])
+
+    def test_partition_by_schema_snowflake_sql(self) -> None:
+        scope = SnowflakeMetadataExtractor().get_scope()
+        key = f'{scope}.{SnowflakeMetadataExtractor.WHERE_CLAUSE_SUFFIX_KEY}'
+
+        for where_clause_suffix, expected in [
+            (' ', "AND c.TABLE_SCHEMA = t.TABLE_SCHEMA WHERE c.table_schema IN ('SALES');"),
+            ("where c.table_catalog = 'PROD'",
+             "AND c.TABLE_SCHEMA = t.TABLE_SCHEMA WHERE (c.table_catalog = 'PROD') AND c.table_schema IN ('SALES');"),
+        ]:
+            override, = partition_by_schema(['SALES'], 2, key, snowflake_schema_clause, where_clause_suffix)
+            conf = ConfigFactory.from_dict(override).with_fallback(ConfigFactory.from_dict({
+                f'{scope}.extractor.sqlalchemy.{SQLAlchemyExtractor.CONN_STRING}': 'TEST',
+            }))
+            with patch.object(SQLAlchemyExtractor, '_get_connection'):
+                extractor = SnowflakeMetadataExtractor()
+                extractor.init(Scoped.get_scoped_conf(conf, scope))
+            self.assertIn(expected, ' '.join(extractor.sql_stmt.split()))
+
+        with self.assertRaises(ValueError):
+            partition_by_schema(['SALES'], 2, key, snowflake_schema_clause, "c.table_catalog = 'PROD'")
+
+
+if __name__ == '__main__':
+    unittest.main()
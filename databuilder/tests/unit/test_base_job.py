@@ -8,10 +8,11 @@ import tempfile
 import unittest
 from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.extractor.base_extractor import Extractor
+from databuilder.job.base_job import Job
 from databuilder.job.job import DefaultJob
 from databuilder.loader.base_loader import Loader
 from databuilder.task.task import DefaultTask
@@ -105,6 +106,48 @@ class TestJobStatsd(unittest.TestCase):
                 self.assertFalse(file.readline())
 
             self.assertEqual(mock_statsd.return_value.incr.call_count, 1)
+            timed_stages = {c[0][0] for c in mock_statsd.return_value.timing.call_args_list}
+            self.assertEqual(timed_stages, {'extract.time', 'transform.time', 'load.time', 'publish.time'})
+
+
+class TestJobMetricsSummary(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir_path = tempfile.mkdtemp()
+        self.dest_file_name = f'{self.temp_dir_path}/superhero.json'
+        self.summary_file_name = f'{self.temp_dir_path}/summary.json'
+        self.conf = ConfigFactory.from_dict(
+            {'loader.superhero.dest_file': self.dest_file_name,
+             'job.identifier': 'foobar',
+             'job.metrics_summary_path': self.summary_file_name})
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir_path)
+
+    def test_job(self) -> None:
+        task = DefaultTask(SuperHeroExtractor(), SuperHeroLoader(), transformer=SuperHeroReverseNameTransformer())
+
+        job = DefaultJob(self.conf, task)
+        job.launch()
+
+        with open(self.summary_file_name, 'r') as file:
+            summary = json.load(file)
+        self.assertEqual(summary['identifier'], 'foobar')
+        self.assertTrue(summary['is_success'])
+        self.assertEqual({stage: stage_summary['records'] for stage, stage_summary in summary['stages'].items()},
+                         {'extract': 2, 'transform': 2, 'load': 2, 'publish': 0})
+
+    def test_failed_job_with_summary_failure(self) -> None:
+        conf = ConfigFactory.from_dict({'job.metrics_summary_path': f'{self.temp_dir_path}/missing/summary.json'})
+        task = DefaultTask(FailingExtractor(), SuperHeroLoader())
+        closeable = MagicMock()
+        Job.closer.register(closeable)
+
+        job = DefaultJob(conf.with_fallback(self.conf), task)
+        with self.assertRaisesRegex(ValueError, 'extract failed'):
+            job.launch()
+
+        closeable.assert_called_once()
 
 
 class SuperHeroExtractor(Extractor):
@@ -126,6 +169,11 @@ class SuperHeroExtractor(Extractor):
         return 'extractor.superhero'
 
 
+class FailingExtractor(SuperHeroExtractor):
+    def extract(self) -> Any:
+        raise ValueError('extract failed')
+
+
 class SuperHero:
     def __init__(self,
                  hero: str,
@@ -0,0 +1,82 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+
+import pandas
+
+from databuilder.utils.csv_reader import read_csv_column_values, read_csv_records
+
+here = os.path.dirname(__file__)
+
+
+class TestCsvReader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._resource_path = os.path.join(here, '../resources/csv_publisher')
+
+    def test_read_csv_records(self) -> None:
+        node_file = f'{self._resource_path}/nodes/test_column.csv'
+        expected = pandas.read_csv(node_file, na_filter=False).to_dict(orient='records')
+
+        for chunk_size in [1, 2, 10000]:
+            records = read_csv_records(node_file, chunk_size=chunk_size)
+            self.assertEqual(list(records), expected)
+
+        self.assertEqual(expected[0], {'KEY': 'presto://gold.test_schema1/test_table1/test_id1',
+                                       'name': 'test_id1',
+                                       'order_pos:UNQUOTED': 1,
+                                       'type': 'bigint',
+                                       'LABEL': 'Column'})
+
+    def test_read_csv_records_types_across_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'nodes.csv')
+            with open(file_path, 'w', encoding='utf8') as csv_file:
+                csv_file.write('KEY,count,ratio,flag,name\n'
+                               'a,1,1.5,True,abc\n'
+                               'b,2,2,False,123\n'
+                               'c,3,2.5,true,\n'
+                               'd,4,3,FALSE,456\n')
+            expected = pandas.read_csv(file_path, na_filter=False).to_dict(orient='records')
+
+            for chunk_size in [1, 2, 10000]:
+                records = list(read_csv_records(file_path, chunk_size=chunk_size))
+                self.assertEqual(records, expected)
+                # Columns keep the types of the first chunk in all chunks
+                self.assertEqual([type(record['count']) for record in records], [int] * 4)
+                self.assertEqual([type(record['ratio']) for record in records], [float] * 4)
+                self.assertEqual([type(record['flag']) for record in records], [bool] * 4)
+
+                # Text in the first chunk keeps numbers of later chunks as text
+                self.assertEqual([type(record['name']) for record in records], [str] * 4)
+
+            self.assertEqual(read_csv_column_values(file_path, ['name'], chunk_size=1), {'123', 'abc', '', '456'})
+
+    def test_read_csv_records_later_chunk_of_other_type(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'nodes.csv')
+            with open(file_path, 'w', encoding='utf8') as csv_file:
+                csv_file.write('KEY,count,value\n'
+                               'a,1,123\n'
+                               'b,1.5,abc\n')
+
+            with self.assertLogs('databuilder.utils.csv_reader', level='WARNING'):
+                records = list(read_csv_records(file_path, chunk_size=1))
+
+            # int columns widen to float, other values that do not fit the first chunk's type stay text
+            self.assertEqual(records, [{'KEY': 'a', 'count': 1, 'value': 123},
+                                       {'KEY': 'b', 'count': 1.5, 'value': 'abc'}])
+
+    def test_read_csv_column_values(self) -> None:
+        relation_file = f'{self._resource_path}/relations/test_edge_short.csv'
+
+        self.assertEqual(read_csv_column_values(relation_file, ['START_LABEL', 'END_LABEL'], chunk_size=1),
+                         {'Table', 'Column'})
+        self.assertEqual(read_csv_column_values(relation_file, ['TYPE']), {'COLUMN'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import unittest
+
+from mock import MagicMock
+
+from databuilder.utils.job_metrics import (
+    EXTRACT, LOAD, PUBLISH, JobMetrics,
+)
+
+
+class TestJobMetrics(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.metrics = JobMetrics()
+        self.metrics.record(EXTRACT, 2.0, 10)
+        self.metrics.record(EXTRACT, 2.0, 10)
+        self.metrics.record(PUBLISH, seconds=4.0)
+        self.metrics.record(PUBLISH, records=100)
+        self.metrics.record(LOAD)
+        self.metrics.record_file('/tmp/nodes/Table_0.csv', 300)
+        self.metrics.record_file('/tmp/nodes/Column_0.csv', 700)
+
+    def test_summary(self) -> None:
+        self.assertEqual(self.metrics.summary(), {
+            'stages': {
+                EXTRACT: {'seconds': 4.0, 'records': 20, 'records_per_sec': 5.0},
+                PUBLISH: {'seconds': 4.0, 'records': 100, 'records_per_sec': 25.0},
+                LOAD: {'seconds': 0.0, 'records': 0, 'records_per_sec': None},
+            },
+            'bytes_written': 1000,
+            'files': {'/tmp/nodes/Table_0.csv': 300, '/tmp/nodes/Column_0.csv': 700},
+        })
+
+    def test_merge(self) -> None:
+        other = JobMetrics()
+        other.merge(self.metrics.snapshot())
+        other.merge(self.metrics.snapshot())
+        self.assertEqual(other.summary()['stages'][EXTRACT], {'seconds': 8.0, 'records': 40, 'records_per_sec': 5.0})
+        self.assertEqual(other.summary()['bytes_written'], 1000)
+
+    def test_reset(self) -> None:
+        self.metrics.reset()
+        self.assertEqual(self.metrics.summary(), {'stages': {}, 'bytes_written': 0, 'files': {}})
+
+    def test_emit(self) -> None:
+        statsd = MagicMock()
+        self.metrics.emit(statsd)
+        statsd.timing.assert_any_call('extract.time', 4000.0)
+        statsd.gauge.assert_any_call('publish.records_per_sec', 25.0)
+        statsd.gauge.assert_any_call('bytes_written', 1000)
+        self.assertNotIn('load.records_per_sec', [c[0][0] for c in statsd.gauge.call_args_list])
+
+    def test_write_summary(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'summary.json')
+            self.metrics.write_summary(path, extra={'identifier': 'foo'})
+            with open(path, 'r') as summary_file:
+                summary = json.load(summary_file)
+        self.assertEqual(summary['identifier'], 'foo')
+        self.assertEqual(summary['stages'][PUBLISH]['records_per_sec'], 25.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
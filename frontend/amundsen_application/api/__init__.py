@@ -4,10 +4,12 @@
 from typing import Any, Tuple
 import logging
 
-from flask import Flask, render_template
+from flask import Flask, jsonify, render_template, Response
 import jinja2
 import os
 
+from amundsen_application.api.utils.request_utils import get_session_pool_stats
+
 
 ENVIRONMENT = os.getenv('APPLICATION_ENV', 'development')
 LOGGER = logging.getLogger(__name__)
@@ -15,6 +17,7 @@ LOGGER = logging.getLogger(__name__)
 
 def init_routes(app: Flask) -> None:
     app.add_url_rule('/healthcheck', 'healthcheck', healthcheck)
+    app.add_url_rule('/healthcheck/request_pools', 'request_pools', request_pools)
     app.add_url_rule('/', 'index', index, defaults={'path': ''})  # also functions as catch_all
     app.add_url_rule('/<path:path>', 'index', index)  # catch_all
 
@@ -29,3 +32,7 @@ def index(path: str) -> Any:
 
 def healthcheck() -> Tuple[str, int]:
     return '', 200  # pragma: no cover
+
+
+def request_pools() -> Response:
+    return jsonify(get_session_pool_stats())
@@ -6,7 +6,7 @@ import json
 
 from http import HTTPStatus
 
-from typing import Any, Dict  # noqa: F401
+from typing import Any, Callable, Dict, Tuple  # noqa: F401
 
 from flask import Response, jsonify, make_response, request
 from flask import current_app as app
@@ -32,6 +32,7 @@ SEARCH_TABLE_FILTER_ENDPOINT = '/search_table'
 SEARCH_FEATURE_ENDPOINT = '/search_feature'
 SEARCH_FEATURE_FILTER_ENDPOINT = '/search_feature_filter'
 SEARCH_USER_ENDPOINT = '/search_user'
+SEARCH_MULTI_ENDPOINT = '/search_multi'
 
 
 @search_blueprint.route('/table', methods=['POST'])
@@ -117,6 +118,12 @@ def _search_table(*, search_term: str, page_index: int, filters: Dict, search_ty
         return results_dict
 
 
+def _map_user_result(result: Dict) -> Dict:
+    user_result = dump_user(load_user(result))
+    user_result['type'] = 'user'
+    return user_result
+
+
 @search_blueprint.route('/user', methods=['GET'])
 def search_user() -> Response:
     """
@@ -148,11 +155,6 @@ def _search_user(*, search_term: str, page_index: int, search_type: str) -> Dict
     :return: a json output containing search results array as 'results'
     """
 
-    def _map_user_result(result: Dict) -> Dict:
-        user_result = dump_user(load_user(result))
-        user_result['type'] = 'user'
-        return user_result
-
     users = {
         'page_index': page_index,
         'results': [],
@@ -356,3 +358,113 @@ def _search_feature(*, search_term: str, page_index: int, filters: Dict, search_
         results_dict['msg'] = message
         logging.exception(message)
         return results_dict
+
+
+# Key of the results of each resource type, and function mapping the search service results to them
+MULTI_SEARCH_RESOURCES = {
+    'table': ('tables', map_table_result),
+    'user': ('users', _map_user_result),
+    'dashboard': ('dashboards', marshall_dashboard_partial),
+    'feature': ('features', map_feature_result),
+}  # type: Dict[str, Tuple[str, Callable[[Dict], Dict]]]
+
+
+@search_blueprint.route('/multi', methods=['POST'])
+def search_multi() -> Response:
+    """
+    Parse the request arguments and call the helper method to search several resource types at once
+    :return: a Response created with the results from the helper method
+    """
+    results_dict = {}
+    try:
+        request_json = request.get_json()
+
+        search_term = get_query_param(request_json, 'term', '"term" parameter expected in request data')
+        resources = request_json.get('resources', list(MULTI_SEARCH_RESOURCES.keys()))
+        unknown_resources = set(resources) - set(MULTI_SEARCH_RESOURCES.keys())
+        if unknown_resources:
+            raise Exception(f'Unknown resources {sorted(unknown_resources)}')
+        page_indices = {resource: int(request_json.get('pageIndices', {}).get(resource, 0)) for resource in resources}
+        search_type = request_json.get('searchType')
+
+        filters = request_json.get('filters', {})
+        transformed_filters = {resource: transform_filters(filters=filters.get(resource, {}), resource=resource)
+                               for resource in resources}
+
+        results_dict = _search_multi(filters=transformed_filters,
+                                     search_term=search_term,
+                                     page_indices=page_indices,
+                                     search_type=search_type)
+        return make_response(jsonify(results_dict), results_dict.get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR))
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify(results_dict), HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@action_logging
+def _search_multi(*, search_term: str, page_indices: Dict[str, int], filters: Dict[str, Dict],
+                  search_type: str) -> Dict[str, Any]:
+    """
+    Call the search service endpoint searching all the given resource types with a single request, instead of
+    an endpoint per resource type, and return matching results
+    Search service logic defined here:
+    https://github.com/amundsen-io/amundsen/blob/main/search/search_service/api/search.py
+
+    :return: a json output containing the results of each resource type, like the search of each resource type
+    """
+    results_dict = {
+        'search_term': search_term,
+        'msg': '',
+    }  # type: Dict[str, Any]
+
+    # Default results
+    for resource, page_index in page_indices.items():
+        results_key, _ = MULTI_SEARCH_RESOURCES[resource]
+        results_dict[results_key] = {
+            'page_index': page_index,
+            'results': [],
+            'total_results': 0,
+        }
+
+    try:
+        search_requests = {}
+        for resource, resource_filters in filters.items():
+            if has_filters(filters=resource_filters, resource=resource):
+                resource_query_json = generate_query_json(filters=resource_filters,
+                                                          page_index=page_indices[resource],
+                                                          search_term=search_term)
+                search_requests[resource] = resource_query_json['search_request']
+
+        query_json = {
+            'query_term': search_term,
+            'resources': list(page_indices.keys()),
+            'search_requests': search_requests,
+            'page_indices': page_indices,
+        }
+        url = app.config['SEARCHSERVICE_BASE'] + SEARCH_MULTI_ENDPOINT
+        response = request_search(url=url,
+                                  headers={'Content-Type': 'application/json'},
+                                  method='POST',
+                                  data=json.dumps(query_json))
+
+        status_code = response.status_code
+        if status_code == HTTPStatus.OK:
+            results_dict['msg'] = 'Success'
+            for resource, resource_results in response.json().get('results', {}).items():
+                results_key, map_result = MULTI_SEARCH_RESOURCES[resource]
+                results_dict[results_key]['results'] = [map_result(result)
+                                                        for result in resource_results.get('results', [])]
+                results_dict[results_key]['total_results'] = resource_results.get('total_results', 0)
+        else:
+            message = 'Encountered error: Search request failed'
+            results_dict['msg'] = message
+            logging.error(message)
+
+        results_dict['status_code'] = status_code
+        return results_dict
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        results_dict['msg'] = message
+        logging.exception(message)
+        return results_dict
@@ -1,10 +1,20 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple  # noqa: F401
 
 import requests
 from flask import current_app as app
+from requests.adapters import HTTPAdapter
+
+METADATA_SERVICE = 'metadata'
+SEARCH_SERVICE = 'search'
+
+# Long-lived sessions keyed by service and the configuration they were built with
+_sessions = {}  # type: Dict[Tuple, requests.Session]
+_sessions_lock = Lock()
 
 
 def get_query_param(args: Dict, param: str, error_msg: str = None) -> str:
@@ -45,7 +55,8 @@ def request_metadata(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=METADATA_SERVICE)
 
 
 def request_search(*,     # type: ignore
@@ -79,11 +90,13 @@ def request_search(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=SEARCH_SERVICE)
 
 
 # TODO: Define an interface for envoy_client
-def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None):  # type: ignore
+def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None,  # type: ignore
+                    service=None):
     """
     Wraps a request to use Envoy client and headers, if available
     :param method: DELETE | GET | POST | PUT
@@ -92,6 +105,7 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
     :param headers: Optional Envoy request headers
     :param timeout_sec: Number of seconds before timeout is triggered. Not used with Envoy
     :param data: Optional request payload
+    :param service: Optional name of the downstream service, whose pooled session is used if pooling is enabled
     :return:
     """
     # If no timeout specified, use the one from the configurations.
@@ -108,18 +122,25 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
             return client.put(url, headers=headers, raw_response=True, raw_request=True, data=data, json=json)
         else:
             raise Exception('Method not allowed: {}'.format(method))
+    elif service is not None and app.config.get('REQUEST_SESSION_POOLING'):
+        return _send(get_session(service), method, url, headers, timeout_sec, data, json)
     else:
         with build_session() as s:
-            if method == 'DELETE':
-                return s.delete(url, headers=headers, timeout=timeout_sec)
-            elif method == 'GET':
-                return s.get(url, headers=headers, timeout=timeout_sec)
-            elif method == 'POST':
-                return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            elif method == 'PUT':
-                return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            else:
-                raise Exception('Method not allowed: {}'.format(method))
+            return _send(s, method, url, headers, timeout_sec, data, json)
+
+
+def _send(s: requests.Session, method: str, url: str, headers: Any, timeout_sec: int,
+          data: Any, json: Any) -> requests.Response:
+    if method == 'DELETE':
+        return s.delete(url, headers=headers, timeout=timeout_sec)
+    elif method == 'GET':
+        return s.get(url, headers=headers, timeout=timeout_sec)
+    elif method == 'POST':
+        return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    elif method == 'PUT':
+        return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    else:
+        raise Exception('Method not allowed: {}'.format(method))
 
 
 def build_session() -> requests.Session:
@@ -130,4 +151,63 @@ def build_session() -> requests.Session:
     if cert is not None and key is not None:
         session.cert = (cert, key)
 
+    pool_size = app.config.get('REQUEST_SESSION_POOL_SIZE', 10)
+    adapter = HTTPAdapter(pool_connections=pool_size,
+                          pool_maxsize=pool_size,
+                          max_retries=app.config.get('REQUEST_SESSION_RETRIES', 0))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def get_session(service: str) -> requests.Session:
+    """
+    Returns the long-lived session to the given service, building it on first use.
+    The session keeps connections (and their TLS handshakes) alive across requests and is shared by all threads.
+    As it is shared across users, it never stores cookies set by the service.
+    :param service: Name of the downstream service, e.g: METADATA_SERVICE
+    :return:
+    """
+    session_key = (service,
+                   app.config.get('MTLS_CLIENT_CERT'),
+                   app.config.get('MTLS_CLIENT_KEY'),
+                   app.config.get('REQUEST_SESSION_POOL_SIZE'),
+                   app.config.get('REQUEST_SESSION_RETRIES'))
+    session = _sessions.get(session_key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(session_key)
+            if session is None:
+                session = build_session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _sessions[session_key] = session
     return session
+
+
+def get_session_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Reports the utilization of the connection pools of the long-lived sessions, per service:
+    max_size: Maximum number of connections kept alive per host
+    in_use: Number of connections currently serving a request
+    connections: Number of connections opened since start, grows with handshakes that pooling did not avoid
+    requests: Number of requests sent since start
+    """
+    stats = {}  # type: Dict[str, Dict[str, int]]
+    with _sessions_lock:
+        sessions = list(_sessions.items())
+
+    for session_key, session in sessions:
+        service_stats = stats.setdefault(session_key[0],
+                                         {'max_size': 0, 'in_use': 0, 'connections': 0, 'requests': 0})
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)  # type: Optional[Any]
+                if pool is None or pool.pool is None:
+                    continue
+                service_stats['max_size'] += pool.pool.maxsize
+                service_stats['in_use'] += pool.pool.maxsize - pool.pool.qsize()
+                service_stats['connections'] += pool.num_connections
+                service_stats['requests'] += pool.num_requests
+    return stats
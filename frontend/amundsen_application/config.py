@@ -54,6 +54,13 @@ class Config:
     # Request Timeout Configurations in Seconds
     REQUEST_SESSION_TIMEOUT_SEC = 3
 
+    # Reuse long-lived sessions, with keep-alive connection pools, for requests to metadata and search services
+    REQUEST_SESSION_POOLING = True  # type: bool
+    # Maximum number of connections kept alive per service, should cover the number of concurrent requests per process
+    REQUEST_SESSION_POOL_SIZE = 10  # type: int
+    # Number of retries of failed connection attempts. Requests that reached a service are never retried
+    REQUEST_SESSION_RETRIES = 0  # type: int
+
     # Frontend Application
     FRONTEND_BASE = ''
 
@@ -192,6 +192,46 @@ describe('searchResource', () => {
     });
   });
 
+  describe('searchAllResources', () => {
+    it('calls axios post once with request for all supported resources', async () => {
+      axiosMockGet.mockClear();
+      axiosMockPost.mockClear();
+      dashboardEnabledMock.mockImplementationOnce(() => true);
+      const pageIndices = { [ResourceType.table]: 1 };
+      const term = 'test';
+      const filters = { [ResourceType.table]: { schema: 'schema_name' } };
+      const searchType = SearchType.SUBMIT_TERM;
+      await API.searchAllResources(pageIndices, term, filters, searchType);
+      expect(axiosMockGet).not.toHaveBeenCalled();
+      expect(axiosMockPost).toHaveBeenCalledTimes(1);
+      expect(axiosMockPost).toHaveBeenCalledWith(`${API.BASE_URL}/multi`, {
+        filters,
+        pageIndices,
+        resources: [
+          ResourceType.table,
+          ResourceType.user,
+          ResourceType.dashboard,
+        ],
+        term,
+        searchType,
+      });
+    });
+
+    it('does not search users without search term', async () => {
+      axiosMockPost.mockClear();
+      await API.searchAllResources({}, '', {}, SearchType.FILTER);
+      expect(axiosMockPost.mock.calls[0][1].resources).not.toContain(
+        ResourceType.user
+      );
+    });
+
+    it('calls searchResourceHelper with api call response', async () => {
+      const searchResourceHelperSpy = jest.spyOn(API, 'searchResourceHelper');
+      await API.searchAllResources({}, 'test', {}, SearchType.FILTER);
+      expect(searchResourceHelperSpy).toHaveBeenCalledWith(mockSearchResponse);
+    });
+  });
+
   describe('searchResourceHelper', () => {
     it('returns expected object', () => {
       expect(API.searchResourceHelper(mockSearchResponse)).toEqual({
@@ -14,7 +14,10 @@ import {
   UserSearchResults,
 } from '../types';
 
-import { ResourceFilterReducerState } from '../filters/reducer';
+import {
+  FilterReducerState,
+  ResourceFilterReducerState,
+} from '../filters/reducer';
 
 export const BASE_URL = '/api/search/v0';
 
@@ -90,3 +93,35 @@ export function searchResource(
     )
     .then(searchResourceHelper);
 }
+
+/**
+ * Searches all the configured resource types with a single request, rather than a request per resource type
+ */
+export function searchAllResources(
+  pageIndices: { [resource: string]: number },
+  term: string,
+  filters: FilterReducerState = {},
+  searchType: SearchType
+) {
+  const resources = [
+    ResourceType.table,
+    ResourceType.user,
+    ResourceType.dashboard,
+    ResourceType.feature,
+  ].filter((resource) => {
+    if (resource === ResourceType.user) {
+      return indexUsersEnabled() && term.length > 0;
+    }
+    return isResourceIndexed(resource);
+  });
+
+  return axios
+    .post(`${BASE_URL}/multi`, {
+      filters,
+      pageIndices,
+      resources,
+      term,
+      searchType,
+    })
+    .then(searchResourceHelper);
+}
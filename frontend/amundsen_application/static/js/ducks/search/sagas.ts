@@ -247,58 +247,22 @@ export function* searchAllWorker(action: SearchAllRequest): SagaIterator {
   }
 
   const state = yield select(getSearchState);
-  const tableIndex = resource === ResourceType.table ? pageIndex : 0;
-  const userIndex = resource === ResourceType.user ? pageIndex : 0;
-  const dashboardIndex = resource === ResourceType.dashboard ? pageIndex : 0;
-  const featureIndex = resource === ResourceType.feature ? pageIndex : 0;
 
   try {
-    const [
-      tableResponse,
-      userResponse,
-      dashboardResponse,
-      featureResponse,
-    ] = yield all([
-      call(
-        API.searchResource,
-        tableIndex,
-        ResourceType.table,
-        term,
-        state.filters[ResourceType.table],
-        searchType
-      ),
-      call(
-        API.searchResource,
-        userIndex,
-        ResourceType.user,
-        term,
-        state.filters[ResourceType.user],
-        searchType
-      ),
-      call(
-        API.searchResource,
-        dashboardIndex,
-        ResourceType.dashboard,
-        term,
-        state.filters[ResourceType.dashboard],
-        searchType
-      ),
-      call(
-        API.searchResource,
-        featureIndex,
-        ResourceType.feature,
-        term,
-        state.filters[ResourceType.feature],
-        searchType
-      ),
-    ]);
+    const response = yield call(
+      API.searchAllResources,
+      resource === undefined ? {} : { [resource]: pageIndex },
+      term,
+      state.filters,
+      searchType
+    );
     const searchAllResponse = {
       resource,
       search_term: term,
-      tables: tableResponse.tables || initialState.tables,
-      users: userResponse.users || initialState.users,
-      dashboards: dashboardResponse.dashboards || initialState.dashboards,
-      features: featureResponse.features || initialState.features,
+      tables: response.tables || initialState.tables,
+      users: response.users || initialState.users,
+      dashboards: response.dashboards || initialState.dashboards,
+      features: response.features || initialState.features,
       isLoading: false,
     };
     if (resource === undefined) {
@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch
 
 from amundsen_application import create_app
 from amundsen_application.api.search.v0 import SEARCH_DASHBOARD_ENDPOINT, SEARCH_DASHBOARD_FILTER_ENDPOINT, \
-    SEARCH_TABLE_ENDPOINT, SEARCH_TABLE_FILTER_ENDPOINT, SEARCH_USER_ENDPOINT
+    SEARCH_MULTI_ENDPOINT, SEARCH_TABLE_ENDPOINT, SEARCH_TABLE_FILTER_ENDPOINT, SEARCH_USER_ENDPOINT
 
 local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
 
@@ -562,3 +562,77 @@ class SearchDashboard(unittest.TestCase):
             data = json.loads(response.data)
             self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
             self.assertEqual(data.get('msg'), 'Encountered error: Search request failed')
+
+
+class SearchMulti(unittest.TestCase):
+    def setUp(self) -> None:
+        self.search_service_url = local_app.config['SEARCHSERVICE_BASE'] + SEARCH_MULTI_ENDPOINT
+        self.fe_flask_endpoint = '/api/search/v0/multi'
+
+    def test_fail_if_term_is_none(self) -> None:
+        """
+        Test request failure if 'term' is not provided in the request json
+        :return:
+        """
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json={'resources': ['table']})
+            self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def test_fail_if_unknown_resource(self) -> None:
+        """
+        Test request failure if 'resources' contains an unknown resource type
+        :return:
+        """
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json={'term': 'hello', 'resources': ['unknown']})
+            self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    @responses.activate
+    def test_request_success(self) -> None:
+        """
+        Test that all resource types are searched with a single request to the search service, and that the
+        response contains the results of each resource type like their own search endpoint
+        :return:
+        """
+        responses.add(responses.POST,
+                      self.search_service_url,
+                      json={'results': {'table': MOCK_TABLE_RESULTS,
+                                        'dashboard': {'total_results': 0, 'results': []}}},
+                      status=HTTPStatus.OK)
+
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint,
+                                 json={'term': 'hello',
+                                       'resources': ['table', 'dashboard'],
+                                       'pageIndices': {'table': 1},
+                                       'filters': {'dashboard': {'product': {'mode': True}}}})
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(data.get('tables'), {'page_index': 1,
+                                                  'results': MOCK_PARSED_TABLE_RESULTS,
+                                                  'total_results': 1})
+            self.assertEqual(data.get('dashboards'), {'page_index': 0, 'results': [], 'total_results': 0})
+            self.assertNotIn('users', data)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(json.loads(responses.calls[0].request.body), {
+            'query_term': 'hello',
+            'resources': ['table', 'dashboard'],
+            'search_requests': {'dashboard': {'type': 'AND', 'filters': {'product': ['mode']}}},
+            'page_indices': {'table': 1, 'dashboard': 0},
+        })
+
+    @responses.activate
+    def test_request_fail(self) -> None:
+        """
+        Test that the response contains the failure status code from the search service on failure
+        :return:
+        """
+        responses.add(responses.POST, self.search_service_url, json={}, status=HTTPStatus.BAD_REQUEST)
+
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json={'term': 'hello'})
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+            self.assertEqual(data.get('msg'), 'Encountered error: Search request failed')
+            self.assertEqual(data.get('users'), {'page_index': 0, 'results': [], 'total_results': 0})
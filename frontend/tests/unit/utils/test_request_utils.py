@@ -0,0 +1,69 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import patch
+
+import responses
+from flask import current_app
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import request_utils
+from amundsen_application.api.utils.request_utils import (
+    METADATA_SERVICE, SEARCH_SERVICE, get_session, get_session_pool_stats,
+    request_metadata, request_wrapper)
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class RequestUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app_context = local_app.app_context()
+        self.app_context.push()
+        request_utils._sessions.clear()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_get_session_reuses_session_per_service(self) -> None:
+        metadata_session = get_session(METADATA_SERVICE)
+        self.assertIs(get_session(METADATA_SERVICE), metadata_session)
+        self.assertIsNot(get_session(SEARCH_SERVICE), metadata_session)
+
+    def test_get_session_configures_pool(self) -> None:
+        with patch.dict(current_app.config, {'REQUEST_SESSION_POOL_SIZE': 3,
+                                             'REQUEST_SESSION_RETRIES': 2,
+                                             'MTLS_CLIENT_CERT': 'cert.pem',
+                                             'MTLS_CLIENT_KEY': 'key.pem'}):
+            session = get_session(METADATA_SERVICE)
+            adapter = session.get_adapter('https://metadata')
+            self.assertEqual(adapter._pool_maxsize, 3)
+            self.assertEqual(adapter.max_retries.total, 2)
+            self.assertEqual(session.cert, ('cert.pem', 'key.pem'))
+
+    @responses.activate
+    def test_request_metadata_uses_pooled_session(self) -> None:
+        responses.add(responses.GET, 'http://metadata/table', json={}, status=200)
+        with patch.object(request_utils, 'build_session', wraps=request_utils.build_session) as mock_build:
+            request_metadata(url='http://metadata/table')
+            request_metadata(url='http://metadata/table')
+            self.assertEqual(mock_build.call_count, 1)
+
+    @responses.activate
+    def test_request_wrapper_without_pooling(self) -> None:
+        responses.add(responses.GET, 'http://metadata/table', json={}, status=200)
+        with patch.dict(current_app.config, {'REQUEST_SESSION_POOLING': False}), \
+                patch.object(request_utils, 'build_session', wraps=request_utils.build_session) as mock_build:
+            request_wrapper(method='GET', url='http://metadata/table', client=None, headers={}, timeout_sec=0,
+                            service=METADATA_SERVICE)
+            request_wrapper(method='GET', url='http://metadata/table', client=None, headers={}, timeout_sec=0,
+                            service=METADATA_SERVICE)
+            self.assertEqual(mock_build.call_count, 2)
+
+    def test_get_session_pool_stats(self) -> None:
+        session = get_session(METADATA_SERVICE)
+        session.get_adapter('http://metadata').poolmanager.connection_from_url('http://metadata')
+
+        stats = get_session_pool_stats()
+        self.assertEqual(stats[METADATA_SERVICE],
+                         {'max_size': 10, 'in_use': 0, 'connections': 0, 'requests': 0})
@@ -7,10 +7,11 @@ from typing import Any, Iterable, Mapping, Optional, Union
 
 from amundsen_common.entity.resource_type import ResourceType
 from amundsen_common.models.lineage import LineageSchema
+from amundsen_common.models.popular_table import PopularTableSchema
 from amundsen_common.models.table import TableSchema
 from flasgger import swag_from
 from flask import request
-from flask_restful import Resource, reqparse
+from flask_restful import Resource, inputs, reqparse
 
 from metadata_service.api import BaseAPI
 from metadata_service.api.badge import BadgeCommon
@@ -39,6 +40,27 @@ class TableDetailAPI(Resource):
             return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
+class TableBatchDetailAPI(Resource):
+    """
+    TableBatchDetail API, fetching several tables with one request
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('table_uris', type=str, action='append', required=True, location='json')
+        self.parser.add_argument('summary', type=inputs.boolean, required=False, default=False, location='json')
+        super(TableBatchDetailAPI, self).__init__()
+
+    @swag_from('swagger_doc/table/detail_batch_post.yml')
+    def post(self) -> Iterable[Union[Mapping, int, None]]:
+        args = self.parser.parse_args()
+        tables = self.client.get_tables(table_uris=args['table_uris'])
+
+        schema = PopularTableSchema() if args['summary'] else TableSchema()
+        return {'tables': {table.key: schema.dump(table) for table in tables}}, HTTPStatus.OK
+
+
 class TableLineageAPI(Resource):
     def __init__(self) -> None:
         self.client = get_proxy_client()
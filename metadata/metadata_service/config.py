@@ -3,7 +3,8 @@
 
 import distutils.util
 import os
-from typing import Any, Callable, Dict, List, Optional, Set  # noqa: F401
+from typing import (TYPE_CHECKING, Any, Callable, Dict, List,  # noqa: F401
+                    Optional, Set)
 
 import boto3
 from amundsen_gremlin.config import LocalGremlinConfig
@@ -11,6 +12,10 @@ from flask import Flask  # noqa: F401
 
 from metadata_service.entity.badge import Badge
 
+if TYPE_CHECKING:
+    from metadata_service.proxy.proxy_cache import \
+        ProxyCacheBackend  # noqa: F401
+
 # PROXY configuration keys
 PROXY_HOST = 'PROXY_HOST'
 PROXY_PORT = 'PROXY_PORT'
@@ -34,6 +39,8 @@ PROXY_CLIS = {
 
 IS_STATSD_ON = 'IS_STATSD_ON'
 USER_OTHER_KEYS = 'USER_OTHER_KEYS'
+NEO4J_CONCURRENT_TABLE_QUERIES = 'NEO4J_CONCURRENT_TABLE_QUERIES'
+PROXY_CACHE = 'PROXY_CACHE'
 
 
 class Config:
@@ -70,6 +77,19 @@ class Config:
 
     USER_DETAIL_METHOD = None   # type: Optional[function]
 
+    # Optional batched variant of USER_DETAIL_METHOD: takes a list of user ids and returns a dict of user details
+    # keyed by user id. When set, it is preferred over USER_DETAIL_METHOD where several users are looked up at once.
+    USER_DETAIL_BATCH_METHOD = None   # type: Optional[function]
+
+    # If True, Neo4jProxy.get_table runs its column, usage, table and query level queries concurrently,
+    # each on its own session from the driver's connection pool, instead of one after another.
+    NEO4J_CONCURRENT_TABLE_QUERIES = False
+
+    # Read-through cache of proxy reads (table, dashboard, user, tags and badges), invalidated by proxy writes.
+    # An instance of metadata_service.proxy.proxy_cache.ProxyCacheBackend, e.g. InMemoryLRUCache(ttl_sec=300),
+    # or BeakerCache(cache_options={'cache.type': 'ext:memcached', ...}) to share it across processes.
+    PROXY_CACHE = None  # type: Optional[ProxyCacheBackend]
+
     RESOURCE_REPORT_CLIENT = None  # type: Optional[function]
 
     # On User detail method, these keys will be added into amundsen_common.models.user.User.other_key_values
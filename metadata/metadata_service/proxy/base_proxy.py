@@ -18,14 +18,23 @@ from flask import current_app as app
 from metadata_service.entity.dashboard_detail import \
     DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.proxy_cache import wrap_proxy_class
 from metadata_service.util import UserResourceRel
 
 
 class BaseProxy(metaclass=ABCMeta):
     """
     Base Proxy, which behaves like an interface for all
-    the proxy clients available in the amundsen metadata service
+    the proxy clients available in the amundsen metadata service.
+
+    Reads and writes listed in metadata_service.proxy.proxy_cache are wrapped in every subclass, so that reads are
+    served from config.PROXY_CACHE when it is configured and invalidated by writes.
     """
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        wrap_proxy_class(cls)
+
     def _get_user_details(self, user_id: str, user_data: Optional[Dict] = None) -> Dict:
         """
         Helper function to help get the user details if the `USER_DETAIL_METHOD` is configured,
@@ -42,6 +51,24 @@ class BaseProxy(metaclass=ABCMeta):
 
         return user_details
 
+    def _get_users_details(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Batched version of _get_user_details. If `USER_DETAIL_BATCH_METHOD` is configured, it is called once with
+        all the distinct user ids, else each distinct user id is looked up with _get_user_details.
+        :param user_ids: The Unique user ids of user entities, possibly with duplicates
+        :return: a dictionary of user details keyed by user id
+        """
+        distinct_user_ids = list(dict.fromkeys(user_ids))
+        if not distinct_user_ids:
+            return {}
+
+        if app.config.get('USER_DETAIL_BATCH_METHOD'):
+            users_details = app.config.get('USER_DETAIL_BATCH_METHOD')(distinct_user_ids)  # type: ignore
+            return {user_id: users_details.get(user_id) or {'email': user_id, 'user_id': user_id}
+                    for user_id in distinct_user_ids}
+
+        return {user_id: self._get_user_details(user_id) for user_id in distinct_user_ids}
+
     def health(self) -> HealthCheck:
         return HealthCheck(status='ok', checks={f'{type(self).__name__}:connection': {'status': 'not checked'}})
 
@@ -69,6 +96,23 @@ class BaseProxy(metaclass=ABCMeta):
     def get_table(self, *, table_uri: str) -> Table:
         pass
 
+    def get_tables(self, *, table_uris: List[str]) -> List[Table]:
+        """
+        Retrieve the details of several tables at once. Proxies override this default, which calls get_table for
+        each table, with a bulk fetch.
+        :param table_uris: Table URIs
+        :return: Tables, with their key set, in the order of table_uris. Tables that do not exist are left out
+        """
+        tables = []
+        for table_uri in dict.fromkeys(table_uris):
+            try:
+                table = self.get_table(table_uri=table_uri)
+            except NotFoundException:
+                continue
+            table.key = table_uri
+            tables.append(table)
+        return tables
+
     @abstractmethod
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
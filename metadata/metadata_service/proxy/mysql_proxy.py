@@ -59,7 +59,8 @@ from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
 from flask import current_app as app
 from sqlalchemy import func
-from sqlalchemy.orm import Session, load_only, subqueryload
+from sqlalchemy.orm import (Session, joinedload, load_only, selectinload,
+                            subqueryload)
 
 from metadata_service.client.rds_client import RDSClient
 from metadata_service.entity.dashboard_detail import \
@@ -91,6 +92,27 @@ resource_relation_model = {
     }
 }
 
+# Loads everything _make_table_metadata reads along with the table: to-one relationships are joined into the table
+# query and each collection is fetched by one more query, so that the number of queries does not depend on the table.
+_TABLE_METADATA_LOAD_OPTIONS = [
+    joinedload(RDSTable.schema).joinedload(RDSSchema.cluster).joinedload(RDSCluster.database),
+    joinedload(RDSTable.application),
+    joinedload(RDSTable.description),
+    joinedload(RDSTable.timestamp),
+    joinedload(RDSTable.source),
+    selectinload(RDSTable.watermarks),
+    selectinload(RDSTable.tags),
+    selectinload(RDSTable.badges),
+    selectinload(RDSTable.owners),
+    selectinload(RDSTable.programmatic_descriptions),
+]
+
+_COLUMN_LOAD_OPTIONS = [
+    selectinload(RDSColumn.description),
+    selectinload(RDSColumn.stats),
+    selectinload(RDSColumn.badges),
+]
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -216,30 +238,83 @@ class MySQLProxy(BaseProxy):
             # usage
             readers = self._get_table_readers(session=session, table_uri=table_uri)
 
-        table_result = Table(database=table['database'].name,
-                             cluster=table['cluster'].name,
-                             schema=table['schema'].name,
-                             name=table['table'].name,
-                             tags=table['tags'],
-                             badges=table['badges'],
-                             description=table['description'].description if table['description'] else None,
-                             columns=cols,
-                             owners=table['owners'],
-                             table_readers=readers,
-                             watermarks=table['watermarks'],
-                             table_writer=table['table_writer'],
-                             last_updated_timestamp=table['last_updated_timestamp'],
-                             source=table['source'],
-                             is_view=table['table'].is_view,
-                             programmatic_descriptions=table['programmatic_descriptions'])
-        return table_result
+        return self._make_table(table=table, cols=cols, readers=readers)
+
+    @timer_with_counter
+    def get_tables(self, *, table_uris: List[str]) -> List[Table]:
+        """
+        Batched version of get_table, fetching tables, columns and readers with one IN query each.
+        :param table_uris: Table URIs
+        :return: Tables, with their key set, in the order of table_uris. Tables that do not exist are left out
+        """
+        table_uris = list(dict.fromkeys(table_uris))
+        if not table_uris:
+            return []
+
+        with self.client.create_session() as session:
+            # table
+            query = session.query(RDSTable).filter(RDSTable.rk.in_(table_uris))
+            query = query.options(*_TABLE_METADATA_LOAD_OPTIONS)
+            tables = {table.rk: self._make_table_metadata(table=table) for table in query.all()}
+            table_uris = [table_uri for table_uri in table_uris if table_uri in tables]
+            if not table_uris:
+                return []
+
+            # columns
+            query = session.query(RDSColumn).filter(RDSColumn.table_rk.in_(table_uris))
+            query = query.options(*_COLUMN_LOAD_OPTIONS)
+            cols = {}  # type: Dict[str, List[Column]]
+            for column in query.all():
+                cols.setdefault(column.table_rk, []).append(self._make_column(column=column))
+
+            # usage, keeping the first 5 readers of each table like _get_table_readers
+            readers = {}  # type: Dict[str, List[Reader]]
+            for reader in session.query(RDSTableUsage).filter(
+                    RDSTableUsage.table_rk.in_(table_uris)
+            ).order_by(RDSTableUsage.read_count).all():
+                table_readers = readers.setdefault(reader.table_rk, [])
+                if len(table_readers) < 5:
+                    table_readers.append(self._make_reader(reader=reader))
+
+        return [self._make_table(table=tables[table_uri],
+                                 cols=cols.get(table_uri, []),
+                                 readers=readers.get(table_uri, []),
+                                 key=table_uri)
+                for table_uri in table_uris]
+
+    def _make_table(self, *,
+                    table: Dict[str, Any],
+                    cols: List[Column],
+                    readers: List[Reader],
+                    key: Optional[str] = None) -> Table:
+        return Table(database=table['database'].name,
+                     cluster=table['cluster'].name,
+                     schema=table['schema'].name,
+                     name=table['table'].name,
+                     key=key,
+                     tags=table['tags'],
+                     badges=table['badges'],
+                     description=table['description'].description if table['description'] else None,
+                     columns=cols,
+                     owners=table['owners'],
+                     table_readers=readers,
+                     watermarks=table['watermarks'],
+                     table_writer=table['table_writer'],
+                     last_updated_timestamp=table['last_updated_timestamp'],
+                     source=table['source'],
+                     is_view=table['table'].is_view,
+                     programmatic_descriptions=table['programmatic_descriptions'])
 
     @timer_with_counter
     def _get_table_metadata(self, *, session: Session, table_uri: str) -> Optional[Dict[str, Any]]:
-        table = session.query(RDSTable).filter(RDSTable.rk == table_uri).first()
+        query = session.query(RDSTable).filter(RDSTable.rk == table_uri)
+        table = query.options(*_TABLE_METADATA_LOAD_OPTIONS).first()
         if not table:
             return None
 
+        return self._make_table_metadata(table=table)
+
+    def _make_table_metadata(self, *, table: RDSTable) -> Dict[str, Any]:
         schema = table.schema
         cluster = schema.cluster
         database = cluster.database
@@ -326,42 +401,37 @@ class MySQLProxy(BaseProxy):
         query = session.query(RDSColumn).filter(RDSColumn.table_rk == table_uri)
 
         # description, stats, badges
-        query = query.options(
-            subqueryload(RDSColumn.description),
-            subqueryload(RDSColumn.stats),
-            subqueryload(RDSColumn.badges)
-        )
+        query = query.options(*_COLUMN_LOAD_OPTIONS)
 
         columns = query.all()
 
-        col_results = []
-        for column in columns:
-            col_stat_results = []
-            for stat in column.stats:
-                col_stat_result = Stat(
-                    stat_type=stat.stat_type,
-                    stat_val=stat.stat_val,
-                    start_epoch=int(float(stat.start_epoch)),
-                    end_epoch=int(float(stat.end_epoch))
-                )
-                col_stat_results.append(col_stat_result)
+        return [self._make_column(column=column) for column in columns]
 
-            col_badge_results = []
-            for badge in column.badges:
-                col_badge_results.append(
-                    TableBadge(badge_name=badge.rk, category=badge.category)
-                )
+    def _make_column(self, *, column: RDSColumn) -> Column:
+        col_stat_results = []
+        for stat in column.stats:
+            col_stat_result = Stat(
+                stat_type=stat.stat_type,
+                stat_val=stat.stat_val,
+                start_epoch=int(float(stat.start_epoch)),
+                end_epoch=int(float(stat.end_epoch))
+            )
+            col_stat_results.append(col_stat_result)
 
-            col_result = Column(name=column.name,
-                                description=column.description.description
-                                if column.description else None,
-                                col_type=column.type,
-                                sort_order=int(column.sort_order),
-                                stats=col_stat_results,
-                                badges=col_badge_results)
-            col_results.append(col_result)
+        col_badge_results = []
+        for badge in column.badges:
+            col_badge_results.append(
+                TableBadge(badge_name=badge.rk, category=badge.category)
+            )
 
-        return col_results
+        col_result = Column(name=column.name,
+                            description=column.description.description
+                            if column.description else None,
+                            col_type=column.type,
+                            sort_order=int(column.sort_order),
+                            stats=col_stat_results,
+                            badges=col_badge_results)
+        return col_result
 
     @timer_with_counter
     def _get_table_readers(self, *, session: Session, table_uri: str) -> List[Reader]:
@@ -369,13 +439,11 @@ class MySQLProxy(BaseProxy):
             RDSTableUsage.table_rk == table_uri
         ).order_by(RDSTableUsage.read_count).limit(5).all()
 
-        reader_results = []
-        for reader in readers:
-            reader_result = Reader(user=User(email=reader.user_rk),
-                                   read_count=reader.read_count)
-            reader_results.append(reader_result)
+        return [self._make_reader(reader=reader) for reader in readers]
 
-        return reader_results
+    def _make_reader(self, *, reader: RDSTableUsage) -> Reader:
+        return Reader(user=User(email=reader.user_rk),
+                      read_count=reader.read_count)
 
     @timer_with_counter
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
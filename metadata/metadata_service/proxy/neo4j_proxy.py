@@ -4,9 +4,11 @@
 import logging
 import textwrap
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from random import randint
-from typing import (Any, Dict, Iterable, List, Optional, Tuple,  # noqa: F401
-                    Union, no_type_check)
+from threading import Lock
+from typing import (Any, Callable, Dict, Iterable, List,  # noqa: F401
+                    Optional, Tuple, Union, no_type_check)
 
 import neo4j
 import neobolt
@@ -87,6 +89,21 @@ class Neo4jProxy(BaseProxy):
                                             auth=(user, password),
                                             encrypted=encrypted,
                                             trust=trust)  # type: Driver
+        # Used to run independent queries of a request concurrently, see config.NEO4J_CONCURRENT_TABLE_QUERIES.
+        # Created on first use so that proxies without concurrent queries don't hold any threads.
+        self._num_conns = num_conns
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+        self._executor_lock = Lock()
+
+    def close(self) -> None:
+        """
+        Shuts down the thread pool of concurrent queries, if any, and closes the neo4j driver
+        """
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._driver.close()
 
     def health(self) -> health_check.HealthCheck:
         """
@@ -115,20 +132,99 @@ class Neo4jProxy(BaseProxy):
         :param table_uri: Table URI
         :return:  A Table object
         """
+        if has_app_context() and current_app.config.get(config.NEO4J_CONCURRENT_TABLE_QUERIES):
+            col_future = self._submit(self._exec_col_query, table_uri)
+            usage_future = self._submit(self._exec_usage_query, table_uri)
+            table_future = self._submit(self._exec_table_query, table_uri)
+            table_query_future = self._submit(self._exec_table_query_query, table_uri)
+
+            cols, last_neo4j_record = col_future.result()
+            usage_records = usage_future.result()
+            table_records = table_future.result()
+            joins, filters = table_query_future.result()
+        else:
+            cols, last_neo4j_record = self._exec_col_query(table_uri)
+
+            usage_records = self._exec_usage_query(table_uri)
+
+            table_records = self._exec_table_query(table_uri)
+
+            joins, filters = self._exec_table_query_query(table_uri)
 
-        cols, last_neo4j_record = self._exec_col_query(table_uri)
+        # Readers and owners are looked up with one batched call
+        owner_emails = table_records[3]
+        users_details = self._get_users_details([email for email, _ in usage_records] + owner_emails)
 
-        readers = self._exec_usage_query(table_uri)
+        return self._make_table(cols=cols,
+                                last_neo4j_record=last_neo4j_record,
+                                usage_records=usage_records,
+                                table_records=table_records,
+                                joins=joins,
+                                filters=filters,
+                                users_details=users_details)
 
-        wmk_results, table_writer, timestamp_value, owners, tags, source, badges, prog_descs, resource_reports = \
-            self._exec_table_query(table_uri)
+    @timer_with_counter
+    def get_tables(self, *, table_uris: List[str]) -> List[Table]:
+        """
+        Batched version of get_table. Each part of the table details is fetched with one query covering all the
+        tables, and readers and owners of all the tables are looked up with one batched call.
+        :param table_uris: Table URIs
+        :return: Tables, with their key set, in the order of table_uris. Tables that do not exist are left out
+        """
+        table_uris = list(dict.fromkeys(table_uris))
+        if not table_uris:
+            return []
+
+        col_records = self._exec_col_batch_query(table_uris)
+        table_uris = [table_uri for table_uri in table_uris if table_uri in col_records]
+        if not table_uris:
+            return []
 
-        joins, filters = self._exec_table_query_query(table_uri)
+        usage_records = self._exec_usage_batch_query(table_uris)
+        table_records = self._exec_table_batch_query(table_uris)
+        query_records = self._exec_table_query_batch_query(table_uris)
+
+        user_ids = []  # type: List[str]
+        for table_uri in table_uris:
+            user_ids.extend(email for email, _ in usage_records.get(table_uri, []))
+            user_ids.extend(table_records[table_uri][3])
+        users_details = self._get_users_details(user_ids)
+
+        tables = []
+        for table_uri in table_uris:
+            cols, last_neo4j_record = col_records[table_uri]
+            joins, filters = query_records.get(table_uri, ([], []))
+            tables.append(self._make_table(cols=cols,
+                                           last_neo4j_record=last_neo4j_record,
+                                           usage_records=usage_records.get(table_uri, []),
+                                           table_records=table_records[table_uri],
+                                           joins=joins,
+                                           filters=filters,
+                                           users_details=users_details,
+                                           key=table_uri))
+        return tables
+
+    def _make_table(self, *,
+                    cols: List[Column],
+                    last_neo4j_record: Any,
+                    usage_records: List[Tuple[str, int]],
+                    table_records: Tuple,
+                    joins: List,
+                    filters: List,
+                    users_details: Dict[str, Dict],
+                    key: Optional[str] = None) -> Table:
+        wmk_results, table_writer, timestamp_value, owner_emails, tags, source, badges, prog_descs, \
+            resource_reports = table_records
+
+        readers = [Reader(user=self._build_user_from_record(record=users_details[email]), read_count=read_count)
+                   for email, read_count in usage_records]
+        owners = [self._build_user_from_record(record=users_details[email]) for email in owner_emails]
 
         table = Table(database=last_neo4j_record['db']['name'],
                       cluster=last_neo4j_record['clstr']['name'],
                       schema=last_neo4j_record['schema']['name'],
                       name=last_neo4j_record['tbl']['name'],
+                      key=key,
                       tags=tags,
                       badges=badges,
                       description=self._safe_get(last_neo4j_record, 'tbl_dscrpt', 'description'),
@@ -165,6 +261,40 @@ class Neo4jProxy(BaseProxy):
 
         tbl_col_neo4j_records = self._execute_cypher_query(
             statement=column_level_query, param_dict={'tbl_key': table_uri})
+        cols, last_neo4j_record = self._make_columns(tbl_col_neo4j_records)
+
+        if not cols:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        return cols, last_neo4j_record
+
+    @timer_with_counter
+    def _exec_col_batch_query(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        # Return Value: (Columns, Last Processed Record) keyed by table uri, for tables that exist
+
+        column_level_query = textwrap.dedent("""
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
+        -[:TABLE]->(tbl:Table {key: tbl_key})-[:COLUMN]->(col:Column)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:DESCRIPTION]->(col_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:STAT]->(stat:Stat)
+        OPTIONAL MATCH (col:Column)-[:HAS_BADGE]->(badge:Badge)
+        RETURN tbl_key, db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, collect(distinct stat) as col_stats,
+        collect(distinct badge) as col_badges
+        ORDER BY tbl_key, col.sort_order;""")
+
+        tbl_col_neo4j_records = self._execute_cypher_query(
+            statement=column_level_query, param_dict={'tbl_keys': table_uris})
+
+        records_by_table = {}  # type: Dict[str, List]
+        for tbl_col_neo4j_record in tbl_col_neo4j_records:
+            records_by_table.setdefault(tbl_col_neo4j_record['tbl_key'], []).append(tbl_col_neo4j_record)
+
+        return {table_uri: self._make_columns(records) for table_uri, records in records_by_table.items()}
+
+    def _make_columns(self, tbl_col_neo4j_records: Iterable) -> Tuple:
+        # Return Value: (Columns, Last Processed Record)
         cols = []
         last_neo4j_record = None
         for tbl_col_neo4j_record in tbl_col_neo4j_records:
@@ -191,14 +321,29 @@ class Neo4jProxy(BaseProxy):
 
             cols.append(col)
 
-        if not cols:
-            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
-
         return sorted(cols, key=lambda item: item.sort_order), last_neo4j_record
 
+    def _submit(self, fn: Callable[[str], Any], table_uri: str) -> Future:
+        """
+        Runs the query method on the proxy's thread pool, within the current app context
+        :param fn: Query method taking the table uri
+        :param table_uri:
+        :return: Future of the query method's result
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def run() -> Any:
+            with app.app_context():
+                return fn(table_uri)
+
+        with self._executor_lock:
+            if not self._executor:
+                self._executor = ThreadPoolExecutor(max_workers=self._num_conns)
+            return self._executor.submit(run)
+
     @timer_with_counter
-    def _exec_usage_query(self, table_uri: str) -> List[Reader]:
-        # Return Value: List[Reader]
+    def _exec_usage_query(self, table_uri: str) -> List[Tuple[str, int]]:
+        # Return Value: List[Tuple[reader email, read count]]
 
         usage_query = textwrap.dedent("""\
         MATCH (user:User)-[read:READ]->(table:Table {key: $tbl_key})
@@ -208,14 +353,27 @@ class Neo4jProxy(BaseProxy):
 
         usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
                                                          param_dict={'tbl_key': table_uri})
-        readers = []  # type: List[Reader]
-        for usage_neo4j_record in usage_neo4j_records:
-            reader_data = self._get_user_details(user_id=usage_neo4j_record['email'])
-            reader = Reader(user=self._build_user_from_record(record=reader_data),
-                            read_count=usage_neo4j_record['read_count'])
-            readers.append(reader)
+        return [(usage_neo4j_record['email'], usage_neo4j_record['read_count'])
+                for usage_neo4j_record in usage_neo4j_records]
+
+    @timer_with_counter
+    def _exec_usage_batch_query(self, table_uris: List[str]) -> Dict[str, List[Tuple[str, int]]]:
+        # Return Value: List[Tuple[reader email, read count]] keyed by table uri, for tables that have readers
 
-        return readers
+        usage_query = textwrap.dedent("""\
+        MATCH (user:User)-[read:READ]->(table:Table)
+        WHERE table.key IN $tbl_keys
+        WITH table, user, read
+        ORDER BY read.read_count DESC
+        WITH table, collect({email: user.email, read_count: read.read_count})[..5] as readers
+        RETURN table.key as tbl_key, readers
+        """)
+
+        usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
+                                                         param_dict={'tbl_keys': table_uris})
+        return {usage_neo4j_record['tbl_key']: [(reader['email'], reader['read_count'])
+                                                for reader in usage_neo4j_record['readers']]
+                for usage_neo4j_record in usage_neo4j_records}
 
     @timer_with_counter
     def _exec_table_query(self, table_uri: str) -> Tuple:
@@ -224,7 +382,7 @@ class Neo4jProxy(BaseProxy):
         ,timestamp, owner records and tag records.
         """
 
-        # Return Value: (Watermark Results, Table Writer, Last Updated Timestamp, owner records, tag records)
+        # Return Value: (Watermark Results, Table Writer, Last Updated Timestamp, owner emails, tag records)
 
         table_level_query = textwrap.dedent("""\
         MATCH (tbl:Table {key: $tbl_key})
@@ -252,7 +410,50 @@ class Neo4jProxy(BaseProxy):
                                                    param_dict={'tbl_key': table_uri,
                                                                'tag_normal_type': 'default'})
 
-        table_records = table_records.single()
+        return self._make_table_details(table_records.single())
+
+    @timer_with_counter
+    def _exec_table_batch_query(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        """
+        Batched version of _exec_table_query, keyed by table uri.
+        """
+        table_level_query = textwrap.dedent("""\
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (tbl:Table {key: tbl_key})
+        OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
+        OPTIONAL MATCH (application:Application)-[:GENERATES]->(tbl)
+        OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
+        OPTIONAL MATCH (owner:User)<-[:OWNER]-(tbl)
+        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag{tag_type: $tag_normal_type})
+        OPTIONAL MATCH (tbl)-[:HAS_BADGE]->(badge:Badge)
+        OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description)
+        OPTIONAL MATCH (tbl)-[:HAS_REPORT]->(resource_reports:Report)
+        RETURN tbl_key,
+        collect(distinct wmk) as wmk_records,
+        application,
+        t.last_updated_timestamp as last_updated_timestamp,
+        collect(distinct owner) as owner_records,
+        collect(distinct tag) as tag_records,
+        collect(distinct badge) as badge_records,
+        src,
+        collect(distinct prog_descriptions) as prog_descriptions,
+        collect(distinct resource_reports) as resource_reports
+        """)
+
+        table_records = self._execute_cypher_query(statement=table_level_query,
+                                                   param_dict={'tbl_keys': table_uris,
+                                                               'tag_normal_type': 'default'})
+
+        table_details = {}  # type: Dict[str, Tuple]
+        for table_record in table_records:
+            # Like single() in _exec_table_query, keeps the first record of each table
+            if table_record['tbl_key'] not in table_details:
+                table_details[table_record['tbl_key']] = self._make_table_details(table_record)
+        return table_details
+
+    def _make_table_details(self, table_records: Any) -> Tuple:
+        # Return Value: (Watermark Results, Table Writer, Last Updated Timestamp, owner emails, tag records, ...)
 
         wmk_results = []
         table_writer = None
@@ -290,11 +491,7 @@ class Neo4jProxy(BaseProxy):
 
         timestamp_value = table_records['last_updated_timestamp']
 
-        owner_record = []
-
-        for owner in table_records.get('owner_records', []):
-            owner_data = self._get_user_details(user_id=owner['email'])
-            owner_record.append(self._build_user_from_record(record=owner_data))
+        owner_emails = [owner['email'] for owner in table_records.get('owner_records', [])]
 
         src = None
 
@@ -308,7 +505,7 @@ class Neo4jProxy(BaseProxy):
 
         resource_reports = self._extract_resource_reports_from_query(table_records.get('resource_reports', []))
 
-        return wmk_results, table_writer, timestamp_value, owner_record, tags, src, badges, prog_descriptions, \
+        return wmk_results, table_writer, timestamp_value, owner_emails, tags, src, badges, prog_descriptions, \
             resource_reports
 
     @timer_with_counter
@@ -373,8 +570,70 @@ class Neo4jProxy(BaseProxy):
 
         query_records = self._execute_cypher_query(statement=table_query_level_query, param_dict={'tbl_key': table_uri})
 
-        table_query_records = query_records.single()
+        return self._make_joins_and_filters(query_records.single())
+
+    @timer_with_counter
+    def _exec_table_query_batch_query(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        """
+        Batched version of _exec_table_query_query, keyed by table uri. The top 5 joins and filters are kept per
+        table by slicing the ordered collections, as LIMIT would apply across all the tables. Like in
+        _exec_table_query_query, the same join or filter reached through several paths is only collected once.
+        """
+        table_query_level_query = textwrap.dedent("""
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (tbl:Table {key: tbl_key})
+        OPTIONAL MATCH (tbl)-[:COLUMN]->(col:Column)-[COLUMN_JOINS_WITH]->(j:Join)
+        OPTIONAL MATCH (j)-[JOIN_OF_COLUMN]->(col2:Column)
+        OPTIONAL MATCH (j)-[JOIN_OF_QUERY]->(jq:Query)-[:HAS_EXECUTION]->(exec:Execution)
+        WITH tbl, j, col, col2,
+            sum(coalesce(exec.execution_count, 0)) as join_exec_cnt
+        ORDER BY join_exec_cnt desc
+        WITH tbl,
+            COLLECT(DISTINCT {
+            join: {
+                joined_on_table: {
+                    database: case when j.left_table_key = tbl.key
+                              then j.right_database
+                              else j.left_database
+                              end,
+                    cluster: case when j.left_table_key = tbl.key
+                             then j.right_cluster
+                             else j.left_cluster
+                             end,
+                    schema: case when j.left_table_key = tbl.key
+                            then j.right_schema
+                            else j.left_schema
+                            end,
+                    name: case when j.left_table_key = tbl.key
+                          then j.right_table
+                          else j.left_table
+                          end
+                },
+                joined_on_column: col2.name,
+                column: col.name,
+                join_type: j.join_type,
+                join_sql: j.join_sql
+            },
+            join_exec_cnt: join_exec_cnt
+        })[..5] as joins
+        OPTIONAL MATCH (tbl)-[:COLUMN]->(col:Column)-[USES_WHERE_CLAUSE]->(whr:Where)
+        OPTIONAL MATCH (whr)-[WHERE_CLAUSE_OF]->(wq:Query)-[:HAS_EXECUTION]->(whrexec:Execution)
+        WITH tbl, joins,
+            whr, sum(coalesce(whrexec.execution_count, 0)) as where_exec_cnt
+        ORDER BY where_exec_cnt desc
+        RETURN tbl.key as tbl_key, joins,
+          COLLECT(DISTINCT {
+            where_clause: whr.where_clause,
+            where_exec_cnt: where_exec_cnt
+          })[..5] as filters
+        """)
+
+        query_records = self._execute_cypher_query(statement=table_query_level_query,
+                                                   param_dict={'tbl_keys': table_uris})
+
+        return {query_record['tbl_key']: self._make_joins_and_filters(query_record) for query_record in query_records}
 
+    def _make_joins_and_filters(self, table_query_records: Any) -> Tuple:
         joins = self._extract_joins_from_query(table_query_records.get('joins', [{}]))
         filters = self._extract_filters_from_query(table_query_records.get('filters', [{}]))
 
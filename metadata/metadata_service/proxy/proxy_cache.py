@@ -0,0 +1,253 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import functools
+import inspect
+import logging
+import time
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple  # noqa: F401
+
+from amundsen_common.entity.resource_type import ResourceType
+from beaker.cache import CacheManager
+from beaker.util import parse_cache_config_options
+from flask import current_app, has_app_context
+
+from metadata_service import config
+
+LOGGER = logging.getLogger(__name__)
+
+# Returned by ProxyCacheBackend.get when the key is not cached
+MISS = object()
+
+
+class ProxyCacheBackend(metaclass=ABCMeta):
+    """
+    Key value store used by the proxy read-through cache. Configure an instance in config.PROXY_CACHE to enable it.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """
+        :param key:
+        :return: Cached value, or MISS if key is not cached or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+class InMemoryLRUCache(ProxyCacheBackend):
+    """
+    In-process cache holding at most max_size entries, each expiring ttl_sec after it was set.
+    Entries are not shared across processes, so writes served by another process are only visible after expiry.
+    """
+
+    def __init__(self, *, max_size: int = 10000, ttl_sec: int = 600) -> None:
+        self._max_size = max_size
+        self._ttl_sec = ttl_sec
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[float, Any]]
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+
+            expire_at, value = entry
+            if expire_at < time.monotonic():
+                del self._entries[key]
+                return MISS
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_sec, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+class BeakerCache(ProxyCacheBackend):
+    """
+    Cache backed by beaker, which can be shared across processes and hosts, e.g:
+    {'cache.type': 'ext:memcached', 'cache.url': 'memcached:11211'} or {'cache.type': 'ext:redis', ...}.
+    For local development, {'cache.type': 'file', 'cache.data_dir': ..., 'cache.lock_dir': ...} stands in for a
+    shared cache between the processes of a host.
+    """
+
+    def __init__(self, *, cache_options: Dict[str, Any], ttl_sec: int = 600) -> None:
+        cache_manager = CacheManager(**parse_cache_config_options(cache_options))
+        self._cache = cache_manager.get_cache('metadata_proxy', expire=ttl_sec)
+
+    def get(self, key: str) -> Any:
+        try:
+            return self._cache.get(key)
+        except KeyError:
+            return MISS
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.put(key, value)
+
+
+def _bind_arguments(signature: inspect.Signature, self: Any, args: Tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    :return: Arguments of a proxy method call by parameter name, whether they were passed by position or keyword
+    """
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    for name, parameter in signature.parameters.items():
+        if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+            arguments.update(arguments.pop(name, {}))
+    return arguments
+
+
+def _entity_id(arguments: Dict[str, Any], names: Tuple[str, ...]) -> str:
+    """
+    Proxies are not consistent in argument names (e.g. get_dashboard takes either id or dashboard_uri),
+    so the entity id is the first argument found in names.
+    """
+    for name in names:
+        if name in arguments:
+            return str(arguments[name])
+    return ''
+
+
+def _resource_entity(arguments: Dict[str, Any], *names: str) -> Tuple[str, str]:
+    resource_type = arguments.get('resource_type') or ResourceType.Table
+    return resource_type.name.lower(), _entity_id(arguments, names)
+
+
+def _badge_entities(arguments: Dict[str, Any]) -> List[Tuple[str, str]]:
+    entities = [_resource_entity(arguments, 'id'), ('badges', '')]
+    if arguments.get('resource_type') == ResourceType.Column:
+        # Column badges are read along with their table, e.g. db://cluster.schema/table/column
+        entities.append(('table', str(arguments['id']).rsplit('/', 1)[0]))
+    return entities
+
+
+def _user_entities(arguments: Dict[str, Any]) -> List[Tuple[str, str]]:
+    user = arguments['user']
+    return [('user', str(user.user_id)), ('user', str(user.email))]
+
+
+# Cached read method -> (entity type, names of the argument identifying the entity)
+CACHED_READS = {
+    'get_table': ('table', ('table_uri',)),
+    'get_dashboard': ('dashboard', ('id', 'dashboard_uri')),
+    'get_user': ('user', ('id',)),
+    'get_tags': ('tags', ()),
+    'get_badges': ('badges', ()),
+}  # type: Dict[str, Tuple[str, Tuple[str, ...]]]
+
+# Write method -> function of its arguments by parameter name returning the entities whose cached reads become stale
+INVALIDATING_WRITES = {
+    'put_table_description': lambda arguments: [('table', arguments['table_uri'])],
+    'put_column_description': lambda arguments: [('table', arguments['table_uri'])],
+    'add_owner': lambda arguments: [('table', arguments['table_uri'])],
+    'delete_owner': lambda arguments: [('table', arguments['table_uri'])],
+    'add_tag': lambda arguments: [_resource_entity(arguments, 'id'), ('tags', '')],
+    'delete_tag': lambda arguments: [_resource_entity(arguments, 'id'), ('tags', '')],
+    'add_badge': _badge_entities,
+    'delete_badge': _badge_entities,
+    'put_dashboard_description': lambda arguments: [('dashboard', arguments['id'])],
+    'put_resource_description': lambda arguments: [_resource_entity(arguments, 'uri')],
+    'add_resource_owner': lambda arguments: [_resource_entity(arguments, 'uri')],
+    'delete_resource_owner': lambda arguments: [_resource_entity(arguments, 'uri')],
+    'add_resource_relation_by_user': lambda arguments: [_resource_entity(arguments, 'id')],
+    'delete_resource_relation_by_user': lambda arguments: [_resource_entity(arguments, 'id')],
+    'create_update_user': _user_entities,
+}  # type: Dict[str, Callable[[Dict[str, Any]], List[Tuple[str, str]]]]
+
+
+def get_proxy_cache() -> Optional[ProxyCacheBackend]:
+    if not has_app_context():
+        return None
+    return current_app.config.get(config.PROXY_CACHE)
+
+
+def _generation_key(entity_type: str, entity_id: str) -> str:
+    return f'metadata_proxy:{entity_type}:{entity_id}:generation'
+
+
+def cached_read(method: Callable, name: str, entity_type: str, arg_names: Tuple[str, ...]) -> Callable:
+    """
+    Wraps a proxy read method so that its result is served from config.PROXY_CACHE when enabled.
+    Cache keys embed the entity's generation, which writes replace, so that a read racing with a write can never
+    store a result that outlives the write.
+    Callers get a copy of the cached value, as they may modify it (e.g. BaseProxy.get_tables sets the key of tables).
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        cache = get_proxy_cache()
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        try:
+            arguments = _bind_arguments(signature, self, args, kwargs)
+        except TypeError:
+            # Let the method raise for invalid arguments
+            return method(self, *args, **kwargs)
+
+        entity_id = _entity_id(arguments, arg_names)
+        generation = cache.get(_generation_key(entity_type, entity_id))
+        key = f'metadata_proxy:{entity_type}:{entity_id}:{name}:{"" if generation is MISS else generation}'
+
+        value = cache.get(key)
+        if value is MISS:
+            value = method(self, *args, **kwargs)
+            cache.set(key, value)
+        return copy.deepcopy(value)
+
+    wrapper.__proxy_cache_wrapped__ = True  # type: ignore
+    return wrapper
+
+
+def invalidating_write(method: Callable,
+                       name: str,
+                       get_entities: Callable[[Dict[str, Any]], List[Tuple[str, str]]]) -> Callable:
+    """
+    Wraps a proxy write method so that cached reads of the entities it modifies are invalidated once it succeeds.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+
+        cache = get_proxy_cache()
+        if cache is not None:
+            for entity_type, entity_id in get_entities(_bind_arguments(signature, self, args, kwargs)):
+                LOGGER.debug(f'Invalidating cached reads of {entity_type} {entity_id} after {name}')
+                cache.set(_generation_key(entity_type, str(entity_id)), uuid.uuid4().hex)
+        return result
+
+    wrapper.__proxy_cache_wrapped__ = True  # type: ignore
+    return wrapper
+
+
+def wrap_proxy_class(proxy_class: type) -> None:
+    """
+    Wraps the cached reads and invalidating writes that the proxy class defines. Called for every BaseProxy subclass.
+    """
+    for name, (entity_type, arg_names) in CACHED_READS.items():
+        method = proxy_class.__dict__.get(name)
+        if callable(method) and not getattr(method, '__proxy_cache_wrapped__', False):
+            setattr(proxy_class, name, cached_read(method, name, entity_type, arg_names))
+
+    for name, get_entities in INVALIDATING_WRITES.items():
+        method = proxy_class.__dict__.get(name)
+        if callable(method) and not getattr(method, '__proxy_cache_wrapped__', False):
+            setattr(proxy_class, name, invalidating_write(method, name, get_entities))
@@ -0,0 +1,51 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+
+from amundsen_common.models.table import Table
+
+from tests.unit.api.table.table_test_case import TableTestCase
+
+TABLE_URI = 'hive://gold.hogwarts/wizards'
+
+
+class TestTableBatchDetailAPI(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_proxy.get_tables.return_value = [
+            Table(database='hive', cluster='gold', schema='hogwarts', name='wizards', key=TABLE_URI,
+                  description='all wizards at hogwarts', columns=[])
+        ]
+
+    def test_should_get_table_details(self) -> None:
+        response = self.app.test_client().post('/tables', json={'table_uris': [TABLE_URI, 'hive://gold.x/y']})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.get_json()
+        assert data is not None
+        self.assertEqual(list(data['tables']), [TABLE_URI])
+        self.assertEqual(data['tables'][TABLE_URI]['name'], 'wizards')
+        self.assertEqual(data['tables'][TABLE_URI]['columns'], [])
+        self.mock_proxy.get_tables.assert_called_with(table_uris=[TABLE_URI, 'hive://gold.x/y'])
+
+    def test_should_get_table_summaries(self) -> None:
+        response = self.app.test_client().post('/tables', json={'table_uris': [TABLE_URI], 'summary': True})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.get_json()
+        assert data is not None
+        self.assertEqual(data['tables'], {
+            TABLE_URI: {
+                'database': 'hive',
+                'cluster': 'gold',
+                'schema': 'hogwarts',
+                'name': 'wizards',
+                'description': 'all wizards at hogwarts'
+            }
+        })
+
+    def test_should_fail_without_table_uris(self) -> None:
+        response = self.app.test_client().post('/tables', json={})
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
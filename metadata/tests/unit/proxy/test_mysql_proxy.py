@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import unittest
-from typing import Any
+from typing import Any, List  # noqa: F401
 from unittest.mock import MagicMock, patch
 
 from amundsen_common.entity.resource_type import ResourceType
@@ -15,7 +15,10 @@ from amundsen_common.models.table import (Application, Badge, Column,
                                           Tag, User, Watermark)
 from amundsen_common.models.user import User as UserEntity
 from amundsen_rds.models.application import Application as RDSApplication
+from amundsen_rds.models.application import \
+    ApplicationTable as RDSApplicationTable
 from amundsen_rds.models.badge import Badge as RDSBadge
+from amundsen_rds.models.base import Base
 from amundsen_rds.models.cluster import Cluster as RDSCluster
 from amundsen_rds.models.column import \
     ColumnDescription as RDSColumnDescription
@@ -46,6 +49,8 @@ from amundsen_rds.models.table import TableUsage as RDSTableUsage
 from amundsen_rds.models.table import TableWatermark as RDSTableWatermark
 from amundsen_rds.models.tag import Tag as RDSTag
 from amundsen_rds.models.user import User as RDSUser
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 
 from metadata_service import create_app
 from metadata_service.entity.dashboard_detail import DashboardDetail
@@ -128,7 +133,6 @@ class TestMySQLProxy(unittest.TestCase):
 
         mock_session_query_filter = MagicMock()
         mock_session_query.filter.return_value = mock_session_query_filter
-        mock_session_query_filter.first.return_value = table
 
         mock_session_query_filter_orderby = MagicMock()
         mock_session_query_filter.order_by.return_value = mock_session_query_filter_orderby
@@ -139,6 +143,7 @@ class TestMySQLProxy(unittest.TestCase):
 
         mock_session_query_filter_options = MagicMock()
         mock_session_query_filter.options.return_value = mock_session_query_filter_options
+        mock_session_query_filter_options.first.return_value = table
         mock_session_query_filter_options.all.return_value = columns
 
         proxy = MySQLProxy()
@@ -186,6 +191,49 @@ class TestMySQLProxy(unittest.TestCase):
 
         self.assertEqual(str(expected), str(actual_table))
 
+    @patch.object(mysql_proxy, 'RDSClient')
+    def test_get_tables(self, mock_rds_client: Any) -> None:
+        schema = RDSSchema(name='foo_schema')
+        schema.cluster = RDSCluster(name='gold')
+        schema.cluster.database = RDSDatabase(name='hive')
+
+        tables = []
+        for name in ['foo_table', 'bar_table']:
+            table = RDSTable(rk=f'hive://gold.foo_schema/{name}', name=name, is_view=False)
+            table.schema = schema
+            tables.append(table)
+
+        columns = [RDSColumn(table_rk='hive://gold.foo_schema/bar_table', name='bar_id', type='bigint', sort_order=0)]
+        readers = [RDSTableUsage(table_rk='hive://gold.foo_schema/foo_table', user_rk=f'tester{i}@example.com',
+                                 read_count=i)
+                   for i in range(6)]
+
+        mock_client = MagicMock()
+        mock_rds_client.return_value = mock_client
+
+        mock_session = MagicMock()
+        mock_client.create_session.return_value.__enter__.return_value = mock_session
+
+        mock_session_query_filter = mock_session.query.return_value.filter.return_value
+        mock_session_query_filter.options.return_value.all.side_effect = [tables, columns]
+        mock_session_query_filter.order_by.return_value.all.return_value = readers
+
+        proxy = MySQLProxy()
+        actual_tables = proxy.get_tables(table_uris=['hive://gold.foo_schema/bar_table',
+                                                     'hive://gold.foo_schema/missing_table',
+                                                     'hive://gold.foo_schema/foo_table'])
+
+        self.assertEqual([table.key for table in actual_tables], ['hive://gold.foo_schema/bar_table',
+                                                                  'hive://gold.foo_schema/foo_table'])
+        self.assertEqual(actual_tables[0].columns, [Column(name='bar_id', description=None, col_type='bigint',
+                                                           sort_order=0, stats=[], badges=[])])
+        self.assertEqual(actual_tables[0].table_readers, [])
+        self.assertEqual(actual_tables[1].columns, [])
+        self.assertEqual(actual_tables[1].table_readers,
+                         [Reader(user=User(email=f'tester{i}@example.com'), read_count=i) for i in range(5)])
+        # tables, columns and readers
+        self.assertEqual(mock_session.query.call_count, 3)
+
     @patch.object(mysql_proxy, 'RDSClient')
     def test_health_mysql(self, mock_rds_client: Any) -> None:
         proxy = MySQLProxy()
@@ -1030,5 +1078,130 @@ class TestMySQLProxy(unittest.TestCase):
         self.assertEqual(1, mock_session_commit.call_count)
 
 
+class TestMySQLProxyStatementCount(unittest.TestCase):
+    """
+    Runs MySQLProxy against an in-memory SQLite database to count the statements issued
+    """
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.MySQLConfig')
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.proxy = MySQLProxy(client_kwargs={'poolclass': StaticPool,
+                                               'connect_args': {'check_same_thread': False}})
+        engine = self.proxy.client.engine
+
+        @event.listens_for(engine, 'connect')
+        def create_collation(dbapi_connection: Any, connection_record: Any) -> None:
+            # Collation of amundsen_rds keys, which SQLite does not define
+            dbapi_connection.create_collation('latin1_general_cs', lambda a, b: (a > b) - (a < b))
+
+        # The pooled connection was opened by the schema version check, before the listener existed
+        engine.dispose()
+        Base.metadata.create_all(engine)
+
+        self.statements = []  # type: List[str]
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def count_statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            self.statements.append(statement)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def _add_table(self, name: str, size: int) -> None:
+        """
+        Adds a table having size of every relationship that get_table reads
+        """
+        table_uri = f'hive://gold.foo_schema/{name}'
+        table = RDSTable(rk=table_uri, name=name, is_view=False, schema_rk='hive://gold.foo_schema')
+        table.description = RDSTableDescription(rk=f'{table_uri}/_description', description_source='description',
+                                                description='foo description')
+        # application_table has a published tag, so it is added as a record rather than through table.application
+        application = RDSApplication(rk=f'application://{name}', application_url='airflow_host', name='Airflow',
+                                     id='dag/task_id', description='DAG generating a table')
+        application_table = RDSApplicationTable(rk=table_uri, application_rk=application.rk)
+        table.timestamp = RDSTableTimestamp(rk=f'{table_uri}/_timestamp', last_updated_timestamp=1, timestamp=1,
+                                            name='last_updated_timestamp')
+        table.source = RDSTableSource(rk=f'{table_uri}/_source', source_type='github', source='/source_file_loc')
+        table.watermarks = [RDSTableWatermark(rk=f'{table_uri}/high_watermark_{i}/', partition_key='ds',
+                                              partition_value='fake_value', create_time='fake_time')
+                            for i in range(size)]
+        table.tags = [RDSTag(rk=f'{name}_tag_{i}', tag_type='default') for i in range(size)]
+        table.badges = [RDSBadge(rk=f'{name}_badge_{i}', category='table_status') for i in range(size)]
+        table.owners = [RDSUser(rk=f'{name}_owner_{i}@example.com', email=f'{name}_owner_{i}@example.com')
+                        for i in range(size)]
+        table.programmatic_descriptions = [
+            RDSTableProgrammaticDescription(rk=f'{table_uri}/_s3_crawler_{i}', description_source=f's3_crawler_{i}',
+                                            description='Test Test Test')
+            for i in range(size)
+        ]
+        table.columns = []
+        for i in range(size):
+            column = RDSColumn(rk=f'{table_uri}/col_{i}', name=f'col_{i}', type='bigint', sort_order=i)
+            column.description = RDSColumnDescription(rk=f'{table_uri}/col_{i}/_description',
+                                                      description_source='description', description='col description')
+            column.stats = [RDSColumnStat(rk=f'{table_uri}/col_{i}/avg', stat_type='avg', start_epoch='1',
+                                          end_epoch='1', stat_val='1')]
+            column.badges = [RDSBadge(rk=f'{name}_col_{i}_badge', category='column')]
+            table.columns.append(column)
+        readers = [RDSTableUsage(table_rk=table_uri, user_rk=f'{name}_owner_{i}@example.com', read_count=i)
+                   for i in range(size)]
+
+        with self.proxy.client.create_session() as session:
+            with session.no_autoflush:
+                session.merge(RDSDatabase(rk='hive', name='hive'))
+                session.merge(RDSCluster(rk='hive://gold', name='gold', database_rk='hive'))
+                session.merge(RDSSchema(rk='hive://gold.foo_schema', name='foo_schema', cluster_rk='hive://gold'))
+                session.add(table)
+                session.add_all([application, application_table] + readers)
+                for record in session.new:
+                    record.published_tag = 'unit_test'
+                    record.publisher_last_updated_epoch_ms = 0
+            session.commit()
+
+    def _count_statements(self, get: Any) -> int:
+        self.statements.clear()
+        get()
+        return len(self.statements)
+
+    def test_get_table(self) -> None:
+        self._add_table('small_table', size=1)
+        self._add_table('large_table', size=10)
+
+        small_count = self._count_statements(
+            lambda: self.proxy.get_table(table_uri='hive://gold.foo_schema/small_table'))
+        large_count = self._count_statements(
+            lambda: self.proxy.get_table(table_uri='hive://gold.foo_schema/large_table'))
+
+        # table with its to-one relationships, its 5 collections, columns with their 3 collections and readers
+        self.assertEqual(small_count, 11)
+        self.assertEqual(large_count, small_count)
+
+        table = self.proxy.get_table(table_uri='hive://gold.foo_schema/large_table')
+        self.assertEqual((table.database, table.cluster, table.schema), ('hive', 'gold', 'foo_schema'))
+        self.assertEqual(table.description, 'foo description')
+        self.assertEqual(table.table_writer.name, 'Airflow')
+        self.assertEqual(table.last_updated_timestamp, 1)
+        self.assertEqual(table.source, Source(source_type='github', source='/source_file_loc'))
+        self.assertEqual((len(table.watermarks), len(table.tags), len(table.badges), len(table.owners),
+                          len(table.programmatic_descriptions)), (10, 10, 10, 10, 10))
+        self.assertEqual(len(table.columns), 10)
+        self.assertEqual(table.columns[0].stats, [Stat(stat_type='avg', stat_val='1', start_epoch=1, end_epoch=1)])
+        self.assertEqual(table.columns[0].badges, [Badge(badge_name='large_table_col_0_badge', category='column')])
+        self.assertEqual(len(table.table_readers), 5)
+
+    def test_get_tables(self) -> None:
+        self._add_table('small_table', size=1)
+        self._add_table('large_table', size=10)
+
+        count = self._count_statements(lambda: self.proxy.get_tables(
+            table_uris=['hive://gold.foo_schema/small_table', 'hive://gold.foo_schema/large_table']))
+
+        self.assertEqual(count, 11)
+
+
 if __name__ == '__main__':
     unittest.main()
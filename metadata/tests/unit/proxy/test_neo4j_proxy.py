@@ -16,7 +16,7 @@ from amundsen_common.models.generation_code import GenerationCode
 from amundsen_common.models.lineage import Lineage, LineageItem
 from amundsen_common.models.popular_table import PopularTable
 from amundsen_common.models.table import (Application, Badge, Column,
-                                          ProgrammaticDescription,
+                                          ProgrammaticDescription, Reader,
                                           ResourceReport, Source, SqlJoin,
                                           SqlWhere, Stat, Table, TableSummary,
                                           Tag, User, Watermark)
@@ -231,6 +231,8 @@ class TestNeo4jProxy(unittest.TestCase):
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             table = neo4j_proxy.get_table(table_uri='dummy_uri')
+            # Sequential queries don't need the thread pool
+            self.assertIsNone(neo4j_proxy._executor)
 
             expected = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
                              tags=[Tag(tag_name='test', tag_type='default')],
@@ -296,6 +298,96 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(str(expected), str(table))
 
+    def test_get_table_concurrent_queries_with_batched_users(self) -> None:
+        def execute(statement: str, param_dict: Dict) -> Any:
+            if 'col_stats' in statement:
+                return self.col_usage_return_value
+            if 'read_count' in statement:
+                return [{'email': 'reader@example.com', 'read_count': 3},
+                        {'email': 'tester@example.com', 'read_count': 1}]
+            if 'wmk_records' in statement:
+                return self.table_level_return_value
+            return self.table_common_usage
+
+        user_detail_batch_method = MagicMock(return_value={
+            'reader@example.com': {'email': 'reader@example.com', 'user_id': 'reader', 'full_name': 'Reader'},
+        })
+        self.app.config['NEO4J_CONCURRENT_TABLE_QUERIES'] = True
+        self.app.config['USER_DETAIL_BATCH_METHOD'] = user_detail_batch_method
+        try:
+            with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                    patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+                mock_execute.side_effect = execute
+
+                neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+                self.assertIsNone(neo4j_proxy._executor)
+                table = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+                executor = neo4j_proxy._executor
+                self.assertIsNotNone(executor)
+                neo4j_proxy.close()
+                self.assertIsNone(neo4j_proxy._executor)
+                self.assertTrue(executor._shutdown)  # type: ignore
+                mock_driver.return_value.close.assert_called_once_with()
+        finally:
+            self.app.config['NEO4J_CONCURRENT_TABLE_QUERIES'] = False
+            self.app.config['USER_DETAIL_BATCH_METHOD'] = None
+
+        self.assertEqual(mock_execute.call_count, 4)
+        user_detail_batch_method.assert_called_once_with(['reader@example.com', 'tester@example.com'])
+
+        self.assertEqual(table.name, 'foo_table')
+        self.assertEqual([col.name for col in table.columns], ['bar_id_1', 'bar_id_2'])
+        self.assertEqual(table.table_readers,
+                         [Reader(user=UserModel(email='reader@example.com', user_id='reader', full_name='Reader'),
+                                 read_count=3),
+                          Reader(user=UserModel(email='tester@example.com', user_id='tester@example.com'),
+                                 read_count=1)])
+        self.assertEqual(table.owners, [User(email='tester@example.com', user_id='tester@example.com')])
+        self.assertEqual(table.common_filters, [SqlWhere(where_clause='b.countnewestcases <= 15')])
+
+    def test_get_tables(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [
+                self.col_usage_return_value,
+                [],
+                self.table_level_return_value,
+                self.table_common_usage
+            ]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            expected = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            mock_execute.reset_mock()
+            mock_execute.side_effect = [
+                [dict(col, tbl_key='dummy_uri') for col in self.col_usage_return_value],
+                [{'tbl_key': 'dummy_uri', 'readers': [{'email': 'reader@example.com', 'read_count': 3}]}],
+                [dict(self.table_level_return_value.single.return_value, tbl_key='dummy_uri')],
+                [dict(self.table_common_usage.single.return_value, tbl_key='dummy_uri')]
+            ]
+            tables = neo4j_proxy.get_tables(table_uris=['dummy_uri', 'missing_uri', 'dummy_uri'])
+
+        self.assertEqual(mock_execute.call_count, 4)
+        self.assertEqual(mock_execute.call_args_list[0][1]['param_dict'], {'tbl_keys': ['dummy_uri', 'missing_uri']})
+        for call in mock_execute.call_args_list[1:]:
+            self.assertEqual(call[1]['param_dict']['tbl_keys'], ['dummy_uri'])
+        # joins and filters reached through several paths are collected once, before keeping the top 5
+        self.assertIn('COLLECT(DISTINCT {', mock_execute.call_args_list[3][1]['statement'])
+        self.assertNotIn('COLLECT({', mock_execute.call_args_list[3][1]['statement'])
+
+        expected.key = 'dummy_uri'
+        expected.table_readers = [Reader(user=User(email='reader@example.com', user_id='reader@example.com'),
+                                         read_count=3)]
+        self.assertEqual(len(tables), 1)
+        self.assertEqual(str(expected), str(tables[0]))
+
+    def test_get_tables_not_found(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertEqual(neo4j_proxy.get_tables(table_uris=['missing_uri']), [])
+            self.assertEqual(mock_execute.call_count, 1)
+
     def test_get_table_view_only(self) -> None:
         col_usage_return_value = copy.deepcopy(self.col_usage_return_value)
         for col in col_usage_return_value:
@@ -0,0 +1,196 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from amundsen_common.entity.resource_type import ResourceType
+from amundsen_common.models.table import Table
+from neo4j import GraphDatabase
+
+from metadata_service import create_app
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.proxy_cache import (MISS, BeakerCache,
+                                                InMemoryLRUCache)
+
+
+class TestInMemoryLRUCache(unittest.TestCase):
+
+    def test_get_set(self) -> None:
+        cache = InMemoryLRUCache()
+        self.assertIs(cache.get('foo'), MISS)
+
+        cache.set('foo', None)
+        self.assertIsNone(cache.get('foo'))
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = InMemoryLRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIs(cache.get('b'), MISS)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_expires(self) -> None:
+        cache = InMemoryLRUCache(ttl_sec=10)
+        with patch('metadata_service.proxy.proxy_cache.time') as mock_time:
+            mock_time.monotonic.return_value = 100
+            cache.set('foo', 'bar')
+
+            mock_time.monotonic.return_value = 105
+            self.assertEqual(cache.get('foo'), 'bar')
+
+            mock_time.monotonic.return_value = 111
+            self.assertIs(cache.get('foo'), MISS)
+
+
+class TestBeakerCache(unittest.TestCase):
+
+    def test_get_set(self) -> None:
+        cache = BeakerCache(cache_options={'cache.type': 'memory'})
+        self.assertIs(cache.get('foo'), MISS)
+
+        cache.set('foo', {'bar': 1})
+        self.assertEqual(cache.get('foo'), {'bar': 1})
+
+
+class TestProxyCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_disabled_by_default(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            neo4j_proxy.get_tags()
+            neo4j_proxy.get_tags()
+            self.assertEqual(mock_execute.call_count, 2)
+
+    def test_read_through_and_invalidation(self) -> None:
+        self.app.config['PROXY_CACHE'] = InMemoryLRUCache()
+        with patch.object(GraphDatabase, 'driver'), \
+                patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute, \
+                patch.object(Neo4jProxy, 'put_resource_description'):
+            mock_execute.return_value = [{'tag_name': {'key': 'tag1'}, 'tag_count': 2}]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            first = neo4j_proxy.get_tags()
+            second = neo4j_proxy.get_tags()
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(first, second)
+
+            # a write to an unrelated entity leaves cached tags in place
+            neo4j_proxy.put_table_description(table_uri='dummy_uri', description='foo')
+            neo4j_proxy.get_tags()
+            self.assertEqual(mock_execute.call_count, 1)
+
+    def test_write_invalidates_entity(self) -> None:
+        self.app.config['PROXY_CACHE'] = InMemoryLRUCache()
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            with patch.object(Neo4jProxy, '_exec_col_query', return_value=([], MagicMock())) as mock_col_query, \
+                    patch.object(Neo4jProxy, '_exec_usage_query', return_value=[]), \
+                    patch.object(Neo4jProxy, '_exec_table_query',
+                                 return_value=([], None, None, [], [], None, [], [], [])), \
+                    patch.object(Neo4jProxy, '_exec_table_query_query', return_value=([], [])), \
+                    patch.object(Neo4jProxy, 'add_resource_owner'), \
+                    patch.object(Neo4jProxy, '_get_users_details', return_value={}), \
+                    patch('metadata_service.proxy.neo4j_proxy.Table'):
+                neo4j_proxy.get_table(table_uri='db://cluster.schema/table')
+                neo4j_proxy.get_table(table_uri='db://cluster.schema/table')
+                self.assertEqual(mock_col_query.call_count, 1)
+
+                neo4j_proxy.get_table(table_uri='db://cluster.schema/other')
+                self.assertEqual(mock_col_query.call_count, 2)
+
+                neo4j_proxy.add_owner(table_uri='db://cluster.schema/table', owner='foo')
+                neo4j_proxy.get_table(table_uri='db://cluster.schema/table')
+                neo4j_proxy.get_table(table_uri='db://cluster.schema/other')
+                self.assertEqual(mock_col_query.call_count, 3)
+
+    def test_positional_arguments(self) -> None:
+        self.app.config['PROXY_CACHE'] = InMemoryLRUCache()
+        with patch.object(GraphDatabase, 'driver'):
+            neo4j_proxy = PositionalArgumentsProxy(host='DOES_NOT_MATTER', port=0000)
+
+            neo4j_proxy.get_table('db://cluster.schema/table')
+            neo4j_proxy.get_table(table_uri='db://cluster.schema/table')
+            self.assertEqual(neo4j_proxy.get_table_calls, 1)
+
+            neo4j_proxy.put_table_description('db://cluster.schema/table', 'foo')
+            neo4j_proxy.get_table('db://cluster.schema/table')
+            self.assertEqual(neo4j_proxy.get_table_calls, 2)
+
+    def test_column_badge_invalidates_table(self) -> None:
+        self.app.config['PROXY_CACHE'] = InMemoryLRUCache()
+        with patch.object(GraphDatabase, 'driver'):
+            neo4j_proxy = PositionalArgumentsProxy(host='DOES_NOT_MATTER', port=0000)
+
+            neo4j_proxy.get_table('db://cluster.schema/table')
+            neo4j_proxy.add_badge(id='db://cluster.schema/table/col', badge_name='pii', category='column',
+                                  resource_type=ResourceType.Column)
+            neo4j_proxy.get_table('db://cluster.schema/table')
+            self.assertEqual(neo4j_proxy.get_table_calls, 2)
+
+            neo4j_proxy.delete_badge('db://cluster.schema/table/col', 'pii', 'column', ResourceType.Column)
+            neo4j_proxy.get_table('db://cluster.schema/table')
+            self.assertEqual(neo4j_proxy.get_table_calls, 3)
+
+    def test_returns_copies(self) -> None:
+        self.app.config['PROXY_CACHE'] = InMemoryLRUCache()
+        with patch.object(GraphDatabase, 'driver'):
+            neo4j_proxy = PositionalArgumentsProxy(host='DOES_NOT_MATTER', port=0000)
+
+            tables = neo4j_proxy.get_tables(table_uris=['db://cluster.schema/table'])
+            self.assertEqual(tables[0].key, 'db://cluster.schema/table')
+            tables[0].description = 'changed'
+
+            table = neo4j_proxy.get_table('db://cluster.schema/table')
+            self.assertIsNone(table.key)
+            self.assertEqual(table.description, 'foo')
+            self.assertEqual(neo4j_proxy.get_table_calls, 1)
+
+
+class PositionalArgumentsProxy(Neo4jProxy):
+    """
+    Proxy whose cached read and invalidating write take positional arguments
+    """
+
+    get_table_calls = 0
+
+    def get_table(self, table_uri: str) -> Table:  # type: ignore
+        self.get_table_calls += 1
+        return Table(database='db', cluster='cluster', schema='schema', name='table', columns=[],
+                     description='foo')
+
+    def get_tables(self, *, table_uris: List[str]) -> List[Table]:
+        return BaseProxy.get_tables(self, table_uris=table_uris)
+
+    def put_table_description(self, table_uri: str, description: str) -> None:  # type: ignore
+        pass
+
+    def add_badge(self, *, id: str, badge_name: str, category: str = '',
+                  resource_type: ResourceType = ResourceType.Table) -> None:
+        pass
+
+    def delete_badge(self, id: str, badge_name: str, category: str, resource_type: ResourceType) -> None:
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
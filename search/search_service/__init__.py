@@ -20,6 +20,9 @@ from search_service.api.document import (
 )
 from search_service.api.feature import SearchFeatureAPI, SearchFeatureFilterAPI
 from search_service.api.healthcheck import HealthcheckAPI
+from search_service.api.search import (
+    SearchCursorAPI, SearchExportAPI, SearchFieldsAPI, SearchMultiAPI, SearchSuggestAPI,
+)
 from search_service.api.table import SearchTableAPI, SearchTableFilterAPI
 from search_service.api.user import SearchUserAPI
 
@@ -105,6 +108,13 @@ def create_app(*, config_module_class: str) -> Flask:
     api.add_resource(SearchFeatureAPI, '/search_feature')
     api.add_resource(SearchFeatureFilterAPI, '/search_feature_filter')
 
+    # Search API of any resource type
+    api.add_resource(SearchCursorAPI, '/search_cursor')
+    api.add_resource(SearchExportAPI, '/search_export')
+    api.add_resource(SearchFieldsAPI, '/search_fields')
+    api.add_resource(SearchSuggestAPI, '/search_suggest')
+    api.add_resource(SearchMultiAPI, '/search_multi')
+
     # DocumentAPI
     # todo: needs to handle dashboard
     api.add_resource(DocumentTablesAPI, '/document_table')
@@ -6,7 +6,9 @@ from http import HTTPStatus
 from typing import Any, Iterable
 
 from flasgger import swag_from
-from flask_restful import Resource, reqparse  # noqa: I201
+from flask_restful import (  # noqa: I201
+    Resource, inputs, reqparse,
+)
 
 from search_service.api.base import BaseFilterAPI
 from search_service.exception import NotFoundException
@@ -31,6 +33,7 @@ class SearchDashboardAPI(Resource):
         self.parser.add_argument('query_term', required=True, type=str)
         self.parser.add_argument('page_index', required=False, default=0, type=int)
         self.parser.add_argument('index', required=False, default=DASHBOARD_INDEX, type=str)
+        self.parser.add_argument('lightweight', required=False, default=False, type=inputs.boolean)
 
         super(SearchDashboardAPI, self).__init__()
 
@@ -47,7 +50,8 @@ class SearchDashboardAPI(Resource):
             results = self.proxy.fetch_dashboard_search_results(
                 query_term=args.get('query_term'),
                 page_index=args['page_index'],
-                index=args['index']
+                index=args['index'],
+                lightweight=args.get('lightweight')
             )
 
             return SearchDashboardResultSchema().dump(results), HTTPStatus.OK
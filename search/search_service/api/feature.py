@@ -5,7 +5,9 @@ from http import HTTPStatus
 from typing import Any, Iterable
 
 from flasgger import swag_from
-from flask_restful import Resource, reqparse
+from flask_restful import (
+    Resource, inputs, reqparse,
+)
 
 from search_service.api.base import BaseFilterAPI
 from search_service.models.feature import SearchFeatureResultSchema
@@ -27,6 +29,7 @@ class SearchFeatureAPI(Resource):
         self.parser.add_argument('query_term', required=True, type=str)
         self.parser.add_argument('page_index', required=False, default=0, type=int)
         self.parser.add_argument('index', required=False, default=FEATURE_INDEX, type=str)
+        self.parser.add_argument('lightweight', required=False, default=False, type=inputs.boolean)
 
         super(SearchFeatureAPI, self).__init__()
 
@@ -43,7 +46,8 @@ class SearchFeatureAPI(Resource):
             results = self.proxy.fetch_feature_search_results(
                 query_term=args.get('query_term'),
                 page_index=args.get('page_index'),
-                index=args.get('index')
+                index=args.get('index'),
+                lightweight=args.get('lightweight')
             )
 
             return SearchFeatureResultSchema().dump(results), HTTPStatus.OK
@@ -0,0 +1,274 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from http import HTTPStatus
+from typing import (  # noqa: F401
+    Any, Dict, Iterable, Iterator, Tuple,
+)
+
+from flasgger import swag_from
+from flask import Response, stream_with_context
+from flask_restful import (
+    Resource, inputs, reqparse,
+)
+from marshmallow3_annotations.ext.attrs import AttrsSchema
+
+from search_service.api.dashboard import DASHBOARD_INDEX
+from search_service.api.feature import FEATURE_INDEX
+from search_service.api.table import TABLE_INDEX
+from search_service.api.user import USER_INDEX
+from search_service.models.dashboard import DashboardSchema
+from search_service.models.feature import FeatureSchema
+from search_service.models.table import TableSchema
+from search_service.models.user import UserSchema
+from search_service.proxy import get_proxy_client
+
+# Default index and schema of each resource type
+RESOURCES = {
+    'table': (TABLE_INDEX, TableSchema),
+    'user': (USER_INDEX, UserSchema),
+    'dashboard': (DASHBOARD_INDEX, DashboardSchema),
+    'feature': (FEATURE_INDEX, FeatureSchema),
+}  # type: Dict[str, Tuple[str, AttrsSchema]]
+
+# Resource types whose documents have a completion field to suggest them from
+SUGGEST_RESOURCES = ['table', 'user', 'dashboard']
+
+
+class BaseResourceSearchAPI(Resource):
+    """
+    Base API searching any resource type, given by the resource argument
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+
+        self.parser.add_argument('resource', required=True, type=str, choices=list(RESOURCES.keys()))
+        self.parser.add_argument('query_term', required=False, default='', type=str)
+        self.parser.add_argument('index', required=False, type=str)
+
+        super(BaseResourceSearchAPI, self).__init__()
+
+    @staticmethod
+    def get_index_and_schema(args: Dict[str, Any]) -> Tuple[str, AttrsSchema]:
+        index, schema = RESOURCES[args['resource']]
+        return args.get('index') or index, schema
+
+
+class SearchCursorAPI(BaseResourceSearchAPI):
+    """
+    Search API paginated with cursors, for clients going through many pages of results
+    """
+
+    def __init__(self) -> None:
+        super(SearchCursorAPI, self).__init__()
+
+        self.parser.add_argument('cursor', required=False, type=str)
+        self.parser.add_argument('page_size', required=False, type=int)
+
+    @swag_from('swagger_doc/search/search_cursor.yml')
+    def get(self) -> Iterable[Any]:
+        """
+        Fetch a page of search results based on query_term, following the cursor of the previous page if any.
+
+        :return: page of results, with the cursor of the next page. The cursor is null for the last page
+        """
+        args = self.parser.parse_args(strict=True)
+        index, schema = self.get_index_and_schema(args)
+
+        try:
+            results = self.proxy.fetch_search_results_with_cursor(
+                query_term=args['query_term'],
+                index=index,
+                cursor=args.get('cursor'),
+                page_size=args.get('page_size')
+            )
+
+            return {'total_results': results.total_results,
+                    'results': schema(many=True).dump(results.results),
+                    'cursor': results.cursor}, HTTPStatus.OK
+
+        except ValueError as e:
+            return {'message': str(e)}, HTTPStatus.BAD_REQUEST
+
+        except RuntimeError:
+
+            err_msg = 'Exception encountered while processing search request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class SearchFieldsAPI(Resource):
+    """
+    API fetching fields of search results on demand, e.g. heavy fields left out of lightweight search results
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+
+        self.parser.add_argument('resource', required=True, type=str, choices=list(RESOURCES.keys()))
+        self.parser.add_argument('id', required=True, type=str, action='append')
+        self.parser.add_argument('field', required=True, type=str, action='append')
+        self.parser.add_argument('index', required=False, type=str)
+
+        super(SearchFieldsAPI, self).__init__()
+
+    @swag_from('swagger_doc/search/search_fields.yml')
+    def get(self) -> Iterable[Any]:
+        """
+        Fetch fields of search results by id.
+
+        :return: fields of each result found, by id
+        """
+        args = self.parser.parse_args(strict=True)
+        index, _ = BaseResourceSearchAPI.get_index_and_schema(args)
+
+        try:
+            results = self.proxy.fetch_document_fields(ids=args['id'], fields=args['field'], index=index)
+
+            return {'results': results}, HTTPStatus.OK
+
+        except ValueError as e:
+            return {'message': str(e)}, HTTPStatus.BAD_REQUEST
+
+        except RuntimeError:
+
+            err_msg = 'Exception encountered while processing search request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class SearchMultiAPI(Resource):
+    """
+    API searching several resource types at once, e.g. for the search page showing results of all of them
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+
+        self.parser.add_argument('query_term', required=False, default='', type=str, location='json')
+        self.parser.add_argument('resources', required=False, type=str, action='append',
+                                 choices=list(RESOURCES.keys()), location='json')
+        self.parser.add_argument('search_requests', required=False, default={}, type=dict, location='json')
+        self.parser.add_argument('page_indices', required=False, default={}, type=dict, location='json')
+        self.parser.add_argument('lightweight', required=False, default=False, type=inputs.boolean, location='json')
+
+        super(SearchMultiAPI, self).__init__()
+
+    @swag_from('swagger_doc/search/search_multi.yml')
+    def post(self) -> Iterable[Any]:
+        """
+        Fetch a page of search results of each resource type based on query_term, and the search_request dictionary
+        and page index of each resource type if any, with a single search request to Elasticsearch.
+
+        :return: total and results of each resource type
+        """
+        args = self.parser.parse_args(strict=True)
+        resources = args.get('resources') or list(RESOURCES.keys())
+
+        unknown_resources = (set(args['search_requests']) | set(args['page_indices'])) - set(resources)
+        if unknown_resources:
+            return {'message': f'Search requests or page indices of resources not searched '
+                               f'{sorted(unknown_resources)}'}, HTTPStatus.BAD_REQUEST
+
+        try:
+            results = self.proxy.fetch_multi_search_results(
+                query_term=args['query_term'],
+                indices=[RESOURCES[resource][0] for resource in resources],
+                search_requests={RESOURCES[resource][0]: search_request
+                                 for resource, search_request in args['search_requests'].items()},
+                page_indices={RESOURCES[resource][0]: page_index
+                              for resource, page_index in args['page_indices'].items()},
+                lightweight=args['lightweight']
+            )
+
+            response = {}
+            for resource in resources:
+                index, schema = RESOURCES[resource]
+                response[resource] = {'total_results': results[index].total_results,
+                                      'results': schema(many=True).dump(results[index].results)}
+            return {'results': response}, HTTPStatus.OK
+
+        except ValueError as e:
+            return {'message': str(e)}, HTTPStatus.BAD_REQUEST
+
+        except RuntimeError:
+
+            err_msg = 'Exception encountered while processing search request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class SearchSuggestAPI(Resource):
+    """
+    API suggesting resources of several types by name prefix, e.g. for typeahead in the search box
+    """
+
+    def __init__(self) -> None:
+        self.proxy = get_proxy_client()
+
+        self.parser = reqparse.RequestParser(bundle_errors=True)
+
+        self.parser.add_argument('prefix', required=True, type=str)
+        self.parser.add_argument('resource', required=False, type=str, action='append', choices=SUGGEST_RESOURCES)
+        self.parser.add_argument('size', required=False, default=5, type=int)
+
+        super(SearchSuggestAPI, self).__init__()
+
+    @swag_from('swagger_doc/search/search_suggest.yml')
+    def get(self) -> Iterable[Any]:
+        """
+        Fetch the resources whose name starts with prefix, for each resource type.
+
+        :return: suggested results of each resource type, best first
+        """
+        args = self.parser.parse_args(strict=True)
+        resources = args.get('resource') or SUGGEST_RESOURCES
+
+        try:
+            suggestions = self.proxy.fetch_suggestions(prefix=args['prefix'],
+                                                       indices=[RESOURCES[resource][0] for resource in resources],
+                                                       size=args['size'])
+
+            results = {}
+            for resource in resources:
+                index, schema = RESOURCES[resource]
+                results[resource] = schema(many=True).dump(suggestions.get(index, []))
+            return {'results': results}, HTTPStatus.OK
+
+        except RuntimeError:
+
+            err_msg = 'Exception encountered while processing search request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class SearchExportAPI(BaseResourceSearchAPI):
+    """
+    Search API streaming all results as newline delimited JSON, for bulk consumers
+    """
+
+    @swag_from('swagger_doc/search/search_export.yml')
+    def get(self) -> Any:
+        """
+        Stream all search results based on query_term, one JSON object per line, in no particular order.
+
+        :return: streamed response
+        """
+        args = self.parser.parse_args(strict=True)
+        index, schema = self.get_index_and_schema(args)
+
+        try:
+            results = self.proxy.export_search_results(query_term=args['query_term'], index=index)
+        except RuntimeError:
+            err_msg = 'Exception encountered while processing search request'
+            return {'message': err_msg}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+        def generate() -> Iterator[str]:
+            for result in results:
+                yield json.dumps(schema().dump(result)) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -5,7 +5,9 @@ from http import HTTPStatus
 from typing import Any, Iterable
 
 from flasgger import swag_from
-from flask_restful import Resource, reqparse
+from flask_restful import (
+    Resource, inputs, reqparse,
+)
 
 from search_service.models.user import SearchUserResultSchema
 from search_service.proxy import get_proxy_client
@@ -27,6 +29,7 @@ class SearchUserAPI(Resource):
         self.parser.add_argument('query_term', required=True, type=str)
         self.parser.add_argument('page_index', required=False, default=0, type=int)
         self.parser.add_argument('index', required=False, default=SearchUserAPI.USER_INDEX, type=str)
+        self.parser.add_argument('lightweight', required=False, default=False, type=inputs.boolean)
 
         super(SearchUserAPI, self).__init__()
 
@@ -44,7 +47,8 @@ class SearchUserAPI(Resource):
             results = self.proxy.fetch_user_search_results(
                 query_term=args['query_term'],
                 page_index=args['page_index'],
-                index=args.get('index')
+                index=args.get('index'),
+                lightweight=args.get('lightweight')
             )
 
             return SearchUserResultSchema().dump(results), HTTPStatus.OK
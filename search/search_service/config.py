@@ -6,6 +6,10 @@ from typing import Any, Optional
 
 ELASTICSEARCH_INDEX_KEY = 'ELASTICSEARCH_INDEX'
 SEARCH_PAGE_SIZE_KEY = 'SEARCH_PAGE_SIZE'
+ELASTICSEARCH_FILTER_CONTEXT_KEY = 'ELASTICSEARCH_FILTER_CONTEXT'
+SEARCH_CURSOR_KEEP_ALIVE_KEY = 'SEARCH_CURSOR_KEEP_ALIVE'
+SEARCH_EXPORT_BATCH_SIZE_KEY = 'SEARCH_EXPORT_BATCH_SIZE'
+SEARCH_TRACK_TOTAL_HITS_LIMIT_KEY = 'SEARCH_TRACK_TOTAL_HITS_LIMIT'
 STATS_FEATURE_KEY = 'STATS'
 
 PROXY_ENDPOINT = 'PROXY_ENDPOINT'
@@ -32,6 +36,17 @@ class Config:
     # Config used by ElastichSearch
     ELASTICSEARCH_INDEX = 'table_search_index'
 
+    # Whether filtered searches run their filters as bool filter clauses, which Elasticsearch can cache, instead of
+    # a single query_string
+    ELASTICSEARCH_FILTER_CONTEXT = os.environ.get('ELASTICSEARCH_FILTER_CONTEXT', 'false').lower() == 'true'
+
+    # How long Elasticsearch keeps the point in time of a search paginated with cursors, between two pages
+    SEARCH_CURSOR_KEEP_ALIVE = '1m'
+    # Number of documents fetched per scroll request of a search export
+    SEARCH_EXPORT_BATCH_SIZE = 1000
+    # Number of hits lightweight searches count up to, beyond which their total is e.g. '10000+'
+    SEARCH_TRACK_TOTAL_HITS_LIMIT = 10000
+
     SWAGGER_ENABLED = os.environ.get('SWAGGER_ENABLED', False)
 
 
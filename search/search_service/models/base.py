@@ -20,6 +20,11 @@ class Base(metaclass=ABCMeta):
         # return a set of attributes for the class
         pass
 
+    @classmethod
+    def get_heavy_attrs(cls) -> Set:
+        # return a set of attributes which may be large, left out of lightweight search results
+        return set()
+
     @staticmethod
     @abstractmethod
     def get_type() -> str:
@@ -1,10 +1,13 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import List, Set
+from typing import (
+    List, Set, Union,
+)
 
 import attr
 from amundsen_common.models.dashboard import DashboardSummary, DashboardSummarySchema
+from marshmallow import fields
 from marshmallow3_annotations.ext.attrs import AttrsSchema
 
 from search_service.models.base import Base
@@ -50,11 +53,14 @@ class DashboardSchema(DashboardSummarySchema):
 
 @attr.s(auto_attribs=True, kw_only=True)
 class SearchDashboardResult:
-    total_results: int = attr.ib()
+    # e.g. '10000+' when a lightweight search stopped counting hits
+    total_results: Union[int, str] = attr.ib()
     results: List[Dashboard] = attr.ib(factory=list)
 
 
 class SearchDashboardResultSchema(AttrsSchema):
+    total_results = fields.Raw()
+
     class Meta:
         target = SearchDashboardResult
         register_as_scheme = True
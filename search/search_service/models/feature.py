@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from typing import (
-    List, Optional, Set,
+    List, Optional, Set, Union,
 )
 
 import attr
+from marshmallow import fields
 from marshmallow3_annotations.ext.attrs import AttrsSchema
 
 from search_service.models.base import Base
@@ -75,11 +76,14 @@ class FeatureSchema(AttrsSchema):
 
 @attr.s(auto_attribs=True, kw_only=True)
 class SearchFeatureResult:
-    total_results: int = attr.ib()
+    # e.g. '10000+' when a lightweight search stopped counting hits
+    total_results: Union[int, str] = attr.ib()
     results: List[Feature] = attr.ib(factory=list)
 
 
 class SearchFeatureResultSchema(AttrsSchema):
+    total_results = fields.Raw()
+
     class Meta:
         target = SearchFeatureResult
         register_as_scheme = True
@@ -1,7 +1,9 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, List
+from typing import (
+    Any, List, Optional, Union,
+)
 
 
 class SearchResult:
@@ -13,3 +15,22 @@ class SearchResult:
 
     def __repr__(self) -> str:
         return 'SearchResult(total_results={!r}, results{!r})'.format(self.total_results, self.results)
+
+
+class CursorSearchResult:
+    """
+    A page of search results, with the cursor of the next page, if any.
+    total_results is only counted for the first page.
+    """
+
+    def __init__(self, *,
+                 total_results: Optional[Union[int, str]],
+                 results: List[Any],
+                 cursor: Optional[str]) -> None:
+        self.total_results = total_results
+        self.results = results
+        self.cursor = cursor
+
+    def __repr__(self) -> str:
+        return 'CursorSearchResult(total_results={!r}, results{!r}, cursor={!r})'.format(
+            self.total_results, self.results, self.cursor)
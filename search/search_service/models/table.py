@@ -3,10 +3,11 @@
 
 import time
 from typing import (
-    List, Optional, Set,
+    List, Optional, Set, Union,
 )
 
 import attr
+from marshmallow import fields
 from marshmallow3_annotations.ext.attrs import AttrsSchema
 
 from search_service.models.base import Base
@@ -72,6 +73,13 @@ class Table(Base):
             'schema_description'
         }
 
+    @classmethod
+    def get_heavy_attrs(cls) -> Set:
+        return {
+            'column_names',
+            'programmatic_descriptions'
+        }
+
     @staticmethod
     def get_type() -> str:
         return 'table'
@@ -85,11 +93,14 @@ class TableSchema(AttrsSchema):
 
 @attr.s(auto_attribs=True, kw_only=True)
 class SearchTableResult:
-    total_results: int = attr.ib()
+    # e.g. '10000+' when a lightweight search stopped counting hits
+    total_results: Union[int, str] = attr.ib()
     results: List[Table] = attr.ib(factory=list)
 
 
 class SearchTableResultSchema(AttrsSchema):
+    total_results = fields.Raw()
+
     class Meta:
         target = SearchTableResult
         register_as_scheme = True
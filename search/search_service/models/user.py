@@ -3,11 +3,12 @@
 
 
 from typing import (
-    List, Optional, Set,
+    List, Optional, Set, Union,
 )
 
 import attr
 from amundsen_common.models.user import User as CommonUser
+from marshmallow import fields
 from marshmallow3_annotations.ext.attrs import AttrsSchema
 
 from search_service.models.base import Base
@@ -56,11 +57,14 @@ class UserSchema(AttrsSchema):
 
 @attr.s(auto_attribs=True, kw_only=True)
 class SearchUserResult:
-    total_results: int = attr.ib()
+    # e.g. '10000+' when a lightweight search stopped counting hits
+    total_results: Union[int, str] = attr.ib()
     results: List[User] = attr.ib(factory=list)
 
 
 class SearchUserResultSchema(AttrsSchema):
+    total_results = fields.Raw()
+
     class Meta:
         target = SearchUserResult
         register_as_scheme = True
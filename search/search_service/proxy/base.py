@@ -3,13 +3,14 @@
 
 from abc import ABCMeta, abstractmethod
 from typing import (
-    Any, Dict, List, Union,
+    Any, Dict, Iterator, List, Optional, Union,
 )
 
 from amundsen_common.models.api.health_check import HealthCheck
 
 from search_service.models.dashboard import SearchDashboardResult
 from search_service.models.feature import SearchFeatureResult
+from search_service.models.search_result import CursorSearchResult
 from search_service.models.table import SearchTableResult
 from search_service.models.user import SearchUserResult
 
@@ -32,28 +33,32 @@ class BaseProxy(metaclass=ABCMeta):
     def fetch_table_search_results(self, *,
                                    query_term: str,
                                    page_index: int = 0,
-                                   index: str = '') -> SearchTableResult:
+                                   index: str = '',
+                                   lightweight: bool = False) -> SearchTableResult:
         pass
 
     @abstractmethod
     def fetch_dashboard_search_results(self, *,
                                        query_term: str,
                                        page_index: int = 0,
-                                       index: str = '') -> SearchDashboardResult:
+                                       index: str = '',
+                                       lightweight: bool = False) -> SearchDashboardResult:
         pass
 
     @abstractmethod
     def fetch_feature_search_results(self, *,
                                      query_term: str,
                                      page_index: int = 0,
-                                     index: str = '') -> SearchFeatureResult:
+                                     index: str = '',
+                                     lightweight: bool = False) -> SearchFeatureResult:
         pass
 
     @abstractmethod
     def fetch_user_search_results(self, *,
                                   query_term: str,
                                   page_index: int = 0,
-                                  index: str = '') -> SearchUserResult:
+                                  index: str = '',
+                                  lightweight: bool = False) -> SearchUserResult:
         pass
 
     @abstractmethod
@@ -66,6 +71,53 @@ class BaseProxy(metaclass=ABCMeta):
                                                                    SearchFeatureResult]:
         pass
 
+    def fetch_multi_search_results(self, *,
+                                   query_term: str,
+                                   indices: List[str],
+                                   search_requests: Optional[Dict[str, dict]] = None,
+                                   page_indices: Optional[Dict[str, int]] = None,
+                                   lightweight: bool = False) -> Dict[str, Any]:
+        """
+        Fetches a page of search results of each index at once
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support multi search')
+
+    def fetch_search_results_with_cursor(self, *,
+                                         query_term: str,
+                                         index: str,
+                                         cursor: Optional[str] = None,
+                                         page_size: Optional[int] = None) -> CursorSearchResult:
+        """
+        Fetches the page of search results following the given cursor, or the first page without cursor
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support cursor pagination')
+
+    def fetch_document_fields(self, *,
+                              ids: List[str],
+                              fields: List[str],
+                              index: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches fields of documents, e.g. the ones left out of lightweight search results
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support fetching document fields')
+
+    def fetch_suggestions(self, *,
+                          prefix: str,
+                          indices: List[str],
+                          size: int) -> Dict[str, List[Any]]:
+        """
+        Fetches documents of each index whose name starts with prefix, e.g. to suggest them while the user types
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support suggestions')
+
+    def export_search_results(self, *,
+                              query_term: str,
+                              index: str) -> Iterator[Any]:
+        """
+        Iterates over all search results, in no particular order
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support search export')
+
     @abstractmethod
     def update_document(self, *,
                         data: List[Dict[str, Any]],
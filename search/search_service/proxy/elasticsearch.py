@@ -1,10 +1,12 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import base64
+import json
 import logging
 import uuid
 from typing import (
-    Any, Dict, List, Union,
+    Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union,
 )
 
 from amundsen_common.models.api import health_check
@@ -13,7 +15,9 @@ from amundsen_common.models.index_map import (
 )
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import ConnectionError as ElasticConnectionError, NotFoundError
-from elasticsearch_dsl import Search, query
+from elasticsearch_dsl import (
+    MultiSearch, Search, query,
+)
 from elasticsearch_dsl.utils import AttrDict
 from flask import current_app
 
@@ -24,7 +28,7 @@ from search_service.api.table import TABLE_INDEX
 from search_service.api.user import USER_INDEX
 from search_service.models.dashboard import Dashboard, SearchDashboardResult
 from search_service.models.feature import Feature, SearchFeatureResult
-from search_service.models.search_result import SearchResult
+from search_service.models.search_result import CursorSearchResult, SearchResult
 from search_service.models.table import SearchTableResult, Table
 from search_service.models.tag import Tag
 from search_service.models.user import SearchUserResult, User
@@ -34,6 +38,14 @@ from search_service.proxy.statsd_utilities import timer_with_counter
 # Default Elasticsearch index to use, if none specified
 DEFAULT_ES_INDEX = 'table_search_index'
 
+DEFAULT_CURSOR_KEEP_ALIVE = '1m'
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+DEFAULT_TRACK_TOTAL_HITS_LIMIT = 10000
+DEFAULT_SUGGEST_SIZE = 5
+
+# Completion field of the documents, see amundsen_common.models.index_map
+SUGGEST_FIELD = 'suggest'
+
 LOGGING = logging.getLogger(__name__)
 
 
@@ -249,7 +261,6 @@ class ElasticsearchProxy(BaseProxy):
         if model is None:
             raise Exception('ES Doc model must be provided!')
 
-        results = []
         # Use {page_index} to calculate index of results to fetch from
         if page_index != -1:
             start_from = page_index * self.page_size
@@ -261,57 +272,72 @@ class ElasticsearchProxy(BaseProxy):
 
         response = client.execute()
 
-        for hit in response:
-            try:
-                es_metadata = hit.__dict__.get('meta', {})
-                """
-                ES hit example:
-                {
-                    '_d_': {
-                        'name': 'name',
-                        'database': 'database',
-                        'schema': 'schema',
-                        'key': 'database://cluster.schema/name',
-                        'cluster': 'cluster',
-                        'column_descriptions': ['description1', 'description2'],
-                        'column_names': ['colname1', 'colname2'],
-                        'description': None,
-                        'display_name': 'display name',
-                        'last_updated_timestamp': 12345678,
-                        'programmatic_descriptions': [],
-                        'schema_description': None,
-                        'tags': ['tag1', 'tag2'],
-                        'badges': [],
-                        'total_usage': 0
-                    },
-                    'meta': {
-                        'index': 'table index',
-                        'id': 'table id',
-                        'type': 'type'
-                    }
-                }
-                """
-                es_payload = hit.__dict__.get('_d_', {})
-                if not es_payload:
-                    raise Exception('The ES doc not contain required field')
-                result = {}
-                for attr, val in es_payload.items():
-                    if attr in model.get_attrs():
-                        result[attr] = self._get_instance(attr=attr, val=val)
-                result['id'] = self._get_instance(attr='id', val=es_metadata['id'])
-
-                results.append(model(**result))
-            except Exception:
-                LOGGING.exception('The record doesnt contain specified field.')
+        return search_result_model(total_results=self._get_total_hits(response),
+                                   results=list(self._iterate_models(response, model)))
+
+    def _get_model_from_hit(self, hit: Any, model: Any) -> Any:
+        es_metadata = hit.__dict__.get('meta', {})
+        """
+        ES hit example:
+        {
+            '_d_': {
+                'name': 'name',
+                'database': 'database',
+                'schema': 'schema',
+                'key': 'database://cluster.schema/name',
+                'cluster': 'cluster',
+                'column_descriptions': ['description1', 'description2'],
+                'column_names': ['colname1', 'colname2'],
+                'description': None,
+                'display_name': 'display name',
+                'last_updated_timestamp': 12345678,
+                'programmatic_descriptions': [],
+                'schema_description': None,
+                'tags': ['tag1', 'tag2'],
+                'badges': [],
+                'total_usage': 0
+            },
+            'meta': {
+                'index': 'table index',
+                'id': 'table id',
+                'type': 'type'
+            }
+        }
+        """
+        es_payload = hit.__dict__.get('_d_', {})
+        if not es_payload:
+            raise Exception('The ES doc not contain required field')
 
+        return self._get_model_from_source(es_payload, es_metadata['id'], model)
+
+    def _get_model_from_source(self, source: Dict[str, Any], doc_id: str, model: Any) -> Any:
+        result = {}
+        for attr, val in source.items():
+            if attr in model.get_attrs():
+                result[attr] = self._get_instance(attr=attr, val=val)
+        result['id'] = self._get_instance(attr='id', val=doc_id)
+
+        return model(**result)
+
+    @staticmethod
+    def _get_total_hits(response: Any) -> Union[int, str]:
         # This is to support ESv7.x, and newer version of elasticsearch_dsl
         if isinstance(response.hits.total, AttrDict):
-            _total = response.hits.total.value
-        else:
-            _total = response.hits.total
+            if response.hits.total.relation == 'gte':
+                # Elasticsearch stopped counting hits at track_total_hits
+                return f'{response.hits.total.value}+'
+            return response.hits.total.value
+        return response.hits.total
 
-        return search_result_model(total_results=_total,
-                                   results=results)
+    @staticmethod
+    def _get_source_fields(model: Any, lightweight: bool = False) -> List[str]:
+        """
+        :return: fields of the documents' source needed by the model, e.g. without long column descriptions
+        """
+        source_fields = model.get_attrs() - {'id'}
+        if lightweight:
+            source_fields -= model.get_heavy_attrs()
+        return sorted(source_fields)
 
     def _get_instance(self, attr: str, val: Any) -> Any:
         if attr in self.TAG_MAPPING:
@@ -324,7 +350,8 @@ class ElasticsearchProxy(BaseProxy):
                        client: Search,
                        query_name: dict,
                        model: Any,
-                       search_result_model: Any = SearchResult) -> Any:
+                       search_result_model: Any = SearchResult,
+                       lightweight: bool = False) -> Any:
         """
         Constructs Elasticsearch Query DSL to:
           1. Use function score to customize scoring of search result. It currently uses "total_usage" field to score.
@@ -335,21 +362,33 @@ class ElasticsearchProxy(BaseProxy):
         :param page_index:
         :param client:
         :param query_name: name of query to query the ES
+        :param lightweight: whether to only count hits up to SEARCH_TRACK_TOTAL_HITS_LIMIT, which makes the total
+        e.g. '10000+' beyond it, and to leave out the model's heavy attributes
         :return:
         """
-        # This is to support ESv7.x
-        # ref: https://www.elastic.co/guide/en/elasticsearch/reference/7.0/breaking-changes-7.0.html#track-total-hits-10000-default # noqa: E501
-        client = client.extra(track_total_hits=True)
-
-        if query_name:
-            q = query.Q(query_name)
-            client = client.query(q)
+        client = self._build_search(client=client, query_name=query_name, model=model, lightweight=lightweight)
 
         return self._get_search_result(page_index=page_index,
                                        client=client,
                                        model=model,
                                        search_result_model=search_result_model)
 
+    def _build_search(self, client: Search, query_name: Optional[dict], model: Any, lightweight: bool) -> Search:
+        if lightweight:
+            track_total_hits = current_app.config.get(config.SEARCH_TRACK_TOTAL_HITS_LIMIT_KEY,
+                                                      DEFAULT_TRACK_TOTAL_HITS_LIMIT)
+        else:
+            # This is to support ESv7.x
+            # ref: https://www.elastic.co/guide/en/elasticsearch/reference/7.0/breaking-changes-7.0.html#track-total-hits-10000-default # noqa: E501
+            track_total_hits = True
+        client = client.extra(track_total_hits=track_total_hits) \
+            .source(includes=self._get_source_fields(model, lightweight=lightweight))
+
+        if query_name:
+            q = query.Q(query_name)
+            client = client.query(q)
+        return client
+
     @staticmethod
     def get_model_by_index(index: str) -> Any:
         if index == TABLE_INDEX:
@@ -363,17 +402,33 @@ class ElasticsearchProxy(BaseProxy):
 
         raise Exception('Unable to map given index to a valid model')
 
+    @staticmethod
+    def get_search_result_model_by_index(index: str) -> Any:
+        if index == TABLE_INDEX:
+            return SearchTableResult
+        elif index == USER_INDEX:
+            return SearchUserResult
+        elif index == DASHBOARD_INDEX:
+            return SearchDashboardResult
+        elif index == FEATURE_INDEX:
+            return SearchFeatureResult
+
+        raise Exception('Unable to map given index to a valid search result model')
+
     @classmethod
-    def parse_filters(cls, filter_list: Dict, index: str) -> str:
-        query_list = []  # type: List[str]
+    def _get_filter_mapping(cls, index: str) -> Dict[str, str]:
         if index == TABLE_INDEX:
-            mapping = cls.TABLE_MAPPING
+            return cls.TABLE_MAPPING
         elif index == DASHBOARD_INDEX:
-            mapping = cls.DASHBOARD_MAPPING
+            return cls.DASHBOARD_MAPPING
         elif index == FEATURE_INDEX:
-            mapping = cls.FEATURE_MAPPING
-        else:
-            raise Exception(f'index {index} doesnt exist nor support search filter')
+            return cls.FEATURE_MAPPING
+        raise Exception(f'index {index} doesnt exist nor support search filter')
+
+    @classmethod
+    def parse_filters(cls, filter_list: Dict, index: str) -> str:
+        query_list = []  # type: List[str]
+        mapping = cls._get_filter_mapping(index)
         for category, item_list in filter_list.items():
             mapped_category = mapping.get(category)
             if mapped_category is None:
@@ -478,6 +533,122 @@ class ElasticsearchProxy(BaseProxy):
 
         return result
 
+    @staticmethod
+    def _get_value_filter_clause(field: str, item_list: List[str]) -> Dict[str, Any]:
+        """
+        Builds the clause matching any of the values of a filter category. Values without wildcard are matched
+        exactly with a single terms query, values only ending with * with a prefix query, and any other value with
+        a wildcard query, the most expensive one.
+        """
+        clauses = []  # type: List[Dict[str, Any]]
+        exact_values = []  # type: List[str]
+        for item in item_list:
+            if '*' not in item and '?' not in item:
+                exact_values.append(item)
+            elif item.endswith('*') and '*' not in item[:-1] and '?' not in item:
+                clauses.append({'prefix': {field: item[:-1]}})
+            else:
+                clauses.append({'wildcard': {field: item}})
+        if exact_values:
+            clauses.insert(0, {'terms': {field: exact_values}})
+
+        if len(clauses) == 1:
+            return clauses[0]
+        return {'bool': {'should': clauses, 'minimum_should_match': 1}}
+
+    @classmethod
+    def build_filter_clauses(cls, filter_list: Dict, index: str) -> List[Dict[str, Any]]:
+        """
+        Structured counterpart of parse_filters, which Elasticsearch runs in filter context: filters don't take part
+        in scoring and are cached. Like parse_filters, values of a category are OR'ed and categories are AND'ed.
+        e.g {'database': ['hive', 'bigquery'], 'table': ['*amundsen*']} becomes
+        [{'terms': {'database.raw': ['hive', 'bigquery']}}, {'wildcard': {'name.raw': '*amundsen*'}}]
+
+        :param filter_list:
+        :param index: table_index, dashboard_index
+        :return: List of filter clauses of a bool query
+        """
+        clauses = []  # type: List[Dict[str, Any]]
+        mapping = cls._get_filter_mapping(index)
+        for category, item_list in filter_list.items():
+            mapped_category = mapping.get(category)
+            if mapped_category is None:
+                LOGGING.warn(f'Unsupported filter category: {category} passed in list of filters')
+            elif item_list is '' or item_list == ['']:
+                LOGGING.warn(f'The filter value cannot be empty.In this case the filter {category} is ignored')
+            else:
+                clauses.append(cls._get_value_filter_clause(mapped_category, item_list))
+        return clauses
+
+    def _get_search_query_by_index(self, query_term: str, index: str) -> dict:
+        if index == TABLE_INDEX:
+            return self.get_table_search_query(query_term)
+        elif index == USER_INDEX:
+            return self.get_user_search_query(query_term)
+        elif index == DASHBOARD_INDEX:
+            return self.get_dashboard_search_query(query_term)
+        elif index == FEATURE_INDEX:
+            return self.get_feature_search_query(query_term)
+        raise Exception(f'index {index} doesnt exist nor support search filter')
+
+    def convert_query_json_to_filter_query(self, *,
+                                           search_request: dict,
+                                           query_term: str,
+                                           index: str) -> dict:
+        """
+        Convert the generic query json to a bool query, where the query term is scored like in the search without
+        filters, and filters run in filter context.
+        e.g in Elasticsearch, for the table index
+        ```
+        {
+            'function_score': {
+                'query': {
+                    'bool': {
+                        'must': {'multi_match': {'query': 'test', 'fields': [...]}},
+                        'filter': [{'terms': {'database.raw': ['hive', 'bigquery']}},
+                                   {'wildcard': {'name.raw': '*amundsen*'}}]
+                    }
+                },
+                'field_value_factor': {'field': 'total_usage', 'modifier': 'log2p'}
+            }
+        }
+        ```
+
+        :param search_request:
+        :param query_term:
+        :param index: table_index, dashboard_index
+        :return: The search engine query DSL
+        """
+        filter_list = search_request.get('filters')
+        filter_clauses = self.build_filter_clauses(filter_list, index) if filter_list else []
+
+        if not filter_clauses and not query_term:
+            raise Exception('Unable to convert parameters to valid query dsl')
+
+        if query_term:
+            query_dsl = self._get_search_query_by_index(query_term, index)
+        else:
+            # Only scored by usage, like the query_string filter search
+            query_dsl = self.get_filter_search_query('')
+            query_dsl['function_score']['query'] = {'match_all': {}}
+
+        bool_query = {'must': query_dsl['function_score']['query']}  # type: Dict[str, Any]
+        if filter_clauses:
+            bool_query['filter'] = filter_clauses
+        query_dsl['function_score']['query'] = {'bool': bool_query}
+        return query_dsl
+
+    def _get_filter_query(self, *, search_request: dict, query_term: str, index: str) -> dict:
+        if current_app.config.get(config.ELASTICSEARCH_FILTER_CONTEXT_KEY, False):
+            return self.convert_query_json_to_filter_query(search_request=search_request,
+                                                           query_term=query_term,
+                                                           index=index)
+
+        query_string = self.convert_query_json_to_query_dsl(search_request=search_request,
+                                                            query_term=query_term,
+                                                            index=index)  # type: str
+        return self.get_filter_search_query(query_string)
+
     @timer_with_counter
     def fetch_search_results_with_filter(self, *,
                                          query_term: str,
@@ -508,9 +679,9 @@ class ElasticsearchProxy(BaseProxy):
             return search_model(total_results=0, results=[])
 
         try:
-            query_string = self.convert_query_json_to_query_dsl(search_request=search_request,
-                                                                query_term=query_term,
-                                                                index=current_index)  # type: str
+            query_name = self._get_filter_query(search_request=search_request,
+                                                query_term=query_term,
+                                                index=current_index)
         except Exception as e:
             LOGGING.exception(e)
             # return nothing if any exception is thrown under the hood
@@ -518,8 +689,6 @@ class ElasticsearchProxy(BaseProxy):
 
         s = Search(using=self.elasticsearch, index=current_index)
 
-        query_name = self.get_filter_search_query(query_string)
-
         model = self.get_model_by_index(current_index)
         return self._search_helper(page_index=page_index,
                                    client=s,
@@ -527,17 +696,88 @@ class ElasticsearchProxy(BaseProxy):
                                    model=model,
                                    search_result_model=search_model)
 
+    @timer_with_counter
+    def fetch_multi_search_results(self, *,
+                                   query_term: str,
+                                   indices: List[str],
+                                   search_requests: Optional[Dict[str, dict]] = None,
+                                   page_indices: Optional[Dict[str, int]] = None,
+                                   lightweight: bool = False) -> Dict[str, Any]:
+        """
+        Query several indices with a single multi search request and return a page of results of each, e.g. to
+        search all resource types at once. Each index is queried like by its own search, or like by
+        fetch_search_results_with_filter when it has a search request.
+
+        :param query_term: search query term
+        :param indices: indices to search
+        :param search_requests: json representation of the search request of each index with filters, if any
+        :param page_indices: index of search page user is currently on for each index, defaults to the first page
+        :param lightweight: whether to stop counting hits at the limit and leave out heavy fields, e.g. for typeahead
+        :return: search result of each index
+        """
+        search_requests = search_requests or {}
+        page_indices = page_indices or {}
+        if any(page_index < 0 for page_index in page_indices.values()):
+            raise ValueError('Page indices have to be positive for multi search')
+
+        results = {}  # type: Dict[str, Any]
+        searches = {}  # type: Dict[str, Search]
+        for index in indices:
+            model = self.get_model_by_index(index)
+            try:
+                if search_requests.get(index):
+                    query_name = self._get_filter_query(search_request=search_requests[index],
+                                                        query_term=query_term,
+                                                        index=index)  # type: Optional[dict]
+                else:
+                    query_name = self._get_search_query_by_index(query_term, index) if query_term else None
+            except Exception as e:
+                LOGGING.exception(e)
+                query_name = None
+
+            if not query_name:
+                # return empty result for blank query term, or if the search request could not be converted
+                results[index] = self.get_search_result_model_by_index(index)(total_results=0, results=[])
+                continue
+
+            start_from = page_indices.get(index, 0) * self.page_size
+            searches[index] = self._build_search(client=Search(index=index),
+                                                 query_name=query_name,
+                                                 model=model,
+                                                 lightweight=lightweight)[start_from:start_from + self.page_size]
+
+        multi_search = MultiSearch(using=self.elasticsearch)
+        for search in searches.values():
+            multi_search = multi_search.add(search)
+        responses = multi_search.execute(raise_on_error=False) if searches else []
+
+        for index, response in zip(searches.keys(), responses):
+            search_result_model = self.get_search_result_model_by_index(index)
+            if response is None:
+                # e.g. the index does not exist, which should not fail the search of other indices
+                LOGGING.error(f'Failed to search index {index}')
+                results[index] = search_result_model(total_results=0, results=[])
+                continue
+
+            results[index] = search_result_model(
+                total_results=self._get_total_hits(response),
+                results=list(self._iterate_models(response, self.get_model_by_index(index))))
+
+        return {index: results[index] for index in indices}
+
     @timer_with_counter
     def fetch_table_search_results(self, *,
                                    query_term: str,
                                    page_index: int = 0,
-                                   index: str = '') -> SearchTableResult:
+                                   index: str = '',
+                                   lightweight: bool = False) -> SearchTableResult:
         """
         Query Elasticsearch and return results as list of Table objects
 
         :param query_term: search query term
         :param page_index: index of search page user is currently on
         :param index: current index for search. Provide different index for different resource.
+        :param lightweight: whether to stop counting hits at the limit and leave out heavy fields, e.g. for typeahead
         :return: SearchResult Object
         """
         current_index = index if index else \
@@ -553,13 +793,15 @@ class ElasticsearchProxy(BaseProxy):
                                    client=s,
                                    query_name=query_name,
                                    model=Table,
-                                   search_result_model=SearchTableResult)
+                                   search_result_model=SearchTableResult,
+                                   lightweight=lightweight)
 
     @timer_with_counter
     def fetch_user_search_results(self, *,
                                   query_term: str,
                                   page_index: int = 0,
-                                  index: str = '') -> SearchUserResult:
+                                  index: str = '',
+                                  lightweight: bool = False) -> SearchUserResult:
         if not index:
             raise Exception('Index cant be empty for user search')
         if not query_term:
@@ -575,19 +817,22 @@ class ElasticsearchProxy(BaseProxy):
                                    client=s,
                                    query_name=query_name,
                                    model=User,
-                                   search_result_model=SearchUserResult)
+                                   search_result_model=SearchUserResult,
+                                   lightweight=lightweight)
 
     @timer_with_counter
     def fetch_dashboard_search_results(self, *,
                                        query_term: str,
                                        page_index: int = 0,
-                                       index: str = '') -> SearchDashboardResult:
+                                       index: str = '',
+                                       lightweight: bool = False) -> SearchDashboardResult:
         """
         Fetch dashboard search result with fuzzy search
 
         :param query_term:
         :param page_index:
         :param index:
+        :param lightweight:
         :return:
         """
         current_index = index if index else \
@@ -604,19 +849,22 @@ class ElasticsearchProxy(BaseProxy):
                                    client=s,
                                    query_name=query_name,
                                    model=Dashboard,
-                                   search_result_model=SearchDashboardResult)
+                                   search_result_model=SearchDashboardResult,
+                                   lightweight=lightweight)
 
     @timer_with_counter
     def fetch_feature_search_results(self, *,
                                      query_term: str,
                                      page_index: int = 0,
-                                     index: str = '') -> SearchFeatureResult:
+                                     index: str = '',
+                                     lightweight: bool = False) -> SearchFeatureResult:
         """
         Query Elasticsearch and return results as list of Feature objects
 
         :param query_term: search query term
         :param page_index: index of search page user is currently on
         :param index: current index for search. Provide different index for different resource.
+        :param lightweight: whether to stop counting hits at the limit and leave out heavy fields, e.g. for typeahead
         :return: SearchFeatureResult
         """
         current_index = index if index else FEATURE_INDEX
@@ -631,7 +879,182 @@ class ElasticsearchProxy(BaseProxy):
                                    client=s,
                                    query_name=query_name,
                                    model=Feature,
-                                   search_result_model=SearchFeatureResult)
+                                   search_result_model=SearchFeatureResult,
+                                   lightweight=lightweight)
+
+    @staticmethod
+    def _encode_cursor(pit_id: str, search_after: List[Any]) -> str:
+        cursor = json.dumps({'pit_id': pit_id, 'search_after': search_after})
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, List[Any]]:
+        try:
+            decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return decoded['pit_id'], decoded['search_after']
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f'Invalid cursor {cursor}') from e
+
+    def _get_query_by_index(self, query_term: str, index: str) -> Search:
+        s = Search(using=self.elasticsearch)
+        if query_term:
+            s = s.query(query.Q(self._get_search_query_by_index(query_term, index)))
+        return s
+
+    @timer_with_counter
+    def fetch_search_results_with_cursor(self, *,
+                                         query_term: str,
+                                         index: str,
+                                         cursor: Optional[str] = None,
+                                         page_size: Optional[int] = None) -> CursorSearchResult:
+        """
+        Query Elasticsearch and return a page of results. Pages are fetched with search_after on a point in time,
+        so that they are consistent with each other and deep pages cost as much as the first one, unlike from/size
+        pages which are also capped by the index max_result_window.
+        Relies on the tiebreaker Elasticsearch 7.12+ adds to the sort of a point in time search.
+
+        :param query_term: search query term, matching all documents if empty. The same for all pages
+        :param index: index for search
+        :param cursor: cursor returned with the previous page, if any
+        :param page_size: number of results per page, defaults to the search page size
+        :return: CursorSearchResult, whose cursor is None for the last page
+        """
+        model = self.get_model_by_index(index)
+        size = page_size or self.page_size
+        keep_alive = current_app.config.get(config.SEARCH_CURSOR_KEEP_ALIVE_KEY, DEFAULT_CURSOR_KEEP_ALIVE)
+
+        if cursor:
+            pit_id, search_after = self._decode_cursor(cursor)
+        else:
+            pit_id = self.elasticsearch.open_point_in_time(index=index, keep_alive=keep_alive)['id']
+            search_after = []
+
+        # The point in time determines the index. Only the first page counts total hits
+        s = self._get_query_by_index(query_term, index) \
+            .source(includes=self._get_source_fields(model)) \
+            .sort('_score') \
+            .extra(size=size, pit={'id': pit_id, 'keep_alive': keep_alive}, track_total_hits=not cursor)
+        if search_after:
+            s = s.extra(search_after=search_after)
+
+        try:
+            response = s.execute()
+        except NotFoundError as e:
+            raise ValueError('The cursor expired') from e
+
+        hits = list(response)
+        results = list(self._iterate_models(hits, model))
+        # The point in time id may change from one page to the next
+        pit_id = getattr(response, 'pit_id', pit_id)
+        if len(hits) < size:
+            self.elasticsearch.close_point_in_time(body={'id': pit_id})
+            next_cursor = None
+        else:
+            next_cursor = self._encode_cursor(pit_id, list(hits[-1].__dict__.get('meta', {})['sort']))
+
+        return CursorSearchResult(total_results=None if cursor else self._get_total_hits(response),
+                                  results=results,
+                                  cursor=next_cursor)
+
+    def fetch_document_fields(self, *,
+                              ids: List[str],
+                              fields: List[str],
+                              index: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch fields of documents by id, e.g. heavy fields left out of lightweight search results.
+
+        :param ids: ids of the documents, as returned in search results
+        :param fields: fields of the result model
+        :param index: index of the documents
+        :return: fields of each document found, by document id
+        """
+        model = self.get_model_by_index(index)
+        unknown_fields = set(fields) - model.get_attrs()
+        if unknown_fields:
+            raise ValueError(f'Unknown fields {sorted(unknown_fields)}')
+
+        response = self.elasticsearch.mget(index=index, body={'ids': ids}, _source_includes=fields)
+        return {doc['_id']: doc.get('_source', {}) for doc in response['docs'] if doc.get('found')}
+
+    @timer_with_counter
+    def fetch_suggestions(self, *,
+                          prefix: str,
+                          indices: List[str],
+                          size: int = DEFAULT_SUGGEST_SIZE) -> Dict[str, List[Any]]:
+        """
+        Suggest documents of several indices whose name starts with prefix, e.g. while the user types a search.
+        Suggestions come from the completion field of the documents, which is served from memory rather than
+        scored like searches, and all indices are queried at once with a single multi search request.
+
+        :param prefix: start of a name, e.g. of a table, dashboard or user
+        :param indices: indices to suggest documents from
+        :param size: max number of suggestions per index
+        :return: lightweight result models of each index, best suggestions first
+        """
+        models = {index: self.get_model_by_index(index) for index in indices}
+
+        body: List[Dict[str, Any]] = []
+        for index, model in models.items():
+            body.append({'index': index})
+            body.append({
+                'size': 0,
+                '_source': self._get_source_fields(model, lightweight=True),
+                'suggest': {
+                    SUGGEST_FIELD: {
+                        'prefix': prefix,
+                        # No skip_duplicates, which would drop e.g. same-named tables of other schemas or clusters
+                        'completion': {'field': SUGGEST_FIELD, 'size': size}
+                    }
+                }
+            })
+
+        responses = self.elasticsearch.msearch(body=body)['responses']
+
+        suggestions: Dict[str, List[Any]] = {}
+        for (index, model), response in zip(models.items(), responses):
+            if 'error' in response:
+                # e.g. the index was built before it had a completion field
+                LOGGING.warning(f'Failed to fetch suggestions from index {index}: {response["error"]}')
+                suggestions[index] = []
+                continue
+
+            # A document can be suggested by several of its inputs, e.g. a table by its display name and name
+            results: Dict[str, Any] = {}
+            for suggestion in response['suggest'][SUGGEST_FIELD]:
+                for option in suggestion['options']:
+                    if option['_id'] not in results:
+                        results[option['_id']] = self._get_model_from_source(option.get('_source', {}),
+                                                                             option['_id'], model)
+            suggestions[index] = list(results.values())
+        return suggestions
+
+    def export_search_results(self, *,
+                              query_term: str,
+                              index: str) -> Iterator[Any]:
+        """
+        Query Elasticsearch and iterate over all results, in no particular order. Results are fetched in batches
+        with scroll requests as they are consumed, so that large result sets are streamed rather than loaded at once.
+
+        :param query_term: search query term, matching all documents if empty
+        :param index: index for search
+        :return: iterator of result models
+        """
+        model = self.get_model_by_index(index)
+        batch_size = current_app.config.get(config.SEARCH_EXPORT_BATCH_SIZE_KEY, DEFAULT_EXPORT_BATCH_SIZE)
+        keep_alive = current_app.config.get(config.SEARCH_CURSOR_KEEP_ALIVE_KEY, DEFAULT_CURSOR_KEEP_ALIVE)
+
+        s = self._get_query_by_index(query_term, index) \
+            .index(index) \
+            .source(includes=self._get_source_fields(model)) \
+            .params(size=batch_size, scroll=keep_alive)
+        return self._iterate_models(s.scan(), model)
+
+    def _iterate_models(self, hits: Iterable[Any], model: Any) -> Iterator[Any]:
+        for hit in hits:
+            try:
+                yield self._get_model_from_hit(hit, model)
+            except Exception:
+                LOGGING.exception('The record doesnt contain specified field.')
 
     # The following methods are related to document API that needs to update
     @timer_with_counter
@@ -37,7 +37,8 @@ class TestSearchDashboardAPI(TestCase):
         self.assertEqual(response.json, expected_response)
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.mock_proxy.fetch_dashboard_search_results.assert_called_with(query_term='searchterm', page_index=0,
-                                                                          index='dashboard_search_index')
+                                                                          index='dashboard_search_index',
+                                                                          lightweight=False)
 
     def test_should_give_empty_result_when_there_are_no_results_from_proxy(self) -> None:
         self.mock_proxy.fetch_dashboard_search_results.return_value = \
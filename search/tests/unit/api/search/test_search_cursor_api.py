@@ -0,0 +1,52 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+from search_service.models.search_result import CursorSearchResult
+from tests.unit.api.table.fixtures import mock_json_response, mock_proxy_results
+
+
+class TestSearchCursorAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.search.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_get_page_with_cursor(self) -> None:
+        self.mock_proxy.fetch_search_results_with_cursor.return_value = \
+            CursorSearchResult(total_results=None, results=[mock_proxy_results()], cursor='next')
+
+        response = self.app.test_client().get('/search_cursor?resource=table&query_term=searchterm&cursor=previous')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {'total_results': None, 'results': [mock_json_response()], 'cursor': 'next'})
+        self.mock_proxy.fetch_search_results_with_cursor.assert_called_with(query_term='searchterm',
+                                                                            index='table_search_index',
+                                                                            cursor='previous',
+                                                                            page_size=None)
+
+    def test_should_fail_on_invalid_cursor(self) -> None:
+        self.mock_proxy.fetch_search_results_with_cursor.side_effect = ValueError('Invalid cursor')
+
+        response = self.app.test_client().get('/search_cursor?resource=user&cursor=invalid')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response.json, {'message': 'Invalid cursor'})
+
+    def test_should_fail_on_unknown_resource(self) -> None:
+        response = self.app.test_client().get('/search_cursor?resource=unknown')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,37 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+from tests.unit.api.table.fixtures import mock_json_response, mock_proxy_results
+
+
+class TestSearchExportAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.search.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_stream_results_as_ndjson(self) -> None:
+        self.mock_proxy.export_search_results.return_value = iter([mock_proxy_results(), mock_proxy_results()])
+
+        response = self.app.test_client().get('/search_export?resource=table&query_term=searchterm')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [mock_json_response(), mock_json_response()])
+        self.mock_proxy.export_search_results.assert_called_with(query_term='searchterm', index='table_search_index')
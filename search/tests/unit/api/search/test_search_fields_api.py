@@ -0,0 +1,42 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+
+
+class TestSearchFieldsAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.search.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_get_fields(self) -> None:
+        self.mock_proxy.fetch_document_fields.return_value = {'key1': {'column_names': ['col1']}}
+
+        response = self.app.test_client().get('/search_fields?resource=table&id=key1&id=key2&field=column_names')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {'results': {'key1': {'column_names': ['col1']}}})
+        self.mock_proxy.fetch_document_fields.assert_called_with(ids=['key1', 'key2'],
+                                                                 fields=['column_names'],
+                                                                 index='table_search_index')
+
+    def test_should_fail_on_unknown_field(self) -> None:
+        self.mock_proxy.fetch_document_fields.side_effect = ValueError("Unknown fields ['unknown']")
+
+        response = self.app.test_client().get('/search_fields?resource=table&id=key1&field=unknown')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
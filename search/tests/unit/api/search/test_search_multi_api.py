@@ -0,0 +1,94 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+from search_service.models.dashboard import SearchDashboardResult
+from search_service.models.search_result import SearchResult
+from search_service.models.table import SearchTableResult, Table
+from search_service.models.user import SearchUserResult
+
+
+class TestSearchMultiAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.search.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_search_resources(self) -> None:
+        self.mock_proxy.fetch_multi_search_results.return_value = {
+            'table_search_index': SearchTableResult(total_results=1,
+                                                    results=[Table(id='key1', database='db', cluster='gold',
+                                                                   schema='sch', name='orders', key='key1')]),
+            'user_search_index': SearchUserResult(total_results=0, results=[]),
+            'dashboard_search_index': SearchDashboardResult(total_results=0, results=[]),
+        }
+        search_request = {'type': 'AND', 'filters': {'product': ['mode']}}
+
+        response = self.app.test_client().post('/search_multi', json={
+            'query_term': 'orders',
+            'resources': ['table', 'user', 'dashboard'],
+            'search_requests': {'dashboard': search_request},
+            'page_indices': {'table': 1},
+        })
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.get_json()
+        assert data is not None
+        results = data['results']
+        self.assertEqual(list(results.keys()), ['table', 'user', 'dashboard'])
+        self.assertEqual(results['table']['total_results'], 1)
+        self.assertEqual([result['key'] for result in results['table']['results']], ['key1'])
+        self.assertEqual(results['user'], {'total_results': 0, 'results': []})
+        self.mock_proxy.fetch_multi_search_results.assert_called_with(
+            query_term='orders',
+            indices=['table_search_index', 'user_search_index', 'dashboard_search_index'],
+            search_requests={'dashboard_search_index': search_request},
+            page_indices={'table_search_index': 1},
+            lightweight=False
+        )
+
+    def test_should_search_all_resources_by_default(self) -> None:
+        self.mock_proxy.fetch_multi_search_results.return_value = {
+            index: SearchResult(total_results=0, results=[])
+            for index in ('table_search_index', 'user_search_index', 'dashboard_search_index', 'feature_search_index')
+        }
+
+        response = self.app.test_client().post('/search_multi', json={'query_term': 'orders'})
+
+        data = response.get_json()
+        assert data is not None
+        self.assertEqual(list(data['results'].keys()), ['table', 'user', 'dashboard', 'feature'])
+        self.assertEqual(self.mock_proxy.fetch_multi_search_results.call_args[1]['indices'],
+                         ['table_search_index', 'user_search_index', 'dashboard_search_index',
+                          'feature_search_index'])
+
+    def test_should_fail_on_search_request_of_resource_not_searched(self) -> None:
+        response = self.app.test_client().post('/search_multi', json={
+            'query_term': 'orders',
+            'resources': ['table'],
+            'search_requests': {'dashboard': {'type': 'AND', 'filters': {}}},
+        })
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.fetch_multi_search_results.assert_not_called()
+
+    def test_should_fail_on_negative_page_index(self) -> None:
+        self.mock_proxy.fetch_multi_search_results.side_effect = ValueError('Page indices have to be positive')
+
+        response = self.app.test_client().post('/search_multi', json={'query_term': 'orders',
+                                                                      'page_indices': {'table': -1}})
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
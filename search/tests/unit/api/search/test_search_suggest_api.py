@@ -0,0 +1,64 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from search_service import create_app
+from search_service.models.table import Table
+from search_service.models.user import User
+
+
+class TestSearchSuggestAPI(TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='search_service.config.Config')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.mock_client = patch('search_service.api.search.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+        self.mock_client.stop()
+
+    def test_should_get_suggestions_of_all_resources(self) -> None:
+        self.mock_proxy.fetch_suggestions.return_value = {
+            'table_search_index': [Table(id='key1', database='db', cluster='gold', schema='sch', name='fact_orders',
+                                         key='key1')],
+            'user_search_index': [User(id='jdoe', email='jdoe@example.com', full_name='Fact Doe')],
+        }
+
+        response = self.app.test_client().get('/search_suggest?prefix=fact')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.get_json()
+        assert data is not None
+        results = data['results']
+        self.assertEqual([result['name'] for result in results['table']], ['fact_orders'])
+        self.assertEqual([result['email'] for result in results['user']], ['jdoe@example.com'])
+        self.assertEqual(results['dashboard'], [])
+        self.mock_proxy.fetch_suggestions.assert_called_with(prefix='fact',
+                                                             indices=['table_search_index',
+                                                                      'user_search_index',
+                                                                      'dashboard_search_index'],
+                                                             size=5)
+
+    def test_should_get_suggestions_of_given_resources(self) -> None:
+        self.mock_proxy.fetch_suggestions.return_value = {'dashboard_search_index': []}
+
+        response = self.app.test_client().get('/search_suggest?prefix=fact&resource=dashboard&size=3')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {'results': {'dashboard': []}})
+        self.mock_proxy.fetch_suggestions.assert_called_with(prefix='fact',
+                                                             indices=['dashboard_search_index'],
+                                                             size=3)
+
+    def test_should_fail_without_prefix(self) -> None:
+        response = self.app.test_client().get('/search_suggest')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -41,7 +41,7 @@ class TestSearchTableAPI(TestCase):
         self.assertEqual(response.json, expected_response)
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.mock_proxy.fetch_table_search_results.assert_called_with(query_term='searchterm', page_index=0,
-                                                                      index='table_search_index')
+                                                                      index='table_search_index', lightweight=False)
 
     def test_should_give_empty_result_when_there_are_no_results_from_proxy(self) -> None:
         self.mock_proxy.fetch_table_search_results.return_value = \
@@ -69,6 +69,19 @@ class TestSearchTableAPI(TestCase):
 
         self.assertEqual(response.json, expected_response)
 
+    def test_should_get_capped_total_for_lightweight_search(self) -> None:
+        self.mock_proxy.fetch_table_search_results.return_value = \
+            SearchTableResult(total_results='10000+', results=[mock_proxy_results()])
+
+        response = self.app.test_client().get('/search?query_term=s&lightweight=true')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.get_json()
+        assert data is not None
+        self.assertEqual(data['total_results'], '10000+')
+        self.mock_proxy.fetch_table_search_results.assert_called_with(query_term='s', page_index=0,
+                                                                      index='table_search_index', lightweight=True)
+
     def test_should_fail_without_query_term(self) -> None:
         response = self.app.test_client().get('/search')
 
@@ -3,24 +3,25 @@
 
 import unittest
 from typing import (  # noqa: F401
-    Any, Iterable, List,
+    Any, Dict, Iterable, List, Union, cast,
 )
 from unittest import mock
 from unittest.mock import MagicMock, patch
 
 from amundsen_common.models.api import health_check
-from elasticsearch_dsl import Search
+from elasticsearch_dsl import Search, query
 
-from search_service import create_app
+from search_service import config, create_app
+from search_service.api.dashboard import DASHBOARD_INDEX
 from search_service.api.feature import FEATURE_INDEX
 from search_service.api.table import TABLE_INDEX
 from search_service.api.user import USER_INDEX
 from search_service.models.dashboard import Dashboard
 from search_service.models.feature import Feature, SearchFeatureResult
 from search_service.models.search_result import SearchResult
-from search_service.models.table import Table
+from search_service.models.table import SearchTableResult, Table
 from search_service.models.tag import Tag
-from search_service.models.user import User
+from search_service.models.user import SearchUserResult, User
 from search_service.proxy import get_proxy_client
 from search_service.proxy.elasticsearch import ElasticsearchProxy
 
@@ -485,6 +486,301 @@ class TestElasticsearchProxy(unittest.TestCase):
         }
         self.assertRaises(Exception, self.es_proxy.convert_query_json_to_query_dsl, search_request, term)
 
+    def test_build_filter_clauses(self) -> None:
+        filter_list = {
+            'database': ['hive', 'bigquery'],
+            'schema': ['test_schema*'],
+            'table': ['*amundsen*'],
+            'column': ['ds', 'ds_*', '*_ds'],
+            'unsupported_category': ['fake'],
+            'tag': [''],
+        }
+        expected_result = [
+            {'terms': {'database.raw': ['hive', 'bigquery']}},
+            {'prefix': {'schema.raw': 'test_schema'}},
+            {'wildcard': {'name.raw': '*amundsen*'}},
+            {'bool': {'should': [{'terms': {'column_names.raw': ['ds']}},
+                                 {'prefix': {'column_names.raw': 'ds_'}},
+                                 {'wildcard': {'column_names.raw': '*_ds'}}],
+                      'minimum_should_match': 1}},
+        ]
+        self.assertEqual(self.es_proxy.build_filter_clauses(filter_list, index=TABLE_INDEX), expected_result)
+
+    def test_convert_query_json_to_filter_query_term_and_filters(self) -> None:
+        search_request = {
+            'type': 'AND',
+            'filters': {'database': ['hive']}
+        }
+        ret_result = self.es_proxy.convert_query_json_to_filter_query(search_request=search_request,
+                                                                      query_term='test',
+                                                                      index=TABLE_INDEX)
+
+        expected_result = self.es_proxy.get_table_search_query('test')
+        expected_result['function_score']['query'] = {
+            'bool': {
+                'must': self.es_proxy.get_table_search_query('test')['function_score']['query'],
+                'filter': [{'terms': {'database.raw': ['hive']}}]
+            }
+        }
+        self.assertEqual(ret_result, expected_result)
+
+    def test_convert_query_json_to_filter_query_no_term(self) -> None:
+        search_request = {
+            'type': 'AND',
+            'filters': {'group_name': ['test group']}
+        }
+        ret_result = self.es_proxy.convert_query_json_to_filter_query(search_request=search_request,
+                                                                      query_term='',
+                                                                      index=DASHBOARD_INDEX)
+
+        self.assertEqual(ret_result['function_score']['query'],
+                         {'bool': {'must': {'match_all': {}},
+                                   'filter': [{'terms': {'group_name.raw': ['test group']}}]}})
+        self.assertEqual(ret_result['function_score']['field_value_factor'],
+                         {'field': 'total_usage', 'modifier': 'log2p'})
+
+    def test_convert_query_json_to_filter_query_raise_exception_no_term_or_filters(self) -> None:
+        search_request = {
+            'type': 'AND',
+            'filters': {'unsupported_category': ['fake']}
+        }
+        with self.assertRaises(Exception):
+            self.es_proxy.convert_query_json_to_filter_query(search_request=search_request,
+                                                             query_term='',
+                                                             index=TABLE_INDEX)
+
+    @patch('elasticsearch_dsl.Search.execute')
+    def test_search_table_filter_in_filter_context(self, mock_search: MagicMock) -> None:
+        mock_results = MagicMock()
+        mock_results.hits.total = 1
+        mock_results.__iter__.return_value = [TableResponse(result=vars(self.mock_result1))]
+        mock_search.return_value = mock_results
+
+        search_request = {
+            'type': 'AND',
+            'filters': {'database': ['hive']}
+        }
+        with patch.dict(self.app.config, {config.ELASTICSEARCH_FILTER_CONTEXT_KEY: True}), \
+                patch.object(self.es_proxy, '_get_search_result', wraps=self.es_proxy._get_search_result) as mock:
+            resp = self.es_proxy.fetch_search_results_with_filter(search_request=search_request, query_term='test')
+
+        self.assertEqual(resp.total_results, 1)
+        self.assertEqual(resp.results[0].key, 'test_key')
+        bool_query = mock.call_args[1]['client'].to_dict()['query']['function_score']['query']['bool']
+        self.assertEqual(bool_query['filter'], [{'terms': {'database.raw': ['hive']}}])
+        self.assertIn('multi_match', bool_query['must'][0])
+
+    def test_search_source_fields(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.search.return_value = {
+            'hits': {'total': {'value': 1, 'relation': 'eq'}, 'hits': self._raw_table_hits(self.mock_result1)}
+        }
+
+        resp = self.es_proxy.fetch_table_search_results(query_term='test')
+
+        self.assertEqual(resp.total_results, 1)
+        body = mock_elasticsearch.search.call_args[1]['body']
+        self.assertTrue(body['track_total_hits'])
+        self.assertEqual(set(body['_source']['includes']), Table.get_attrs() - {'id'})
+        self.assertNotIn('column_descriptions', body['_source']['includes'])
+
+    def test_lightweight_search(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.search.return_value = {
+            'hits': {'total': {'value': 10000, 'relation': 'gte'}, 'hits': self._raw_table_hits(self.mock_result1)}
+        }
+
+        resp = self.es_proxy.fetch_table_search_results(query_term='t', lightweight=True)
+
+        self.assertEqual(resp.total_results, '10000+')
+        self.assertEqual(resp.results[0].key, 'test_key')
+        body = mock_elasticsearch.search.call_args[1]['body']
+        self.assertEqual(body['track_total_hits'], 10000)
+        self.assertNotIn('column_names', body['_source']['includes'])
+        self.assertNotIn('programmatic_descriptions', body['_source']['includes'])
+
+    def test_fetch_document_fields(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.mget.return_value = {'docs': [
+            {'_id': 'test_key', 'found': True, '_source': {'column_names': ['test_col1', 'test_col2']}},
+            {'_id': 'missing_key', 'found': False},
+        ]}
+
+        resp = self.es_proxy.fetch_document_fields(ids=['test_key', 'missing_key'],
+                                                   fields=['column_names'],
+                                                   index=TABLE_INDEX)
+
+        self.assertEqual(resp, {'test_key': {'column_names': ['test_col1', 'test_col2']}})
+        mock_elasticsearch.mget.assert_called_with(index=TABLE_INDEX,
+                                                   body={'ids': ['test_key', 'missing_key']},
+                                                   _source_includes=['column_names'])
+
+    def test_fetch_document_fields_raise_exception_unknown_field(self) -> None:
+        with self.assertRaises(ValueError):
+            self.es_proxy.fetch_document_fields(ids=['test_key'], fields=['unknown'], index=TABLE_INDEX)
+
+    def test_fetch_multi_search_results(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.msearch.return_value = {'responses': [
+            {'hits': {'total': {'value': 2, 'relation': 'eq'},
+                      'hits': self._raw_table_hits(self.mock_result1, self.mock_result2)}},
+            {'error': {'type': 'index_not_found_exception'}, 'status': 404},
+        ]}
+
+        resp = self.es_proxy.fetch_multi_search_results(query_term='test', indices=[TABLE_INDEX, USER_INDEX])
+
+        self.assertEqual(list(resp.keys()), [TABLE_INDEX, USER_INDEX])
+        self.assertIsInstance(resp[TABLE_INDEX], SearchTableResult)
+        self.assertEqual(resp[TABLE_INDEX].total_results, 2)
+        self.assertEqual([result.key for result in resp[TABLE_INDEX].results], ['test_key', 'test_key2'])
+        self.assertIsInstance(resp[USER_INDEX], SearchUserResult)
+        self.assertEqual(resp[USER_INDEX].total_results, 0)
+        # Both indices are searched with a single request, like by their own search
+        mock_elasticsearch.msearch.assert_called_once()
+        body = mock_elasticsearch.msearch.call_args[1]['body']
+        self.assertEqual([body[0], body[2]], [{'index': [TABLE_INDEX]}, {'index': [USER_INDEX]}])
+        self.assertEqual(body[1]['query'], query.Q(self.es_proxy.get_table_search_query('test')).to_dict())
+        self.assertEqual(body[3]['query'], query.Q(self.es_proxy.get_user_search_query('test')).to_dict())
+        self.assertEqual((body[1]['from'], body[1]['size']), (0, 10))
+        self.assertTrue(body[1]['track_total_hits'])
+
+    def test_fetch_multi_search_results_with_filters(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.msearch.return_value = {'responses': [
+            {'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []}},
+        ]}
+        search_request = {'type': 'AND', 'filters': {'product': ['mode']}}
+
+        resp = self.es_proxy.fetch_multi_search_results(query_term='',
+                                                        indices=[TABLE_INDEX, DASHBOARD_INDEX],
+                                                        search_requests={DASHBOARD_INDEX: search_request},
+                                                        page_indices={DASHBOARD_INDEX: 1})
+
+        # Tables are not searched without query term
+        self.assertEqual(resp[TABLE_INDEX].total_results, 0)
+        self.assertEqual(resp[DASHBOARD_INDEX].total_results, 0)
+        body = mock_elasticsearch.msearch.call_args[1]['body']
+        self.assertEqual(body[0], {'index': [DASHBOARD_INDEX]})
+        self.assertEqual(body[1]['query'], query.Q(self.es_proxy.get_filter_search_query('product:(mode)')).to_dict())
+        self.assertEqual(body[1]['from'], 10)
+
+    def test_fetch_multi_search_results_without_query(self) -> None:
+        resp = self.es_proxy.fetch_multi_search_results(query_term='', indices=[TABLE_INDEX, USER_INDEX])
+
+        self.assertEqual(resp[TABLE_INDEX].total_results, 0)
+        self.assertEqual(resp[USER_INDEX].total_results, 0)
+        cast(MagicMock, self.es_proxy.elasticsearch).msearch.assert_not_called()
+
+    def test_fetch_multi_search_results_raise_exception_negative_page_index(self) -> None:
+        with self.assertRaises(ValueError):
+            self.es_proxy.fetch_multi_search_results(query_term='test',
+                                                     indices=[TABLE_INDEX],
+                                                     page_indices={TABLE_INDEX: -1})
+
+    def test_fetch_suggestions(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.msearch.return_value = {'responses': [
+            {'suggest': {'suggest': [{'text': 'test', 'options': [
+                {'text': 'test_table', '_index': TABLE_INDEX, '_id': 'test_key', '_score': 10.0,
+                 '_source': vars(self.mock_result1)},
+                # Same text suggesting another document, e.g. a table of another schema
+                {'text': 'test_table', '_index': TABLE_INDEX, '_id': 'test_key2', '_score': 10.0,
+                 '_source': vars(self.mock_result2)},
+                # Same document suggested by another of its inputs
+                {'text': 'test table', '_index': TABLE_INDEX, '_id': 'test_key', '_score': 5.0,
+                 '_source': vars(self.mock_result1)},
+            ]}]}},
+            {'error': {'type': 'search_phase_execution_exception'}, 'status': 400},
+        ]}
+
+        resp = self.es_proxy.fetch_suggestions(prefix='test', indices=[TABLE_INDEX, USER_INDEX], size=3)
+
+        self.assertEqual([result.id for result in resp[TABLE_INDEX]], ['test_key', 'test_key2'])
+        self.assertEqual(resp[TABLE_INDEX][0].key, self.mock_result1.key)
+        self.assertEqual(resp[USER_INDEX], [])
+        body = mock_elasticsearch.msearch.call_args[1]['body']
+        self.assertEqual([body[0], body[2]], [{'index': TABLE_INDEX}, {'index': USER_INDEX}])
+        self.assertEqual(body[1]['size'], 0)
+        self.assertEqual(body[1]['suggest'], {'suggest': {'prefix': 'test',
+                                                          'completion': {'field': 'suggest',
+                                                                         'size': 3}}})
+        # Suggestions only fetch the lightweight fields of documents
+        self.assertNotIn('column_names', body[1]['_source'])
+
+    def _raw_table_hits(self, *results: Union[MockSearchResult, Table]) -> List[Dict[str, Any]]:
+        return [{'_id': result.key, '_source': vars(result), 'sort': [1.0, i]} for i, result in enumerate(results)]
+
+    def test_fetch_search_results_with_cursor_first_page(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.open_point_in_time.return_value = {'id': 'pit_1'}
+        mock_elasticsearch.search.return_value = {
+            'pit_id': 'pit_2',
+            'hits': {'total': {'value': 3, 'relation': 'eq'},
+                     'hits': self._raw_table_hits(self.mock_result1, self.mock_result2)}
+        }
+
+        resp = self.es_proxy.fetch_search_results_with_cursor(query_term='test', index=TABLE_INDEX, page_size=2)
+
+        self.assertEqual(resp.total_results, 3)
+        self.assertEqual([result.key for result in resp.results], ['test_key', 'test_key2'])
+        self.assertEqual(self.es_proxy._decode_cursor(resp.cursor), ('pit_2', [1.0, 1]))
+        mock_elasticsearch.open_point_in_time.assert_called_with(index=TABLE_INDEX, keep_alive='1m')
+        mock_elasticsearch.close_point_in_time.assert_not_called()
+        body = mock_elasticsearch.search.call_args[1]['body']
+        self.assertEqual(body['pit'], {'id': 'pit_1', 'keep_alive': '1m'})
+        self.assertEqual(body['size'], 2)
+        self.assertTrue(body['track_total_hits'])
+        self.assertNotIn('search_after', body)
+        self.assertIsNone(mock_elasticsearch.search.call_args[1]['index'])
+
+    def test_fetch_search_results_with_cursor_last_page(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.search.return_value = {
+            'pit_id': 'pit_3',
+            'hits': {'hits': self._raw_table_hits(self.mock_result3)}
+        }
+
+        resp = self.es_proxy.fetch_search_results_with_cursor(query_term='test',
+                                                              index=TABLE_INDEX,
+                                                              cursor=self.es_proxy._encode_cursor('pit_2', [1.0, 1]),
+                                                              page_size=2)
+
+        self.assertIsNone(resp.total_results)
+        self.assertEqual([result.key for result in resp.results], ['test_key3'])
+        self.assertIsNone(resp.cursor)
+        mock_elasticsearch.open_point_in_time.assert_not_called()
+        mock_elasticsearch.close_point_in_time.assert_called_with(body={'id': 'pit_3'})
+        body = mock_elasticsearch.search.call_args[1]['body']
+        self.assertEqual(body['pit'], {'id': 'pit_2', 'keep_alive': '1m'})
+        self.assertEqual(body['search_after'], [1.0, 1])
+        self.assertFalse(body['track_total_hits'])
+
+    def test_fetch_search_results_with_invalid_cursor(self) -> None:
+        with self.assertRaises(ValueError):
+            self.es_proxy.fetch_search_results_with_cursor(query_term='test', index=TABLE_INDEX, cursor='invalid')
+
+    def test_export_search_results(self) -> None:
+        mock_elasticsearch = cast(MagicMock, self.es_proxy.elasticsearch)
+        mock_elasticsearch.search.return_value = {
+            '_scroll_id': 'scroll_1',
+            '_shards': {'total': 1, 'successful': 1},
+            'hits': {'hits': self._raw_table_hits(self.mock_result1, self.mock_result2)}
+        }
+        mock_elasticsearch.scroll.return_value = {
+            '_scroll_id': 'scroll_1',
+            '_shards': {'total': 1, 'successful': 1},
+            'hits': {'hits': []}
+        }
+
+        results = self.es_proxy.export_search_results(query_term='', index=TABLE_INDEX)
+
+        self.assertEqual([result.key for result in results], ['test_key', 'test_key2'])
+        search_kwargs = mock_elasticsearch.search.call_args[1]
+        self.assertEqual(search_kwargs['index'], [TABLE_INDEX])
+        self.assertEqual(search_kwargs['size'], 1000)
+        self.assertEqual(search_kwargs['scroll'], '1m')
+        mock_elasticsearch.clear_scroll.assert_called_once()
+
     @patch('elasticsearch_dsl.Search.execute')
     def test_search_with_one_user_result(self,
                                          mock_search: MagicMock) -> None:
@@ -784,4 +1080,5 @@ class TestElasticsearchProxy(unittest.TestCase):
             query_name=self.es_proxy.get_feature_search_query(query_term),
             model=Feature,
             search_result_model=SearchFeatureResult,
+            lightweight=False,
         )